@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-file vs archive downloads against a local GitHub stand-in.
+
+Each request to the stand-in is delayed by --latency to model a network
+round-trip. Run from the repository root:
+
+    python3 -m tests.bench_downloads > bench_output.txt
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from tests.conftest import FakeGitHub, serve_fake_github
+
+import install_skill
+
+
+def build_repo(file_count: int, file_size: int) -> FakeGitHub:
+    github = FakeGitHub()
+    github.add("skills/bench/SKILL.md", "---\nname: bench\ndescription: benchmark\n---\n")
+    for i in range(file_count - 1):
+        github.add(f"skills/bench/refs/part_{i // 25:02d}/file_{i:04d}.md", "x" * file_size)
+    # Unrelated content the archive has to stream past
+    for i in range(file_count):
+        github.add(f"skills/other/file_{i:04d}.md", "y" * file_size)
+    return github
+
+
+def run(github: FakeGitHub, mode: str, concurrency: int) -> tuple:
+    github.requests.clear()
+    with tempfile.TemporaryDirectory(prefix="skill_bench_") as tmp:
+        start = time.perf_counter()
+        # Keep per-file progress lines out of the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            downloaded = install_skill.download_directory(
+                github.owner, github.repo, github.branch, "skills/bench", Path(tmp),
+                concurrency=concurrency, fetch_mode=mode,
+            )
+        elapsed = time.perf_counter() - start
+    return elapsed, len(downloaded), len(github.requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--file-size", type=int, default=4096)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Seconds added to every request (default: 0.02)")
+    parser.add_argument("--concurrency", type=int, default=install_skill.DEFAULT_CONCURRENCY)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Measure the network path, not local caches
+    install_skill.configure_http_cache(enabled=False)
+    install_skill.configure_blob_store(enabled=False)
+
+    print(f"latency={args.latency * 1000:.0f}ms file_size={args.file_size}B "
+          f"concurrency={args.concurrency} repeat={args.repeat} (best of)")
+    print(f"{'files':>6} {'mode':>8} {'seconds':>9} {'requests':>9}")
+    for count in args.files:
+        github = build_repo(count, args.file_size)
+        github.delay = args.latency
+        with serve_fake_github(github) as base:
+            install_skill.GITHUB_API_BASE = f"{base}/api"
+            install_skill.GITHUB_RAW_BASE = f"{base}/raw"
+            for mode in ("files", "archive"):
+                results = [run(github, mode, args.concurrency) for _ in range(args.repeat)]
+                elapsed, downloaded, requests = min(results)
+                assert downloaded == count
+                print(f"{count:>6} {mode:>8} {elapsed:>9.3f} {requests:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,14 @@
+import contextlib
+import gzip
+import hashlib
+import http.server
+import io
+import json
 import sys
+import tarfile
+import threading
+import time
+import urllib.parse
 from pathlib import Path
 
 import pytest
@@ -39,3 +49,258 @@ def tmp_skill(tmp_path):
             return p
 
     return SkillDir(tmp_path)
+
+
+class FakeGitHub:
+    """In-memory stand-in for the GitHub Contents/Trees APIs and raw file host.
+
+    ``files`` maps repo-relative paths ("skills/demo/SKILL.md") to bytes.
+    Every request path is recorded in ``requests`` for assertions.
+    """
+
+    def __init__(self, owner="octo", repo="skills", branch="main"):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        self.files = {}
+        self.requests = []
+        self.delay = 0.0
+        self.truncated = False
+        self.symlinks = {}
+        # Git modes of files that are not plain 100644 blobs (e.g. "100755")
+        self.modes = {}
+        self.headers = []
+        self.connections = 0
+        self.not_modified = 0
+        # Requests being handled right now, and the most seen at once
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Queued (status, headers) answers served before normal routing;
+        # a status of None drops the connection without a response
+        self.failures = []
+        # When set, API responses carry X-RateLimit-* headers and are
+        # refused with 403 once the budget is spent
+        self.rate_remaining = None
+        self.rate_reset = 0
+        self._lock = threading.Lock()
+
+    def add(self, path, content):
+        self.files[path] = content.encode("utf-8") if isinstance(content, str) else content
+
+    def blob_sha(self, path):
+        data = self.files[path]
+        return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+    def tree_sha(self, directory):
+        """Git tree SHA of ``directory``, with files as 100644 blobs unless listed in ``modes``."""
+        prefix = f"{directory}/" if directory else ""
+        children = {}
+        for path in self.files:
+            if path.startswith(prefix):
+                name, _, rest = path[len(prefix):].partition("/")
+                children[name] = bool(rest)
+        body = b""
+        for name in sorted(children, key=lambda n: n.encode() + (b"/" if children[n] else b"")):
+            if children[name]:
+                body += b"40000 " + name.encode() + b"\0" + bytes.fromhex(self.tree_sha(prefix + name))
+            else:
+                mode = self.modes.get(prefix + name, "100644")
+                body += f"{mode} {name}\0".encode() + bytes.fromhex(self.blob_sha(prefix + name))
+        return hashlib.sha1(b"tree %d\0" % len(body) + body).hexdigest()
+
+    def tree(self, directory):
+        """Recursive Git Trees API listing of ``directory``."""
+        prefix = f"{directory}/" if directory else ""
+        entries, dirs = [], set()
+        for path in sorted(self.files):
+            if not path.startswith(prefix):
+                continue
+            rel = path[len(prefix):]
+            parts = rel.split("/")
+            for i in range(1, len(parts)):
+                dirs.add("/".join(parts[:i]))
+            entries.append({
+                "path": rel, "mode": self.modes.get(path, "100644"), "type": "blob",
+                "sha": self.blob_sha(path), "size": len(self.files[path]),
+            })
+        for rel, target in self.symlinks.items():
+            entries.append({"path": rel, "mode": "120000", "type": "blob", "sha": "1" * 40, "size": len(target)})
+        for rel in sorted(dirs):
+            entries.append({"path": rel, "mode": "040000", "type": "tree", "sha": self.tree_sha(prefix + rel)})
+        return {"sha": self.tree_sha(directory), "tree": entries, "truncated": self.truncated}
+
+    def tarball(self):
+        """gzip tarball of the whole repo, rooted like GitHub's archives."""
+        root = f"{self.owner}-{self.repo}-abc1234"
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+            for path in sorted(self.files):
+                info = tarfile.TarInfo(f"{root}/{path}")
+                info.size = len(self.files[path])
+                tar.addfile(info, io.BytesIO(self.files[path]))
+            for path, target in self.symlinks.items():
+                info = tarfile.TarInfo(f"{root}/{path}")
+                info.type = tarfile.SYMTYPE
+                info.linkname = target
+                tar.addfile(info)
+        return buf.getvalue()
+
+    def listing(self, directory):
+        prefix = f"{directory}/" if directory else ""
+        entries = {}
+        for path in self.files:
+            if not path.startswith(prefix):
+                continue
+            name, _, rest = path[len(prefix):].partition("/")
+            if rest:
+                entries[name] = {"name": name, "type": "dir", "sha": self.tree_sha(prefix + name)}
+            else:
+                entries[name] = {
+                    "name": name, "type": "file",
+                    "sha": self.blob_sha(path), "size": len(self.files[path]),
+                }
+        return [entries[name] for name in sorted(entries)]
+
+    def handle(self, handler):
+        """Return (status, headers, body) for a request handler.
+
+        JSON responses carry an ETag and honour If-None-Match with a 304.
+        """
+        with self._lock:
+            self.requests.append(handler.path)
+            self.headers.append(dict(handler.headers))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        with self._lock:
+            failure = self.failures.pop(0) if self.failures else None
+        if failure is not None:
+            return failure[0], failure[1], b'{"message": "injected failure"}'
+        if self.rate_remaining is not None and handler.path.startswith("/api/"):
+            with self._lock:
+                exhausted = self.rate_remaining <= 0
+                self.rate_remaining = max(0, self.rate_remaining - 1)
+                rate_headers = {
+                    "X-RateLimit-Remaining": str(self.rate_remaining),
+                    "X-RateLimit-Reset": str(int(self.rate_reset)),
+                }
+            if exhausted:
+                return 403, rate_headers, b'{"message": "API rate limit exceeded"}'
+            status, headers, body = self._route(handler)
+            headers = {**headers, **rate_headers}
+        else:
+            status, headers, body = self._route(handler)
+        if status == 200 and headers.get("Content-Type") == "application/json":
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if handler.headers.get("If-None-Match") == etag:
+                with self._lock:
+                    self.not_modified += 1
+                return 304, {"ETag": etag}, b""
+            headers = {**headers, "ETag": etag}
+        return status, headers, body
+
+    def _route(self, handler):
+        parsed = urllib.parse.urlsplit(handler.path)
+        path = urllib.parse.unquote(parsed.path)
+        repo_prefix = f"/api/repos/{self.owner}/{self.repo}/contents"
+        raw_prefix = f"/raw/{self.owner}/{self.repo}/{self.branch}/"
+        if path.startswith(repo_prefix):
+            directory = path[len(repo_prefix):].strip("/")
+            if directory in self.files:
+                return 200, {}, json.dumps({"name": directory.rsplit("/", 1)[-1], "type": "file"}).encode()
+            entries = self.listing(directory)
+            if not entries:
+                return 404, {}, b'{"message": "Not Found"}'
+            return 200, {"Content-Type": "application/json"}, json.dumps(entries).encode()
+        # Like GitHub, the tarball endpoint redirects to a download host
+        if path == f"/api/repos/{self.owner}/{self.repo}/tarball/{self.branch}":
+            return 302, {"Location": f"/codeload/{self.owner}/{self.repo}/tar.gz/{self.branch}"}, b""
+        if path == f"/codeload/{self.owner}/{self.repo}/tar.gz/{self.branch}":
+            return 200, {"Content-Type": "application/x-gzip"}, self.tarball()
+        trees_prefix = f"/api/repos/{self.owner}/{self.repo}/git/trees/"
+        if path.startswith(trees_prefix):
+            tree_ish = path[len(trees_prefix):]
+            directories = {""} | {
+                "/".join(p.split("/")[:i]) for p in self.files for i in range(1, p.count("/") + 1)
+            }
+            for directory in directories:
+                if tree_ish == self.tree_sha(directory) or (not directory and tree_ish == self.branch):
+                    return 200, {"Content-Type": "application/json"}, json.dumps(self.tree(directory)).encode()
+            return 404, {}, b'{"message": "Not Found"}'
+        if path.startswith(raw_prefix):
+            data = self.files.get(path[len(raw_prefix):])
+            if data is None:
+                return 404, {}, b"Not Found"
+            return 200, {"Content-Type": "application/octet-stream"}, data
+        return 404, {}, b"Not Found"
+
+
+@contextlib.contextmanager
+def serve_fake_github(github):
+    """Serve ``github`` on localhost; yields the base URL."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with github._lock:
+                github.connections += 1
+
+        def do_GET(self):
+            status, headers, body = github.handle(self)
+            if status is None:
+                self.close_connection = True
+                return
+            if len(body) > 64 and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+                headers = {**headers, "Content-Encoding": "gzip"}
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def fake_github(monkeypatch, tmp_path_factory):
+    """Serve a FakeGitHub on localhost and point install_skill at it."""
+    import install_skill
+
+    github = FakeGitHub()
+    github.cache_dir = tmp_path_factory.mktemp("http-cache")
+    monkeypatch.setattr(
+        install_skill, "_http_cache", install_skill.HTTPMetadataCache(github.cache_dir)
+    )
+    github.blob_dir = tmp_path_factory.mktemp("blobs")
+    monkeypatch.setattr(install_skill, "_blob_store", install_skill.BlobStore(github.blob_dir))
+    # Fresh connection pool so no test reuses connections to another server
+    transport = install_skill.HTTPTransport()
+    monkeypatch.setattr(install_skill, "_transport", transport)
+    with serve_fake_github(github) as base:
+        monkeypatch.setattr(install_skill, "GITHUB_API_BASE", f"{base}/api")
+        monkeypatch.setattr(install_skill, "GITHUB_RAW_BASE", f"{base}/raw")
+        github.base_url = base
+        github.transport = transport
+        yield github
+    transport.close()
@@ -9,7 +9,7 @@ Usage:
     python3 install_skill.py --url "https://github.com/user/repo/tree/main/skills/my-skill" --dest "~/.claude/skills/my-skill"
 
 Features:
-    - Atomic install: Downloads to temp, validates, then moves to destination
+    - Atomic install: Stages next to the destination, validates, then swaps it in
     - Multi-file validation: Validates .py, .sh, .json, .yaml files
     - Single API call: Only one GitHub API request to list directory
     - Raw URL downloads: No rate limiting for file downloads
@@ -17,20 +17,49 @@ Features:
 
 import argparse
 import ast
+import base64
+import ctypes
+import errno
 import json
+import multiprocessing
 import os
+import random
 import re
 import shutil
+import socket
+import stat
 import subprocess
 import sys
+import tarfile
 import tempfile
+import threading
+import time
 import urllib.error
 import urllib.request
 import hashlib
+import http.client
+import io
+import ssl
+import urllib.parse
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+try:
+    import sqlite3
+except ImportError:  # Python built without SQLite
+    sqlite3 = None
+
 VERSION = "1.3.0"
 
 
@@ -63,6 +92,10 @@ def parse_github_url(url: str) -> Optional[dict]:
     }
 
 
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_RAW_BASE = "https://raw.githubusercontent.com"
+
+
 def to_raw_url(owner: str, repo: str, branch: str, path: str, filename: str) -> str:
     """Convert GitHub components to raw.githubusercontent.com URL."""
     # URL-encode the filename to handle spaces and special characters
@@ -70,17 +103,877 @@ def to_raw_url(owner: str, repo: str, branch: str, path: str, filename: str) ->
     encoded_filename = quote(filename, safe='')
     if path:
         encoded_path = '/'.join(quote(p, safe='') for p in path.split('/'))
-        return f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{encoded_path}/{encoded_filename}"
+        return f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/{encoded_path}/{encoded_filename}"
     else:
-        return f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{encoded_filename}"
+        return f"{GITHUB_RAW_BASE}/{owner}/{repo}/{branch}/{encoded_filename}"
 
 
 def to_api_url(owner: str, repo: str, branch: str, path: str) -> str:
     """Convert GitHub components to API contents URL."""
     if path:
-        return f"https://api.github.com/repos/{owner}/{repo}/contents/{path}?ref={branch}"
+        return f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents/{path}?ref={branch}"
     else:
-        return f"https://api.github.com/repos/{owner}/{repo}/contents?ref={branch}"
+        return f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents?ref={branch}"
+
+
+def to_tree_url(owner: str, repo: str, tree_ish: str, recursive: bool = True) -> str:
+    """Convert GitHub components to a (by default recursive) Git Trees API URL."""
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/{tree_ish}"
+    return f"{url}?recursive=1" if recursive else url
+
+
+def to_archive_url(owner: str, repo: str, branch: str) -> str:
+    """Convert GitHub components to the repository tarball URL for a ref."""
+    return f"{GITHUB_API_BASE}/repos/{owner}/{repo}/tarball/{branch}"
+
+
+# =============================================================================
+# HTTP Transport
+# =============================================================================
+
+# Same User-Agent the catalog curl examples in SKILL.md send
+USER_AGENT = "Universal-Skills-Manager"
+HTTP_TIMEOUT = 30
+MAX_REDIRECTS = 5
+READ_CHUNK_SIZE = 64 * 1024
+
+# Retries for idempotent GETs: full-jitter exponential backoff
+DEFAULT_MAX_RETRIES = 4
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30.0
+RETRY_STATUSES = (500, 502, 503, 504)
+# Longest we will sleep for a rate limit to reset before giving up
+MAX_RATE_LIMIT_WAIT = 60.0
+
+
+class RateLimitError(urllib.error.HTTPError):
+    """The host's request budget is exhausted until `reset` (epoch seconds)."""
+
+    def __init__(self, url: str, code: int, headers, reset: Optional[float]):
+        super().__init__(url, code, "Rate limit exceeded", headers, None)
+        self.reset = reset
+
+
+def format_reset(reset: Optional[float]) -> str:
+    """Describe a rate limit reset time, e.g. '14:05:09 (in 12 min)'."""
+    if not reset:
+        return "an unknown time"
+    local = datetime.fromtimestamp(reset).strftime("%H:%M:%S")
+    minutes = max(0, int((reset - time.time() + 59) // 60))
+    return f"{local} (in {minutes} min)"
+
+
+class RequestScheduler:
+    """
+    Paces requests against each host's remaining rate-limit budget.
+
+    The budget comes from X-RateLimit-Remaining / X-RateLimit-Reset on every
+    response. Requests in flight count against it, so concurrent workers
+    never send more requests than the host has left. When the budget is
+    spent, callers wait for the reset if it is at most max_wait away and
+    get a RateLimitError naming the reset time otherwise. With
+    max_in_flight set, no host has more requests outstanding than that,
+    however many worker pools are issuing them.
+    """
+
+    def __init__(self, max_wait: float = MAX_RATE_LIMIT_WAIT,
+                 max_in_flight: Optional[int] = None):
+        self.max_wait = max_wait
+        self.max_in_flight = max_in_flight
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    def _state(self, host: str) -> dict:
+        return self._hosts.setdefault(host, {"remaining": None, "reset": None, "in_flight": 0})
+
+    def acquire(self, host: str, url: str) -> None:
+        """Reserve one request against host's budget, waiting if needed."""
+        with self._cond:
+            state = self._state(host)
+            while True:
+                if self.max_in_flight and state["in_flight"] >= self.max_in_flight:
+                    self._cond.wait()
+                    continue
+                if state["remaining"] is None or state["remaining"] - state["in_flight"] > 0:
+                    break
+                wait = (state["reset"] or 0) - time.time()
+                if wait <= 0:
+                    state["remaining"] = None  # Budget has reset
+                    break
+                if wait > self.max_wait:
+                    raise RateLimitError(url, 403, None, state["reset"])
+                self._cond.wait(wait)
+            state["in_flight"] += 1
+
+    def release(self, host: str, headers=None) -> None:
+        """Finish a request, updating the budget from its response headers."""
+        with self._cond:
+            state = self._state(host)
+            state["in_flight"] = max(0, state["in_flight"] - 1)
+            if headers is not None:
+                remaining = headers.get("X-RateLimit-Remaining")
+                reset = headers.get("X-RateLimit-Reset")
+                if remaining is not None and reset is not None:
+                    try:
+                        state["remaining"] = int(remaining)
+                        state["reset"] = float(reset)
+                    except ValueError:
+                        pass
+            self._cond.notify_all()
+
+    def clear(self, host: str) -> None:
+        """Forget host's budget once its reset time has been waited out."""
+        with self._cond:
+            state = self._state(host)
+            state["remaining"] = None
+            self._cond.notify_all()
+
+
+class HTTPResponse:
+    """
+    Streaming response from HTTPTransport.
+
+    Transparently decodes gzip content encoding. Once the body has been read
+    to the end the connection goes back to its pool; closing a partially read
+    response discards the connection instead.
+    """
+
+    def __init__(self, transport, key, conn, raw: http.client.HTTPResponse, url: str):
+        self._transport = transport
+        self._key = key
+        self._conn = conn
+        self._raw = raw
+        self.url = url
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+        encoding = (raw.getheader("Content-Encoding") or "").lower()
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "gzip" else None
+        self._buffer = b""
+        self._eof = False
+
+    def _fill(self, amt: Optional[int]) -> None:
+        try:
+            while not self._eof and (amt is None or len(self._buffer) < amt):
+                chunk = self._raw.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    if self._decoder is not None:
+                        self._buffer += self._decoder.flush()
+                    self._eof = True
+                    self._finish()
+                elif self._decoder is not None:
+                    self._buffer += self._decoder.decompress(chunk)
+                else:
+                    self._buffer += chunk
+        except (http.client.HTTPException, OSError, zlib.error) as e:
+            self.close()
+            raise urllib.error.URLError(e)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Read up to amt decoded bytes, or the rest of the body."""
+        if amt is not None and amt < 0:
+            amt = None
+        self._fill(amt)
+        if amt is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def _finish(self) -> None:
+        if self._conn is not None:
+            self._transport._release(self._key, self._conn)
+            self._conn = None
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HTTPTransport:
+    """
+    Minimal HTTP/1.1 client with per-host keep-alive connection pools.
+
+    Every request asks for gzip and carries the same User-Agent. Redirects
+    are followed, dropping Authorization when the host changes. Requests are
+    paced by a RequestScheduler, and network errors, 5xx responses and
+    rate limits that reset soon are retried with backoff. Failures are
+    raised as urllib.error.HTTPError / URLError, the same exceptions callers
+    already handle for urllib; an exhausted rate limit is a RateLimitError.
+    """
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT, max_idle_per_host: int = 16,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 max_rate_limit_wait: float = MAX_RATE_LIMIT_WAIT):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.max_retries = max_retries
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.scheduler = RequestScheduler(max_rate_limit_wait)
+        self.sleep = time.sleep
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _connection_key(self, scheme: str, host: str, port: int) -> tuple:
+        proxy = None
+        if not urllib.request.proxy_bypass(host):
+            proxy = urllib.request.getproxies().get(scheme)
+        return (scheme, host, port, proxy)
+
+    @staticmethod
+    def _proxy_headers(proxy: Optional[str]) -> dict:
+        """Basic Proxy-Authorization for credentials in a proxy URL, as ProxyHandler sends."""
+        if not proxy:
+            return {}
+        proxy_url = urllib.parse.urlsplit(proxy)
+        if proxy_url.username is None:
+            return {}
+        credentials = (f"{urllib.parse.unquote(proxy_url.username)}:"
+                       f"{urllib.parse.unquote(proxy_url.password or '')}")
+        token = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+        return {"Proxy-Authorization": f"Basic {token}"}
+
+    def _connect(self, key):
+        scheme, host, port, proxy = key
+        if proxy:
+            proxy_url = urllib.parse.urlsplit(proxy)
+            proxy_port = proxy_url.port or (443 if proxy_url.scheme == "https" else 80)
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    proxy_url.hostname, proxy_port, timeout=self.timeout,
+                    context=self._ssl_context
+                )
+                conn.set_tunnel(host, port, headers=self._proxy_headers(proxy))
+                return conn
+            return http.client.HTTPConnection(proxy_url.hostname, proxy_port, timeout=self.timeout)
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _release(self, key, conn) -> None:
+        if conn.sock is None:
+            return  # Server asked to close the connection
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _send(self, url: str, headers: dict) -> HTTPResponse:
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = self._connection_key(parts.scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        request_headers = {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "gzip",
+            **headers,
+        }
+        if key[3] and parts.scheme == "http":
+            target = url  # Plain HTTP proxies take the absolute URL
+            request_headers.update(self._proxy_headers(key[3]))
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request("GET", target, headers=request_headers)
+                raw = conn.getresponse()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                # A pooled connection may have been closed by the server while idle
+                if reused:
+                    continue
+                raise urllib.error.URLError(e)
+            return HTTPResponse(self, key, conn, raw, url)
+
+    @staticmethod
+    def _is_transient(error: urllib.error.URLError) -> bool:
+        """Return True if a failed request is worth retrying.
+
+        Timeouts, dropped or refused connections and temporary DNS failures
+        are retried; certificate errors, unknown hosts and other permanent
+        failures are raised at once.
+        """
+        reason = error.reason
+        if isinstance(reason, ssl.SSLError):
+            return False
+        if isinstance(reason, socket.gaierror):
+            return reason.errno == socket.EAI_AGAIN
+        return isinstance(reason, (TimeoutError, ConnectionError))
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+    def _rate_limit_reset(self, response: HTTPResponse) -> Optional[float]:
+        """Return when an exhausted rate limit resets, or None if not rate limited."""
+        if response.status not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return time.time() + float(retry_after)
+            except ValueError:
+                try:
+                    return parsedate_to_datetime(retry_after).timestamp()
+                except (TypeError, ValueError):
+                    pass
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                return float(response.headers.get("X-RateLimit-Reset", ""))
+            except ValueError:
+                return time.time() + self.max_rate_limit_wait
+        if response.status == 429:
+            return time.time()
+        return None
+
+    def _request(self, url: str, headers: dict) -> HTTPResponse:
+        """Send one GET through the scheduler, retrying transient failures."""
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"Unsupported URL scheme: {parts.scheme}")
+        host = parts.netloc
+        attempt = 0
+        while True:
+            self.scheduler.acquire(host, url)
+            try:
+                response = self._send(url, headers)
+            except urllib.error.URLError as e:
+                self.scheduler.release(host)
+                if attempt >= self.max_retries or not self._is_transient(e):
+                    raise
+                self.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            self.scheduler.release(host, response.headers)
+            if response.status < 400:
+                return response
+
+            response.read()
+            reset = self._rate_limit_reset(response)
+            if reset is not None:
+                wait = max(reset - time.time(), self._backoff(attempt))
+                if attempt >= self.max_retries or wait > self.max_rate_limit_wait:
+                    raise RateLimitError(url, response.status, response.headers, reset)
+            elif response.status in RETRY_STATUSES and attempt < self.max_retries:
+                wait = self._backoff(attempt)
+            else:
+                raise urllib.error.HTTPError(
+                    url, response.status, response.reason, response.headers, None
+                )
+            self.sleep(wait)
+            if reset is not None:
+                self.scheduler.clear(host)
+            attempt += 1
+
+    def get(self, url: str, headers: Optional[dict] = None) -> HTTPResponse:
+        """GET url, following redirects. Returns a streaming HTTPResponse."""
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._request(url, headers)
+            if response.status in (301, 302, 303, 307, 308):
+                location = response.headers.get("Location")
+                response.read()
+                if not location:
+                    break
+                new_url = urllib.parse.urljoin(url, location)
+                if urllib.parse.urlsplit(new_url).netloc != urllib.parse.urlsplit(url).netloc:
+                    headers.pop("Authorization", None)
+                url = new_url
+                continue
+            return response
+        raise urllib.error.HTTPError(
+            url, response.status, "Too many redirects", response.headers, None
+        )
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Return the process-wide HTTPTransport shared by all downloads."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport()
+        return _transport
+
+
+def http_get(url: str, headers: Optional[dict] = None) -> HTTPResponse:
+    """GET url through the shared transport."""
+    return get_transport().get(url, headers)
+
+
+# =============================================================================
+# HTTP Metadata Cache
+# =============================================================================
+
+DEFAULT_HTTP_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the installer's cache directory.
+    $SKILL_INSTALLER_CACHE overrides the default, which lives in
+    $XDG_CACHE_HOME when set and ~/.cache otherwise.
+    """
+    override = os.environ.get("SKILL_INSTALLER_CACHE")
+    if override:
+        return Path(override).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base / "universal-skills-manager"
+
+
+class HTTPMetadataCache:
+    """
+    On-disk cache of JSON API responses and their ETags, keyed by URL.
+
+    Entries are revalidated with If-None-Match; GitHub answers unchanged
+    resources with 304, which does not count against the rate limit.
+    Least recently used entries are evicted once the cache exceeds max_bytes.
+    Cache I/O errors are never fatal: a broken entry is treated as a miss.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_HTTP_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _entry_path(self, url: str, token: Optional[str]) -> Path:
+        # Responses can differ per credential, so the token is part of the key
+        identity = hashlib.sha256(token.encode()).hexdigest() if token else ""
+        key = hashlib.sha256(f"{url}\0{identity}".encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def get(self, url: str, token: Optional[str] = None) -> Optional[dict]:
+        """Return {"etag": ..., "body": ...} for url, or None on a miss."""
+        entry_path = self._entry_path(url, token)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+            if entry.get("url") != url or not entry.get("etag"):
+                return None
+            os.utime(entry_path)  # Mark as recently used
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, etag: str, body, token: Optional[str] = None) -> None:
+        """Store a response body under its ETag, then evict if over budget."""
+        entry_path = self._entry_path(url, token)
+        tmp_path = entry_path.with_name(
+            f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+            content = json.dumps({"url": url, "etag": etag, "body": body})
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry_path in self.directory.glob("*.json"):
+                try:
+                    stat = entry_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+                total += stat.st_size
+            entries.sort()
+            for _, size, entry_path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    entry_path.unlink()
+                except OSError:
+                    pass
+                total -= size
+
+
+_UNSET = object()
+_http_cache = _UNSET
+_http_cache_lock = threading.Lock()
+
+
+def configure_http_cache(directory: Optional[Path] = None, enabled: bool = True,
+                         max_bytes: int = DEFAULT_HTTP_CACHE_BYTES) -> None:
+    """Set up (or disable) the metadata cache used by fetch_json()."""
+    global _http_cache
+    with _http_cache_lock:
+        if not enabled:
+            _http_cache = None
+        else:
+            directory = Path(directory) if directory else default_cache_dir() / "http"
+            _http_cache = HTTPMetadataCache(directory, max_bytes)
+
+
+def get_http_cache() -> Optional[HTTPMetadataCache]:
+    """Return the metadata cache, creating the default one on first use."""
+    if _http_cache is _UNSET:
+        configure_http_cache()
+    return _http_cache
+
+
+# =============================================================================
+# Streaming Writes
+# =============================================================================
+
+DEFAULT_MAX_FILE_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_SKILL_BYTES = 200 * 1024 * 1024
+
+
+class ByteBudget:
+    """Thread-safe running total of bytes written for one skill, with a cap."""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def consume(self, count: int) -> None:
+        """Account for count more bytes. Raises RuntimeError past the cap."""
+        with self._lock:
+            self.used += count
+            if self.limit is not None and self.used > self.limit:
+                raise RuntimeError(
+                    f"Skill exceeds the size limit of {self.limit} bytes"
+                )
+
+
+def stream_to_file(source, dest_path: Path, expected_size: Optional[int] = None,
+                   max_bytes: Optional[int] = None,
+                   budget: Optional[ByteBudget] = None) -> dict:
+    """
+    Copy a readable stream to dest_path in chunks, hashing as it goes.
+
+    Aborts with RuntimeError (removing the partial file) as soon as the file
+    passes max_bytes or the shared budget runs out. The git blob SHA needs
+    the size up front, so it is only computed when expected_size is given
+    and turns out to be right.
+
+    Returns:
+        {"size": int, "sha256": str, "git_sha": Optional[str]}
+    """
+    sha256 = hashlib.sha256()
+    git_sha = None
+    if expected_size is not None:
+        git_sha = hashlib.sha1(f"blob {expected_size}\0".encode())
+    size = 0
+
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(dest_path, "wb") as f:
+            for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b""):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise RuntimeError(
+                        f"{dest_path.name} exceeds the per-file size limit of {max_bytes} bytes"
+                    )
+                if budget is not None:
+                    budget.consume(len(chunk))
+                sha256.update(chunk)
+                if git_sha is not None:
+                    git_sha.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        try:
+            dest_path.unlink()
+        except OSError:
+            pass
+        raise
+
+    return {
+        "size": size,
+        "sha256": sha256.hexdigest(),
+        "git_sha": git_sha.hexdigest() if git_sha and size == expected_size else None,
+    }
+
+
+# =============================================================================
+# Blob Store
+# =============================================================================
+
+def git_blob_sha(file_path: Path) -> str:
+    """Compute the git blob SHA-1 of a file, as listed by the GitHub API."""
+    size = file_path.stat().st_size
+    digest = hashlib.sha1(f"blob {size}\0".encode())
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """
+    Local content-addressed store of downloaded files, keyed by git blob SHA.
+
+    Blobs live at <directory>/<sha[:2]>/<sha[2:]> and are kept read-only,
+    since read-only installs hardlink them. A file is only added when its
+    content actually hashes to the SHA GitHub listed for it, and restores
+    check the hash again, so a restored file is byte-identical to the one
+    in the repository.
+
+    Each snapshotted version of a skill also has a small JSON record at
+    <directory>/snapshots/<files_hash>.json, holding its file map and full
+    security scan, so neither has to be kept in skills.lock.json.
+
+    Blobs and records are keyed by content, so one may be shared by the
+    same skill installed in several roots. Every root whose manifest
+    refers to the store is registered under <directory>/roots, and
+    collect_blob_garbage() only deletes what none of their manifests
+    still lists.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _blob_path(self, sha: str) -> Optional[Path]:
+        if not sha or not re.fullmatch(r'[0-9a-f]{40}', sha):
+            return None
+        return self.directory / sha[:2] / sha[2:]
+
+    def _snapshot_path(self, files_hash: str) -> Optional[Path]:
+        digest = files_hash[len("sha256:"):] if files_hash.startswith("sha256:") else ""
+        if not re.fullmatch(r'[0-9a-f]{64}', digest):
+            return None
+        return self.directory / "snapshots" / f"{digest}.json"
+
+    def load_snapshot(self, files_hash: str) -> dict:
+        """
+        Return the record kept for a version ({"files", "security_scan"}),
+        or {} if there is none or it cannot be read.
+        """
+        snapshot_path = self._snapshot_path(files_hash)
+        if snapshot_path is None:
+            return {}
+        try:
+            record = json.loads(snapshot_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        return record if isinstance(record, dict) else {}
+
+    def save_snapshot(self, files_hash: str, record: dict) -> bool:
+        """Write a version's record. Returns True on success."""
+        snapshot_path = self._snapshot_path(files_hash)
+        if snapshot_path is None:
+            return False
+        tmp_path = snapshot_path.with_name(
+            f"{snapshot_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            tmp_path.write_text(json.dumps(record, sort_keys=True), encoding='utf-8')
+            os.replace(tmp_path, snapshot_path)
+            return True
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+
+    def register_root(self, manifest_path: Path) -> None:
+        """Record that a root's manifest refers to this store."""
+        path = os.path.abspath(manifest_path)
+        marker = self.directory / "roots" / hashlib.sha256(path.encode('utf-8')).hexdigest()[:32]
+        if marker.is_file():
+            return
+        tmp_path = marker.with_name(f"{marker.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            tmp_path.write_text(path, encoding='utf-8')
+            os.replace(tmp_path, marker)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def roots(self) -> list:
+        """Return (marker path, manifest path) for every registered root."""
+        try:
+            markers = [m for m in (self.directory / "roots").iterdir() if not m.name.endswith(".tmp")]
+        except OSError:
+            return []
+        roots = []
+        for marker in markers:
+            try:
+                roots.append((marker, Path(marker.read_text(encoding='utf-8'))))
+            except OSError:
+                continue
+        return roots
+
+    def prune(self, blobs: set, snapshots: set, before: float) -> tuple[int, int]:
+        """
+        Delete blobs whose SHA is not in blobs and snapshot records whose
+        files_hash is not in snapshots, if last modified before `before`
+        (epoch seconds). Returns the number of blobs and records deleted.
+        """
+        removed = [0, 0]
+
+        def remove(path: Path, index: int) -> None:
+            try:
+                if path.stat().st_mtime < before:
+                    path.unlink()
+                    removed[index] += 1
+            except OSError:
+                pass
+
+        try:
+            subdirs = [d for d in self.directory.iterdir() if re.fullmatch(r'[0-9a-f]{2}', d.name)]
+        except OSError:
+            subdirs = []
+        for subdir in subdirs:
+            try:
+                names = [p for p in subdir.iterdir() if re.fullmatch(r'[0-9a-f]{38}', p.name)]
+            except OSError:
+                continue
+            for blob_path in names:
+                if subdir.name + blob_path.name not in blobs:
+                    remove(blob_path, 0)
+        try:
+            records = list((self.directory / "snapshots").glob("*.json"))
+        except OSError:
+            records = []
+        for record_path in records:
+            if f"sha256:{record_path.stem}" not in snapshots:
+                remove(record_path, 1)
+        return removed[0], removed[1]
+
+    def has(self, sha: str) -> bool:
+        blob_path = self._blob_path(sha)
+        return blob_path is not None and blob_path.is_file()
+
+    def restore(self, sha: str, dest_path: Path, max_bytes: Optional[int] = None,
+                budget: Optional[ByteBudget] = None) -> Optional[dict]:
+        """
+        Copy the blob to dest_path, subject to the same limits as a download.
+        Returns the stream_to_file() digests, or None if it is not stored.
+        """
+        blob_path = self._blob_path(sha)
+        if blob_path is None:
+            return None
+        try:
+            with open(blob_path, "rb") as source:
+                size = os.fstat(source.fileno()).st_size
+                file_digests = stream_to_file(source, dest_path, size, max_bytes, budget)
+        except OSError:
+            return None
+        if file_digests["git_sha"] != sha:
+            # Corrupted blob: drop it and download the file instead
+            for path in (dest_path, blob_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            return None
+        return file_digests
+
+    def link(self, sha: str, dest_path: Path) -> bool:
+        """
+        Hardlink the blob to dest_path. Returns False if it is not stored;
+        raises OSError if the link cannot be made (e.g. another filesystem).
+        """
+        blob_path = self._blob_path(sha)
+        if blob_path is None or not blob_path.is_file():
+            return False
+        if blob_path.stat().st_mode & 0o222:
+            os.chmod(blob_path, 0o444)  # Stored before blobs were read-only
+        os.link(blob_path, dest_path)
+        return True
+
+    def add(self, sha: str, source_path: Path, digests: Optional[dict] = None) -> bool:
+        """
+        Store source_path under sha if its content matches. Returns True if stored.
+        A git_sha already computed while downloading is trusted instead of
+        re-reading the file.
+        """
+        blob_path = self._blob_path(sha)
+        if blob_path is None:
+            return False
+        if blob_path.is_file():
+            return True
+        tmp_path = blob_path.with_name(
+            f"{blob_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            if digests is not None:
+                if digests.get("git_sha") != sha:
+                    return False
+            elif git_blob_sha(source_path) != sha:
+                return False
+            blob_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            shutil.copyfile(source_path, tmp_path)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, blob_path)
+            return True
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
+
+
+_blob_store = _UNSET
+_blob_store_lock = threading.Lock()
+
+
+def configure_blob_store(directory: Optional[Path] = None, enabled: bool = True) -> None:
+    """Set up (or disable) the blob store used by download_directory()."""
+    global _blob_store
+    with _blob_store_lock:
+        if not enabled:
+            _blob_store = None
+        else:
+            directory = Path(directory) if directory else default_cache_dir() / "blobs"
+            _blob_store = BlobStore(directory)
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """Return the blob store, creating the default one on first use."""
+    if _blob_store is _UNSET:
+        configure_blob_store()
+    return _blob_store
 
 
 # =============================================================================
@@ -88,46 +981,72 @@ def to_api_url(owner: str, repo: str, branch: str, path: str) -> str:
 # =============================================================================
 
 def fetch_json(url: str, token: Optional[str] = None, verbose: bool = False) -> dict:
-    """Fetch JSON from URL with optional auth token."""
+    """
+    Fetch JSON from URL with optional auth token.
+    Responses with an ETag are cached on disk and revalidated with
+    If-None-Match, so unchanged metadata costs a 304 instead of a full fetch.
+    """
     if verbose:
         print(f"  Fetching: {url}")
-    
+
     headers = {"Accept": "application/vnd.github.v3+json"}
     if token:
         headers["Authorization"] = f"token {token}"
-    
-    request = urllib.request.Request(url, headers=headers)
-    
+
+    cache = get_http_cache()
+    cached = cache.get(url, token) if cache else None
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+
     try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            return json.loads(response.read().decode('utf-8'))
+        with http_get(url, headers) as response:
+            body = response.read()
+            if response.status == 304 and cached:
+                if verbose:
+                    print(f"  Not modified: {url}")
+                return cached["body"]
+            data = json.loads(body.decode('utf-8'))
+            etag = response.headers.get("ETag")
+            if cache and etag:
+                cache.put(url, etag, data, token)
+            return data
+    except RateLimitError as e:
+        raise RuntimeError(
+            f"GitHub rate limit exceeded; it resets at {format_reset(e.reset)}. "
+            f"Use --token for higher limits."
+        )
     except urllib.error.HTTPError as e:
         if e.code == 404:
             raise RuntimeError(f"Not found: {url}. Check URL or use --token for private repos.")
         elif e.code == 403:
-            raise RuntimeError(f"Rate limited or forbidden. Use --token for higher limits.")
+            raise RuntimeError(f"Forbidden: {url}. Use --token for private repos.")
         else:
             raise RuntimeError(f"HTTP {e.code}: {e.reason}")
     except urllib.error.URLError as e:
         raise RuntimeError(f"Network error: {e.reason}")
 
 
-def fetch_file(url: str, dest_path: Path, token: Optional[str] = None, verbose: bool = False) -> None:
-    """Download a file from URL to destination path."""
+def fetch_file(url: str, dest_path: Path, token: Optional[str] = None, verbose: bool = False,
+               expected_size: Optional[int] = None, max_bytes: Optional[int] = None,
+               budget: Optional[ByteBudget] = None) -> dict:
+    """
+    Stream a file from URL to destination path.
+    Returns its size, SHA-256 and git blob SHA (see stream_to_file()).
+    """
     if verbose:
         print(f"  Downloading: {url}")
-    
+
     headers = {}
     if token:
         headers["Authorization"] = f"token {token}"
-    
-    request = urllib.request.Request(url, headers=headers)
-    
+
     try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            content = response.read()
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            dest_path.write_bytes(content)
+        with http_get(url, headers) as response:
+            return stream_to_file(response, dest_path, expected_size, max_bytes, budget)
+    except RateLimitError as e:
+        raise RuntimeError(
+            f"Rate limited downloading {url}; it resets at {format_reset(e.reset)}"
+        )
     except urllib.error.HTTPError as e:
         raise RuntimeError(f"Failed to download {url}: HTTP {e.code}")
     except urllib.error.URLError as e:
@@ -180,77 +1099,760 @@ def verify_path_containment(child: Path, parent: Path) -> None:
         )
 
 
-def download_directory(owner: str, repo: str, branch: str, path: str,
-                       dest_dir: Path, token: Optional[str] = None,
-                       verbose: bool = False, current_depth: int = 0,
-                       max_depth: int = 5) -> list:
+DEFAULT_CONCURRENCY = 8
+
+
+# Git tree entry modes
+TREE_MODE_FILE = "100644"
+TREE_MODE_SYMLINK = "120000"
+
+
+def resolve_tree_sha(owner: str, repo: str, branch: str, path: str,
+                     token: Optional[str] = None, verbose: bool = False) -> str:
     """
-    Recursively download directory contents from GitHub.
-    Returns list of downloaded file paths (relative to dest_dir).
+    Resolve a repository directory to its git tree SHA with one API call.
+    The repository root's SHA is read from a non-recursive Git Trees listing
+    of the branch; a subdirectory's from a Contents API listing of its parent.
+    """
+    if not path:
+        return fetch_json(to_tree_url(owner, repo, branch, recursive=False), token, verbose)["sha"]
+
+    parent, _, name = path.rstrip("/").rpartition("/")
+    for item in list_directory_contents(owner, repo, branch, parent, token, verbose):
+        if item.get("name") == name:
+            if item.get("type") != "dir":
+                raise RuntimeError(f"Expected directory at {path}, got {item.get('type')}")
+            return item["sha"]
+    raise RuntimeError(f"Not found: {path} on branch {branch}")
+
+
+def list_tree_files(owner: str, repo: str, branch: str, path: str,
+                    token: Optional[str] = None, verbose: bool = False,
+                    max_depth: int = 5, tree_sha: Optional[str] = None) -> Optional[list]:
+    """
+    List every file below a GitHub directory with one recursive Git Trees API call.
+
+    Symlinks and submodules are skipped, as are files nested deeper than
+    max_depth. tree_sha skips resolve_tree_sha() when the caller already
+    has it; the repository root is listed through the branch name without
+    it. Returns entries in the same shape as list_remote_files(), plus the
+    git "mode" of files that are not plain 100644 blobs (executables), or
+    None when GitHub truncated the tree and the caller must walk it instead.
     """
-    if current_depth > max_depth:
+    if tree_sha is None:
+        tree_sha = resolve_tree_sha(owner, repo, branch, path, token, verbose) if path else branch
+    tree = fetch_json(to_tree_url(owner, repo, tree_sha), token, verbose)
+
+    if tree.get("truncated"):
+        if verbose:
+            print("  Tree listing truncated by GitHub, listing directories individually")
+        return None
+
+    files = []
+    too_deep = False
+    for item in tree.get("tree", []):
+        if item.get("type") != "blob" or item.get("mode") == TREE_MODE_SYMLINK:
+            continue
+        parts = [sanitize_filename(part) for part in item["path"].split("/")]
+        if len(parts) - 1 > max_depth:
+            too_deep = True
+            continue
+        file_entry = {
+            "path": "/".join(parts),
+            "sha": item.get("sha"),
+            "size": item.get("size"),
+        }
+        if item.get("mode", TREE_MODE_FILE) != TREE_MODE_FILE:
+            file_entry["mode"] = item["mode"]
+        files.append(file_entry)
+
+    if too_deep:
         print(f"  Warning: Max depth {max_depth} reached, skipping deeper directories")
-        return []
 
-    downloaded = []
-    contents = list_directory_contents(owner, repo, branch, path, token, verbose)
-
-    for item in contents:
-        item_name = sanitize_filename(item["name"])
-        item_type = item["type"]
-
-        if item_type == "file":
-            # Download via raw URL
-            raw_url = to_raw_url(owner, repo, branch, path, item_name)
-            dest_path = dest_dir / item_name
-            verify_path_containment(dest_path, dest_dir)
-            fetch_file(raw_url, dest_path, token, verbose)
-            downloaded.append(item_name)
-            print(f"  ✓ {item_name}")
-
-        elif item_type == "dir":
-            # Recursively download subdirectory
-            subdir = dest_dir / item_name
-            verify_path_containment(subdir, dest_dir)
-            subdir.mkdir(parents=True, exist_ok=True)
-            sub_path = f"{path}/{item_name}"
-            sub_files = download_directory(
-                owner, repo, branch, sub_path, subdir,
-                token, verbose, current_depth + 1, max_depth
-            )
-            downloaded.extend([f"{item_name}/{f}" for f in sub_files])
+    files.sort(key=lambda entry: entry["path"])
+    return files
 
-    return downloaded
 
+def list_remote_files(owner: str, repo: str, branch: str, path: str,
+                      token: Optional[str] = None, verbose: bool = False,
+                      max_depth: int = 5, concurrency: int = DEFAULT_CONCURRENCY,
+                      tree_sha: Optional[str] = None) -> list:
+    """
+    List every file below a GitHub directory.
 
-# =============================================================================
-# Validation
-# =============================================================================
+    Uses a single recursive Git Trees API call, falling back to walking the
+    directories with the Contents API when the tree is truncated. Returns
+    file entries sorted by relative path:
+        [{"path": "scripts/run.py", "sha": "...", "size": 123}, ...]
+    """
+    files = list_tree_files(owner, repo, branch, path, token, verbose, max_depth, tree_sha)
+    if files is not None:
+        return files
+    return walk_remote_directories(
+        owner, repo, branch, path, token, verbose, max_depth, concurrency
+    )
 
-def parse_simple_yaml(yaml_str: str) -> dict:
+
+def walk_remote_directories(owner: str, repo: str, branch: str, path: str,
+                            token: Optional[str] = None, verbose: bool = False,
+                            max_depth: int = 5,
+                            concurrency: int = DEFAULT_CONCURRENCY) -> list:
     """
-    Parse simple key: value YAML (no nested objects, no lists).
-    Sufficient for SKILL.md frontmatter.
+    List every file below a GitHub directory using the Contents API.
+
+    Directories at the same depth are listed in parallel. Every name is passed
+    through sanitize_filename(). Returns entries like list_remote_files().
     """
-    result = {}
-    for line in yaml_str.strip().split('\n'):
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        if ':' in line:
-            key, value = line.split(':', 1)
-            result[key.strip()] = value.strip().strip('"').strip("'")
-    return result
+    files = []
+    level = [(path, "")]  # (repo path, path relative to the skill root)
+    depth = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        while level:
+            if depth > max_depth:
+                print(f"  Warning: Max depth {max_depth} reached, skipping deeper directories")
+                break
+            listings = pool.map(
+                lambda entry: list_directory_contents(
+                    owner, repo, branch, entry[0], token, verbose
+                ),
+                level,
+            )
+            next_level = []
+            for (repo_path, rel_prefix), contents in zip(level, listings):
+                for item in contents:
+                    item_name = sanitize_filename(item["name"])
+                    rel_path = f"{rel_prefix}{item_name}"
+                    if item["type"] == "file":
+                        files.append({
+                            "path": rel_path,
+                            "sha": item.get("sha"),
+                            "size": item.get("size"),
+                        })
+                    elif item["type"] == "dir":
+                        sub_path = f"{repo_path}/{item_name}" if repo_path else item_name
+                        next_level.append((sub_path, f"{rel_path}/"))
+            level = next_level
+            depth += 1
+
+    files.sort(key=lambda entry: entry["path"])
+    return files
+
+
+def download_files(owner: str, repo: str, branch: str, path: str, entries: list,
+                   dest_dir: Path, token: Optional[str] = None, verbose: bool = False,
+                   concurrency: int = DEFAULT_CONCURRENCY,
+                   max_file_bytes: Optional[int] = None,
+                   budget: Optional[ByteBudget] = None,
+                   digests: Optional[dict] = None) -> list:
+    """
+    Download the listed files into dest_dir with a bounded worker pool.
+    Progress is printed and the relative paths returned in listing order,
+    regardless of the order in which downloads finish. If digests is given,
+    it is filled with each file's stream_to_file() digests by relative path.
+    """
+    jobs = []
+    for entry in entries:
+        rel_path = entry["path"]
+        parent, _, name = rel_path.rpartition("/")
+        dest_path = dest_dir.joinpath(*rel_path.split("/"))
+        verify_path_containment(dest_path, dest_dir)
+        repo_dir = f"{path}/{parent}" if path and parent else (path or parent)
+        jobs.append((rel_path, to_raw_url(owner, repo, branch, repo_dir, name),
+                     dest_path, entry.get("size")))
+
+    downloaded = []
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        futures = [
+            pool.submit(fetch_file, raw_url, dest_path, token, verbose,
+                        size, max_file_bytes, budget)
+            for _, raw_url, dest_path, size in jobs
+        ]
+        for (rel_path, _, _, _), future in zip(jobs, futures):
+            file_digests = future.result()
+            if digests is not None:
+                digests[rel_path] = file_digests
+            downloaded.append(rel_path)
+            print(f"  ✓ {rel_path}")
+    finally:
+        # On failure, drop queued downloads instead of finishing them
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    return downloaded
 
 
-def validate_skill_md(file_path: Path) -> tuple[bool, str]:
+def download_archive(owner: str, repo: str, branch: str, path: str, entries: list,
+                     dest_dir: Path, token: Optional[str] = None,
+                     verbose: bool = False, max_file_bytes: Optional[int] = None,
+                     budget: Optional[ByteBudget] = None,
+                     digests: Optional[dict] = None) -> list:
     """
-    Validate SKILL.md has proper YAML frontmatter.
-    Returns (success, error_message).
+    Download the listed files by streaming the repository tarball once.
+
+    The archive is read straight from the response and never written to disk.
+    Only regular-file members that appear in `entries` are extracted, after
+    the same sanitization and containment checks as per-file downloads.
+    Returns the relative paths in listing order and fills digests like
+    download_files().
     """
+    url = to_archive_url(owner, repo, branch)
+    if verbose:
+        print(f"  Downloading archive: {url}")
+
+    wanted = {entry["path"]: entry for entry in entries}
+    prefix = f"{path.strip('/')}/" if path.strip('/') else ""
+
+    headers = {}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    extracted = set()
     try:
-        content = file_path.read_text(encoding='utf-8')
-    except Exception as e:
+        with http_get(url, headers) as response:
+            with tarfile.open(fileobj=response, mode="r|gz") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    # Members are rooted at "{owner}-{repo}-{sha}/"
+                    _, _, repo_path = member.name.partition("/")
+                    if not repo_path.startswith(prefix):
+                        continue
+                    rel_path = repo_path[len(prefix):]
+                    if rel_path not in wanted:
+                        continue
+                    parts = [sanitize_filename(part) for part in rel_path.split("/")]
+                    dest_path = dest_dir.joinpath(*parts)
+                    verify_path_containment(dest_path, dest_dir)
+                    file_digests = stream_to_file(
+                        archive.extractfile(member), dest_path,
+                        wanted[rel_path].get("size"), max_file_bytes, budget
+                    )
+                    if digests is not None:
+                        digests[rel_path] = file_digests
+                    extracted.add(rel_path)
+    except RateLimitError as e:
+        raise RuntimeError(
+            f"Rate limited downloading {url}; it resets at {format_reset(e.reset)}"
+        )
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"Failed to download {url}: HTTP {e.code}")
+    except urllib.error.URLError as e:
+        raise RuntimeError(f"Network error downloading {url}: {e.reason}")
+    except (tarfile.TarError, OSError, EOFError) as e:
+        raise RuntimeError(f"Failed to extract archive {url}: {e}")
+
+    missing = wanted.keys() - extracted
+    if missing:
+        raise RuntimeError(
+            f"Archive is missing {len(missing)} listed file(s), e.g. {sorted(missing)[0]}"
+        )
+
+    downloaded = []
+    for entry in entries:
+        downloaded.append(entry["path"])
+        print(f"  ✓ {entry['path']}")
+    return downloaded
+
+
+# Skills with at least this many files are fetched as one repository tarball
+ARCHIVE_THRESHOLD = 50
+
+FETCH_MODES = ("auto", "files", "archive")
+
+
+def download_directory(owner: str, repo: str, branch: str, path: str,
+                       dest_dir: Path, token: Optional[str] = None,
+                       verbose: bool = False, current_depth: int = 0,
+                       max_depth: int = 5, concurrency: int = DEFAULT_CONCURRENCY,
+                       fetch_mode: str = "auto",
+                       max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES,
+                       max_skill_bytes: Optional[int] = DEFAULT_MAX_SKILL_BYTES,
+                       digests: Optional[dict] = None) -> list:
+    """
+    Recursively download directory contents from GitHub.
+
+    In "files" mode each file is fetched individually on a pool of
+    `concurrency` workers; in "archive" mode the repository tarball is
+    streamed once. "auto" picks archive mode when at least ARCHIVE_THRESHOLD
+    files need fetching. Files already in the blob store are copied from it
+    instead of downloaded, and new downloads are added to it.
+
+    Files larger than max_file_bytes, or skills larger than max_skill_bytes,
+    are rejected from the listed sizes before anything is fetched and again
+    while streaming. If digests is given, it is filled with each file's
+    size, SHA-256 and git blob SHA so later stages need not re-read files,
+    and with the git mode of files listed with one other than 100644.
+    Returns list of downloaded file paths (relative to dest_dir).
+    """
+    entries = list_remote_files(
+        owner, repo, branch, path, token, verbose,
+        max_depth=max_depth - current_depth, concurrency=concurrency
+    )
+
+    listed_total = 0
+    for entry in entries:
+        size = entry.get("size") or 0
+        if max_file_bytes is not None and size > max_file_bytes:
+            raise RuntimeError(
+                f"{entry['path']} is {size} bytes, over the per-file size limit "
+                f"of {max_file_bytes} bytes"
+            )
+        listed_total += size
+    if max_skill_bytes is not None and listed_total > max_skill_bytes:
+        raise RuntimeError(
+            f"Skill is {listed_total} bytes, over the size limit of {max_skill_bytes} bytes"
+        )
+
+    if digests is None:
+        digests = {}
+    budget = ByteBudget(max_skill_bytes)
+
+    # Serve files whose blob SHA is already in the local store
+    store = get_blob_store()
+    missing = []
+    for entry in entries:
+        dest_path = dest_dir.joinpath(*entry["path"].split("/"))
+        verify_path_containment(dest_path, dest_dir)
+        file_digests = None
+        if store and store.has(entry["sha"]):
+            file_digests = store.restore(entry["sha"], dest_path, max_file_bytes, budget)
+        if file_digests is not None:
+            digests[entry["path"]] = file_digests
+            print(f"  ✓ {entry['path']} (cached)")
+        else:
+            missing.append(entry)
+
+    if missing:
+        if fetch_mode == "auto":
+            fetch_mode = "archive" if len(missing) >= ARCHIVE_THRESHOLD else "files"
+
+        if fetch_mode == "archive":
+            if verbose:
+                print(f"  Fetching {len(missing)} file(s) from repository archive")
+            download_archive(
+                owner, repo, branch, path, missing, dest_dir, token, verbose,
+                max_file_bytes, budget, digests
+            )
+        else:
+            download_files(
+                owner, repo, branch, path, missing, dest_dir, token, verbose, concurrency,
+                max_file_bytes, budget, digests
+            )
+
+        if store:
+            for entry in missing:
+                store.add(
+                    entry["sha"], dest_dir.joinpath(*entry["path"].split("/")),
+                    digests.get(entry["path"])
+                )
+
+    for entry in entries:
+        if entry.get("mode") and entry["path"] in digests:
+            digests[entry["path"]]["mode"] = entry["mode"]
+
+    return [entry["path"] for entry in entries]
+
+
+# =============================================================================
+# File Inventory
+# =============================================================================
+
+# Suffixes whose content validate_file() reads (besides SKILL.md)
+VALIDATED_SUFFIXES = ('.py', '.json', '.yaml', '.yml')
+
+# Digest cache kept next to skills.lock.json
+DIGEST_CACHE_FILENAME = ".skills-digests.json"
+# Cached digests of files modified this close to hashing time are not trusted
+RACY_WINDOW_NS = 2 * 10**9
+
+
+class DigestCache:
+    """
+    Stat-keyed cache of file digests for one skills root directory.
+
+    A file's cached SHA-256 and git blob SHA are reused while its (path,
+    size, mtime_ns, ctime_ns, inode) are unchanged, so checking an unchanged
+    install costs only stat calls. The composite files_hash of each skill
+    is cached the same way, keyed by the stat data of all its files.
+
+    As in git's index, the key includes the ctime, which the kernel sets on
+    every write or utime() call and which can't be set back, so an edit
+    followed by an mtime reset still misses. An entry is also not trusted
+    if the file was modified within RACY_WINDOW_NS of hashing, since a
+    same-size rewrite in that window could keep the same mtime. Such files
+    are simply hashed again.
+    """
+
+    def __init__(self, root: Path):
+        self.path = Path(root) / DIGEST_CACHE_FILENAME
+        self._lock = threading.Lock()
+        self._batch_depth = 0
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = {}
+        self.files = data.get("files", {}) if isinstance(data, dict) else {}
+        self.trees = data.get("trees", {}) if isinstance(data, dict) else {}
+
+    @staticmethod
+    def fingerprint(stats: dict) -> str:
+        """Hash the stat data of a tree's files ({relative path: stat_result})."""
+        hasher = hashlib.sha256()
+        for rel_path, st in sorted(stats.items()):
+            hasher.update(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\0{st.st_ctime_ns}\0{st.st_ino}\n".encode())
+        return hasher.hexdigest()
+
+    def lookup(self, name: str, rel_path: str, st: os.stat_result) -> Optional[dict]:
+        """Return cached {"sha256", "git_sha"} for skill name's file, if still valid."""
+        entry = self.files.get(f"{name}/{rel_path}")
+        if (entry and entry.get("size") == st.st_size
+                and entry.get("mtime_ns") == st.st_mtime_ns
+                and entry.get("ctime_ns") == st.st_ctime_ns
+                and entry.get("ino") == st.st_ino
+                and st.st_mtime_ns < entry.get("hashed_ns", 0) - RACY_WINDOW_NS):
+            return entry
+        return None
+
+    def tree_hash(self, name: str, fingerprint: str, max_mtime_ns: int) -> Optional[str]:
+        """Return the cached files_hash of skill name, if its files are unchanged."""
+        entry = self.trees.get(name)
+        if (entry and entry.get("fingerprint") == fingerprint
+                and max_mtime_ns < entry.get("hashed_ns", 0) - RACY_WINDOW_NS):
+            return entry.get("files_hash")
+        return None
+
+    def update(self, name: str, files: dict, hashed_ns: int,
+               fingerprint: Optional[str] = None, files_hash: Optional[str] = None) -> None:
+        """
+        Replace the cached entries of skill name with files (an inventory's
+        "files") and, if given, its files_hash, then save the cache.
+        """
+        prefix = f"{name}/"
+        entries = {
+            prefix + rel_path: {
+                "size": digests["size"],
+                "mtime_ns": digests["mtime_ns"],
+                "ctime_ns": digests["ctime_ns"],
+                "ino": digests["ino"],
+                "sha256": digests["sha256"],
+                "git_sha": digests["git_sha"],
+                "hashed_ns": digests.get("hashed_ns", hashed_ns),
+            }
+            for rel_path, digests in files.items()
+        }
+        with self._lock:
+            stale = [key for key in self.files if key.startswith(prefix) and key not in entries]
+            changed = bool(stale) or any(self.files.get(key) != entry
+                                         for key, entry in entries.items())
+            for key in stale:
+                del self.files[key]
+            self.files.update(entries)
+            if files_hash and self.trees.get(name, {}).get("fingerprint") != fingerprint:
+                self.trees[name] = {
+                    "fingerprint": fingerprint,
+                    "files_hash": files_hash,
+                    "hashed_ns": hashed_ns,
+                }
+                changed = True
+            if changed:
+                self._dirty = True
+                if not self._batch_depth:
+                    self._save()
+
+    @contextmanager
+    def batch(self):
+        """Save once when the block ends instead of after every update()."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self._save()
+
+    def _save(self) -> None:
+        self._dirty = False
+        tmp_path = self.path.with_name(
+            f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            tmp_path.write_text(
+                json.dumps({"files": self.files, "trees": self.trees}), encoding='utf-8'
+            )
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+
+_digest_caches = {}
+_digest_cache_enabled = True
+_digest_cache_lock = threading.Lock()
+
+
+def configure_digest_cache(enabled: bool = True) -> None:
+    """Enable or disable the digest caches returned by get_digest_cache()."""
+    global _digest_cache_enabled
+    with _digest_cache_lock:
+        _digest_cache_enabled = enabled
+        _digest_caches.clear()
+
+
+def get_digest_cache(root: Path) -> Optional[DigestCache]:
+    """Return the (shared) digest cache of a skills root directory."""
+    with _digest_cache_lock:
+        if not _digest_cache_enabled:
+            return None
+        root = Path(root)
+        if root not in _digest_caches:
+            _digest_caches[root] = DigestCache(root)
+        return _digest_caches[root]
+
+
+def hash_file(file_path: Path, attempts: int = 3) -> tuple[str, str]:
+    """
+    Return (SHA-256, git blob SHA) of a file, reading it once in chunks
+    that feed both digests. hashlib releases the GIL for large updates.
+
+    The git blob SHA covers the size up front, so a file whose length
+    changes while it is read is hashed again, up to attempts times.
+
+    Raises:
+        OSError: If the file can't be read or keeps changing.
+    """
+    with open(file_path, 'rb') as f:
+        for _ in range(attempts):
+            size = os.fstat(f.fileno()).st_size
+            sha256 = hashlib.sha256()
+            git_sha = hashlib.sha1(f"blob {size}\0".encode())
+            length = 0
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+                git_sha.update(chunk)
+                length += len(chunk)
+            if length == size:
+                return sha256.hexdigest(), git_sha.hexdigest()
+            f.seek(0)
+    raise OSError(f"{file_path} changed while it was being hashed")
+
+
+def take_inventory(directory: Path, keep_content: bool = False,
+                   cache: Optional[DigestCache] = None,
+                   with_files_hash: bool = True,
+                   digests: Optional[dict] = None) -> dict:
+    """
+    Walk a skill tree once, reading every file at most once, so
+    validation, diffs, hashing and the manifest don't each walk and
+    re-read it.
+
+    Returns:
+        {
+            "files": {relative path: {"size", "mtime_ns", "ctime_ns", "ino",
+                                      "sha256", "git_sha"}},
+            "symlinks": [relative paths of symlinks],
+            "files_hash": composite hash (see compute_directory_hash()),
+                          None if not with_files_hash,
+            "content": {relative path: bytes} for the files validation
+                       reads; empty unless keep_content,
+            "modes": {relative path: git mode} of the files digests
+                     lists with a mode other than 100644; None without
+                     digests,
+        }
+
+    With a cache (for a tree directly inside the cache's root), files whose
+    stat data is unchanged are not read at all. The others are hashed in
+    parallel, unless the composite files_hash must be computed, which
+    needs one sequential read of every file.
+
+    digests maps relative paths to {"size", "sha256", "git_sha"} (and
+    "mode", if any) already computed for those files (e.g. by
+    download_directory()). They are
+    trusted while the size still matches, so those files are not hashed
+    again; files_hash and kept content still need them read once.
+
+    Like Path.is_file(), symlinks to files count as files, so files_hash
+    matches hashes recorded by earlier versions.
+    """
+    known = {
+        rel_posix: file_digests for rel_posix, file_digests in (digests or {}).items()
+        if file_digests.get("sha256") and file_digests.get("git_sha")
+    }
+    modes = None if digests is None else {
+        rel_posix: file_digests["mode"] for rel_posix, file_digests in digests.items()
+        if file_digests.get("mode")
+    }
+    paths = []
+    symlinks = []
+    for root, dirs, names in os.walk(directory):
+        rel_root = Path(root).relative_to(directory)
+        for name in dirs:
+            if os.path.islink(os.path.join(root, name)):
+                symlinks.append((rel_root / name).as_posix())
+        paths.extend(rel_root / name for name in names)
+    paths.sort(key=str)
+
+    # Stat everything first
+    stats = {}
+    for rel_path in paths:
+        file_path = directory / rel_path
+        try:
+            st = os.lstat(file_path)
+            if stat.S_ISLNK(st.st_mode):
+                symlinks.append(rel_path.as_posix())
+                st = os.stat(file_path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            stats[rel_path] = st
+
+    hashed_ns = time.time_ns()
+    name = directory.name
+    fingerprint = None
+    files_hash = None
+    if cache is not None:
+        fingerprint = DigestCache.fingerprint({p.as_posix(): st for p, st in stats.items()})
+        if with_files_hash:
+            max_mtime_ns = max((st.st_mtime_ns for st in stats.values()), default=0)
+            files_hash = cache.tree_hash(name, fingerprint, max_mtime_ns)
+
+    files = {}
+    content = {}
+    if keep_content or (with_files_hash and files_hash is None):
+        # One sequential pass feeds the composite hash and every file's digests
+        composite = hashlib.sha256()
+        for rel_path, st in stats.items():
+            rel_posix = rel_path.as_posix()
+            composite.update(str(rel_path).encode('utf-8'))
+            seeded = known.get(rel_posix)
+            if seeded is not None and seeded.get("size") != st.st_size:
+                seeded = None
+            sha256 = hashlib.sha256()
+            git_sha = hashlib.sha1(f"blob {st.st_size}\0".encode())
+            keep = keep_content and (
+                rel_path.name.lower() == 'skill.md'
+                or rel_path.suffix.lower() in VALIDATED_SUFFIXES
+            )
+            chunks = []
+            try:
+                with open(directory / rel_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                        composite.update(chunk)
+                        if seeded is None:
+                            sha256.update(chunk)
+                            git_sha.update(chunk)
+                        if keep:
+                            chunks.append(chunk)
+            except OSError:
+                continue  # Unreadable: hashed by name only, as before
+            files[rel_posix] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "ctime_ns": st.st_ctime_ns,
+                "ino": st.st_ino,
+                "sha256": seeded["sha256"] if seeded else sha256.hexdigest(),
+                "git_sha": seeded["git_sha"] if seeded else git_sha.hexdigest(),
+            }
+            if keep:
+                content[rel_posix] = b''.join(chunks)
+        if with_files_hash:
+            files_hash = f"sha256:{composite.hexdigest()}"
+    else:
+        # Per-file digests only: take them from the cache, hash misses in parallel
+        misses = []
+        for rel_path, st in stats.items():
+            rel_posix = rel_path.as_posix()
+            cached = cache.lookup(name, rel_posix, st) if cache is not None else None
+            seeded = known.get(rel_posix)
+            if cached is None and seeded is not None and seeded.get("size") == st.st_size:
+                cached = {**seeded, "hashed_ns": hashed_ns}
+            files[rel_posix] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "ctime_ns": st.st_ctime_ns,
+                "ino": st.st_ino,
+                "sha256": cached["sha256"] if cached else None,
+                "git_sha": cached["git_sha"] if cached else None,
+            }
+            if cached:
+                files[rel_posix]["hashed_ns"] = cached["hashed_ns"]
+            else:
+                misses.append(rel_posix)
+        if misses:
+            workers = min(DEFAULT_CONCURRENCY, len(misses))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    lambda rel: _try_hash_file(directory.joinpath(*rel.split("/"))), misses
+                )
+                for rel_posix, digests in zip(misses, results):
+                    if digests is None:
+                        del files[rel_posix]  # Unreadable
+                    else:
+                        files[rel_posix]["sha256"], files[rel_posix]["git_sha"] = digests
+        files = dict(sorted(files.items()))
+
+    if cache is not None:
+        cache.update(name, files, hashed_ns, fingerprint, files_hash)
+        for digests in files.values():
+            digests.pop("hashed_ns", None)
+
+    return {
+        "files": files,
+        "symlinks": sorted(symlinks),
+        "files_hash": files_hash,
+        "content": content,
+        "modes": None if modes is None else {
+            rel_posix: mode for rel_posix, mode in modes.items() if rel_posix in files
+        },
+    }
+
+
+def _try_hash_file(file_path: Path) -> Optional[tuple[str, str]]:
+    try:
+        return hash_file(file_path)
+    except (OSError, ValueError):
+        return None
+
+
+# =============================================================================
+# Validation
+# =============================================================================
+
+def parse_simple_yaml(yaml_str: str) -> dict:
+    """
+    Parse simple key: value YAML (no nested objects, no lists).
+    Sufficient for SKILL.md frontmatter.
+    """
+    result = {}
+    for line in yaml_str.strip().split('\n'):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if ':' in line:
+            key, value = line.split(':', 1)
+            result[key.strip()] = value.strip().strip('"').strip("'")
+    return result
+
+
+def _read_text(file_path: Path, data: Optional[bytes] = None) -> str:
+    """Decode content already read by take_inventory(), or read the file."""
+    if data is None:
+        return file_path.read_text(encoding='utf-8')
+    # Same newline translation as reading in text mode
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def validate_skill_md(file_path: Path, data: Optional[bytes] = None) -> tuple[bool, str]:
+    """
+    Validate SKILL.md has proper YAML frontmatter.
+    Returns (success, error_message).
+    """
+    try:
+        content = _read_text(file_path, data)
+    except Exception as e:
         return False, f"Cannot read file: {e}"
     
     if not content.startswith('---'):
@@ -273,11 +1875,18 @@ def validate_skill_md(file_path: Path) -> tuple[bool, str]:
     return True, ""
 
 
-def validate_python(file_path: Path) -> tuple[bool, str]:
-    """Validate Python syntax using ast.parse()."""
+def validate_python(file_path: Path, trees: Optional[dict] = None,
+                    data: Optional[bytes] = None) -> tuple[bool, str]:
+    """
+    Validate Python syntax using ast.parse().
+    If trees is given, stores trees[file_path] = (source, ast.Module) so the
+    security scan can reuse the parse instead of re-parsing the file.
+    """
     try:
-        content = file_path.read_text(encoding='utf-8')
-        ast.parse(content)
+        content = _read_text(file_path, data)
+        tree = ast.parse(content)
+        if trees is not None:
+            trees[file_path] = (content, tree)
         return True, ""
     except SyntaxError as e:
         return False, f"Python syntax error at line {e.lineno}: {e.msg}"
@@ -304,10 +1913,10 @@ def validate_shell(file_path: Path) -> tuple[bool, str]:
         return False, f"Cannot validate shell script: {e}"
 
 
-def validate_json(file_path: Path) -> tuple[bool, str]:
+def validate_json(file_path: Path, data: Optional[bytes] = None) -> tuple[bool, str]:
     """Validate JSON syntax."""
     try:
-        content = file_path.read_text(encoding='utf-8')
+        content = _read_text(file_path, data)
         json.loads(content)
         return True, ""
     except json.JSONDecodeError as e:
@@ -316,10 +1925,10 @@ def validate_json(file_path: Path) -> tuple[bool, str]:
         return False, f"Cannot read JSON: {e}"
 
 
-def validate_yaml(file_path: Path) -> tuple[bool, str]:
+def validate_yaml(file_path: Path, data: Optional[bytes] = None) -> tuple[bool, str]:
     """Validate basic YAML structure."""
     try:
-        content = file_path.read_text(encoding='utf-8')
+        content = _read_text(file_path, data)
         # Basic check: can we parse key: value pairs?
         parse_simple_yaml(content)
         return True, ""
@@ -327,49 +1936,67 @@ def validate_yaml(file_path: Path) -> tuple[bool, str]:
         return False, f"Invalid YAML: {e}"
 
 
-def validate_file(file_path: Path, verbose: bool = False) -> tuple[bool, str]:
+def validate_file(file_path: Path, verbose: bool = False,
+                  python_trees: Optional[dict] = None,
+                  data: Optional[bytes] = None) -> tuple[bool, str]:
     """
-    Validate a file based on its extension.
-    Returns (success, error_message).
+    Validate a file based on its extension, using its content (data) if
+    already read. Returns (success, error_message).
     """
     name = file_path.name.lower()
     suffix = file_path.suffix.lower()
     
     if name == 'skill.md':
-        return validate_skill_md(file_path)
+        return validate_skill_md(file_path, data)
     elif suffix == '.py':
-        return validate_python(file_path)
+        return validate_python(file_path, python_trees, data)
     elif suffix == '.sh':
         return validate_shell(file_path)
     elif suffix == '.json':
-        return validate_json(file_path)
+        return validate_json(file_path, data)
     elif suffix in ('.yaml', '.yml'):
-        return validate_yaml(file_path)
+        return validate_yaml(file_path, data)
     else:
         # No validation for other file types
         return True, ""
 
 
-def validate_all_files(directory: Path, verbose: bool = False) -> tuple[bool, list]:
+def validate_all_files(directory: Path, verbose: bool = False,
+                       python_trees: Optional[dict] = None,
+                       inventory: Optional[dict] = None) -> tuple[bool, list]:
     """
     Validate all files in directory recursively.
     Returns (all_valid, list_of_errors).
+
+    Files and their content come from inventory (a take_inventory() of
+    directory with keep_content), which is taken here if not given.
+
+    If python_trees is given, it is filled with {relative_path: (source, tree)}
+    for every .py file that parsed, for reuse by the security scanner.
     """
     errors = []
+    if inventory is None:
+        inventory = take_inventory(directory, keep_content=True)
     
     # First check: SKILL.md must exist
-    skill_md = directory / "SKILL.md"
-    if not skill_md.exists():
+    if "SKILL.md" not in inventory["files"]:
         errors.append("SKILL.md not found in skill directory")
         return False, errors
     
     # Validate all files
-    for file_path in directory.rglob('*'):
-        if file_path.is_file():
-            valid, error = validate_file(file_path, verbose)
-            if not valid:
-                errors.append(f"{file_path.name}: {error}")
-    
+    trees = {} if python_trees is not None else None
+    for rel_path in inventory["files"]:
+        file_path = directory.joinpath(*rel_path.split("/"))
+        valid, error = validate_file(
+            file_path, verbose, trees, inventory["content"].get(rel_path)
+        )
+        if not valid:
+            errors.append(f"{file_path.name}: {error}")
+
+    if trees:
+        for file_path, parsed in trees.items():
+            python_trees[str(file_path.relative_to(directory))] = parsed
+
     return len(errors) == 0, errors
 
 
@@ -413,18 +2040,13 @@ def check_root_skills_directory_safety(dest: Path, force: bool) -> None:
         sys.exit(4)
 
 
-def file_hash(file_path: Path) -> str:
-    """Calculate MD5 hash of a file for comparison."""
-    hasher = hashlib.md5()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            hasher.update(chunk)
-    return hasher.hexdigest()
-
-
-def compare_skill_directories(new_dir: Path, existing_dir: Path) -> dict:
+def compare_skill_directories(new_dir: Path, existing_dir: Path,
+                              new_digests: Optional[dict] = None,
+                              existing_digests: Optional[dict] = None) -> dict:
     """
     Compare two skill directories and return differences.
+    Each side is described by the "files" of its take_inventory(); pass
+    them when already taken, otherwise that tree is inventoried here.
     
     Returns:
         {
@@ -434,17 +2056,14 @@ def compare_skill_directories(new_dir: Path, existing_dir: Path) -> dict:
             "modified": [list of changed files],
         }
     """
-    def get_relative_files(base: Path) -> dict:
-        """Get all files relative to base with their hashes."""
-        files = {}
-        for file_path in base.rglob('*'):
-            if file_path.is_file():
-                rel_path = str(file_path.relative_to(base))
-                files[rel_path] = file_hash(file_path)
-        return files
-    
-    new_files = get_relative_files(new_dir)
-    existing_files = get_relative_files(existing_dir)
+    def get_relative_files(base: Path, digests: Optional[dict] = None) -> dict:
+        """Get all files relative to base with their SHA-256 digests."""
+        if digests is None:
+            digests = take_inventory(base, with_files_hash=False)["files"]
+        return {rel_path: file_digests["sha256"] for rel_path, file_digests in digests.items()}
+
+    new_files = get_relative_files(new_dir, new_digests)
+    existing_files = get_relative_files(existing_dir, existing_digests)
     
     new_set = set(new_files.keys())
     existing_set = set(existing_files.keys())
@@ -521,28 +2140,33 @@ def display_skill_diff(diff: dict, dest: Path, force: bool) -> bool:
 # =============================================================================
 
 MANIFEST_FILENAME = "skills.lock.json"
-
-
-def compute_directory_hash(directory: Path) -> str:
+# Optional SQLite manifest for large roots (--manifest-db), beside the JSON one
+MANIFEST_DB_FILENAME = "skills.lock.db"
+# Transactions on a manifest database between compactions
+MANIFEST_COMPACT_INTERVAL = 1000
+# Versions of each skill kept as snapshots for --rollback
+DEFAULT_KEEP_SNAPSHOTS = 3
+# Blobs and snapshot records younger than this are never garbage collected,
+# so files stored by an install that has not written its manifest yet survive
+BLOB_GC_GRACE_SECONDS = 3600
+
+# Set when update_manifest_entry() trims snapshots; manifest_transaction()
+# then runs collect_blob_garbage() once the manifest is written
+_blob_gc_requested = threading.Event()
+
+# Manifest paths whose database manifest_transaction() changed; main()
+# exports them to skills.lock.json when the command ends
+_changed_manifest_dbs = set()
+_changed_manifest_dbs_lock = threading.Lock()
+
+
+def compute_directory_hash(directory: Path, cache: Optional[DigestCache] = None) -> str:
     """
-    Compute a composite SHA-256 hash of all files in a directory.
-    Files are processed in sorted order for deterministic results.
+    Compute a composite SHA-256 hash of all files in a directory: each
+    file's relative path followed by its content, in sorted path order.
+    With a cache (see take_inventory()), an unchanged tree is not re-read.
     """
-    hasher = hashlib.sha256()
-    file_paths = sorted(
-        [p for p in directory.rglob('*') if p.is_file()],
-        key=lambda p: str(p.relative_to(directory))
-    )
-    for file_path in file_paths:
-        rel_path = str(file_path.relative_to(directory))
-        hasher.update(rel_path.encode('utf-8'))
-        try:
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hasher.update(chunk)
-        except OSError:
-            continue  # Skip unreadable files
-    return f"sha256:{hasher.hexdigest()}"
+    return take_inventory(directory, cache=cache)["files_hash"]
 
 
 def extract_skill_version(skill_dir: Path) -> Optional[str]:
@@ -602,8 +2226,197 @@ def _extract_skill_description(skill_dir: Path) -> str:
     return ""
 
 
+class ManifestDB:
+    """
+    A skills root's manifest kept in SQLite, for roots with thousands of skills.
+
+    Each skill is one row keyed by name (the primary key index) holding its
+    manifest entry as JSON, next to the columns display_manifest() lists.
+    Looking up or updating a skill touches one row, so it costs the same
+    however large the root grows. Writers are serialized by SQLite's own
+    lock. Every MANIFEST_COMPACT_INTERVAL transactions, compact() checkpoints
+    the write-ahead log, vacuums the file and refreshes skills.lock.json.
+    The CLI also exports skills.lock.json at the end of every command that
+    changed the database (see export_changed_manifests()), so tools that
+    read the JSON manifest keep working.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS skills (name TEXT PRIMARY KEY, version TEXT, "
+            "file_count INTEGER, description TEXT, entry TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _meta(self, key: str, default: str) -> str:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def get(self, name: str) -> Optional[dict]:
+        row = self.conn.execute("SELECT entry FROM skills WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, name: str, entry: dict) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO skills VALUES (?, ?, ?, ?, ?)",
+            (name, entry.get("version"), entry.get("file_count"), entry.get("description"),
+             json.dumps(entry, ensure_ascii=False)),
+        )
+
+    def delete(self, name: str) -> None:
+        self.conn.execute("DELETE FROM skills WHERE name = ?", (name,))
+
+    def names(self) -> list:
+        return [row[0] for row in self.conn.execute("SELECT name FROM skills ORDER BY name")]
+
+    def summaries(self):
+        """Yield (name, version, file_count, description) in name order, without entries."""
+        yield from self.conn.execute(
+            "SELECT name, version, file_count, description FROM skills ORDER BY name"
+        )
+
+    def to_manifest(self) -> dict:
+        """The whole manifest in the skills.lock.json structure."""
+        return {
+            "version": self._meta("version", "1.0"),
+            "skills": {
+                name: json.loads(entry) for name, entry in
+                self.conn.execute("SELECT name, entry FROM skills ORDER BY name")
+            },
+        }
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one atomic commit, taking the write lock up front."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+            transactions = int(self._meta("transactions_since_compact", "0")) + 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('transactions_since_compact', ?)",
+                (str(transactions),)
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        if transactions >= MANIFEST_COMPACT_INTERVAL:
+            self.compact()
+
+    def export(self, json_path: Path) -> int:
+        """Write the manifest as skills.lock.json. Returns the number of skills."""
+        manifest = self.to_manifest()
+        write_manifest(json_path, manifest)
+        return len(manifest["skills"])
+
+    def compact(self) -> None:
+        """Refresh the JSON export and shrink the database and its log."""
+        self.export(self.path.with_name(MANIFEST_FILENAME))
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('transactions_since_compact', '0')")
+        self.conn.execute("VACUUM")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+class _ManifestSkills:
+    """Mapping view of a ManifestDB's skills, for code written against the JSON dict."""
+
+    def __init__(self, db: ManifestDB):
+        self._db = db
+
+    def get(self, name: str, default=None):
+        entry = self._db.get(name)
+        return default if entry is None else entry
+
+    def __getitem__(self, name: str) -> dict:
+        entry = self._db.get(name)
+        if entry is None:
+            raise KeyError(name)
+        return entry
+
+    def __setitem__(self, name: str, entry: dict) -> None:
+        self._db.put(name, entry)
+
+    def __delitem__(self, name: str) -> None:
+        self._db.delete(name)
+
+    def __contains__(self, name: str) -> bool:
+        return self._db.get(name) is not None
+
+    def __iter__(self):
+        return iter(self._db.names())
+
+    def __len__(self) -> int:
+        return self._db.conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+
+
+_create_manifest_db = False
+
+
+def configure_manifest_db(create: bool) -> None:
+    """With create, roots without a manifest database get one (--manifest-db)."""
+    global _create_manifest_db
+    _create_manifest_db = create
+
+
+def open_manifest_db(manifest_path: Path) -> Optional[ManifestDB]:
+    """
+    Open the manifest database beside manifest_path, if the root has one
+    (or --manifest-db asks for it, in which case an existing skills.lock.json
+    is imported). Returns None for roots that use the JSON manifest.
+    """
+    db_path = manifest_path.with_name(MANIFEST_DB_FILENAME)
+    exists = db_path.is_file()
+    if sqlite3 is None or not (exists or (_create_manifest_db and db_path.parent.is_dir())):
+        return None
+    db = ManifestDB(db_path)
+    if not exists:
+        manifest = _read_manifest_json(manifest_path)
+        with db.transaction():
+            db.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                            (str(manifest.get("version", "1.0")),))
+            for name, entry in manifest["skills"].items():
+                db.put(name, entry)
+    return db
+
+
+def manifest_exists(manifest_path: Path) -> bool:
+    """Whether a root has a manifest, as JSON or as a database."""
+    return manifest_path.is_file() or manifest_path.with_name(MANIFEST_DB_FILENAME).is_file()
+
+
+def read_manifest_entry(manifest_path: Path, name: str) -> Optional[dict]:
+    """Look up one skill's entry; a database answers from its index."""
+    db = open_manifest_db(manifest_path)
+    if db is None:
+        return read_manifest(manifest_path)["skills"].get(name)
+    try:
+        return db.get(name)
+    finally:
+        db.close()
+
+
 def read_manifest(manifest_path: Path) -> dict:
-    """Read existing skills.lock.json or return empty manifest structure."""
+    """
+    Read existing skills.lock.json or return empty manifest structure.
+    Roots with a manifest database are read from it instead.
+    """
+    db = open_manifest_db(manifest_path)
+    if db is not None:
+        try:
+            return db.to_manifest()
+        finally:
+            db.close()
+    return _read_manifest_json(manifest_path)
+
+
+def _read_manifest_json(manifest_path: Path) -> dict:
     if manifest_path.exists() and manifest_path.is_file():
         try:
             content = manifest_path.read_text(encoding='utf-8')
@@ -620,7 +2433,9 @@ def read_manifest(manifest_path: Path) -> dict:
 
 def write_manifest(manifest_path: Path, manifest: dict) -> None:
     """Atomically write manifest to disk using tmp + rename."""
-    tmp_path = manifest_path.with_suffix('.tmp')
+    tmp_path = manifest_path.with_name(
+        f"{manifest_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
     try:
         content = json.dumps(manifest, indent=2, ensure_ascii=False) + '\n'
         tmp_path.write_text(content, encoding='utf-8')
@@ -638,245 +2453,1782 @@ def write_manifest(manifest_path: Path, manifest: dict) -> None:
             print(f"  Warning: Could not write manifest: {e}")
 
 
-def update_manifest_entry(dest: Path, source_url: str, verbose: bool = False) -> None:
+_manifest_locks = {}
+_manifest_locks_lock = threading.Lock()
+
+
+@contextmanager
+def manifest_lock(manifest_path: Path):
     """
-    After a successful install, update the manifest with the skill entry.
-    The manifest lives in the parent directory (the tool's root skills dir).
+    Hold the exclusive lock for a read-modify-write cycle on a manifest.
+
+    Other installers are excluded with flock() on a hidden sibling lock
+    file (advisory, so only processes that take it too); threads of this
+    process also share a lock per manifest. Where fcntl is unavailable or
+    the lock file cannot be created, only this process's threads are
+    excluded. Not reentrant: code already holding it must pass the
+    manifest along instead of locking again.
     """
-    manifest_path = dest.parent / MANIFEST_FILENAME
-    skill_name = dest.name
-    now = datetime.now(timezone.utc).isoformat()
+    key = os.path.abspath(manifest_path)
+    with _manifest_locks_lock:
+        thread_lock = _manifest_locks.setdefault(key, threading.Lock())
+    with thread_lock:
+        fd = None
+        if fcntl is not None:
+            try:
+                fd = os.open(manifest_path.with_name(f".{manifest_path.name}.lock"),
+                             os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except OSError:
+                if fd is not None:
+                    os.close(fd)
+                fd = None
+        try:
+            yield
+        finally:
+            if fd is not None:
+                os.close(fd)  # Releases the flock
 
-    manifest = read_manifest(manifest_path)
 
-    # Count files
-    file_count = sum(1 for p in dest.rglob('*') if p.is_file())
+@contextmanager
+def manifest_transaction(manifest_path: Path):
+    """
+    Read a manifest under manifest_lock() and yield it for changes. When the
+    block exits without an exception, the manifest is written back once,
+    atomically, however many entries were changed.
+
+    For a root with a manifest database, manifest["skills"] is a mapping
+    over its rows instead: entries are read and written one at a time and
+    committed together, without loading the rest of the manifest. The
+    root is then exported by export_changed_manifests().
+    """
+    with manifest_lock(manifest_path):
+        db = open_manifest_db(manifest_path)
+        if db is not None:
+            try:
+                with db.transaction():
+                    yield {"version": db._meta("version", "1.0"), "skills": _ManifestSkills(db)}
+            finally:
+                db.close()
+            with _changed_manifest_dbs_lock:
+                _changed_manifest_dbs.add(manifest_path)
+        else:
+            manifest = read_manifest(manifest_path)
+            yield manifest
+            write_manifest(manifest_path, manifest)
 
-    # Compute hash and extract metadata
-    files_hash = compute_directory_hash(dest)
-    version = extract_skill_version(dest)
-    description = _extract_skill_description(dest)
+    if _blob_gc_requested.is_set():
+        _blob_gc_requested.clear()
+        store = get_blob_store()
+        if store is not None:
+            collect_blob_garbage(store)
 
-    # Preserve original install date if updating
-    existing = manifest["skills"].get(skill_name, {})
-    installed_at = existing.get("installed_at", now)
 
-    manifest["skills"][skill_name] = {
-        "name": skill_name,
-        "description": description,
-        "source_url": source_url,
-        "installed_at": installed_at,
-        "updated_at": now,
-        "version": version,
-        "files_hash": files_hash,
-        "file_count": file_count,
+def _read_manifest_strict(manifest_path: Path) -> dict:
+    """
+    Read a manifest for garbage collection. Unlike read_manifest(), raises
+    (OSError, ValueError or sqlite3.Error) instead of returning an empty
+    manifest, and never creates a database.
+    """
+    db_path = manifest_path.with_name(MANIFEST_DB_FILENAME)
+    if db_path.is_file():
+        if sqlite3 is None:
+            raise ValueError(f"{db_path} needs sqlite3")
+        db = ManifestDB(db_path)
+        try:
+            return db.to_manifest()
+        finally:
+            db.close()
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("skills"), dict):
+        raise ValueError(f"Malformed manifest at {manifest_path}")
+    return manifest
+
+
+def collect_blob_garbage(store: BlobStore, grace: Optional[float] = None) -> Optional[tuple]:
+    """
+    Delete blobs and snapshot records that no registered root still refers
+    to: neither an entry's installed files nor any snapshot it keeps. Files
+    modified within grace seconds (default BLOB_GC_GRACE_SECONDS) are kept.
+
+    Returns (blobs, records) deleted, or None if a registered manifest
+    could not be read, in which case nothing is deleted.
+    """
+    grace = BLOB_GC_GRACE_SECONDS if grace is None else grace
+    read_errors = (OSError, ValueError) + ((sqlite3.Error,) if sqlite3 is not None else ())
+    blobs, snapshots = set(), set()
+    for marker, manifest_path in store.roots():
+        if not manifest_exists(manifest_path):
+            try:
+                marker.unlink()  # Root removed
+            except OSError:
+                pass
+            continue
+        try:
+            skills = _read_manifest_strict(manifest_path)["skills"]
+        except read_errors:
+            return None
+        for entry in skills.values():
+            if entry.get("files_hash"):
+                snapshots.add(entry["files_hash"])
+            blobs.update((entry.get("files") or {}).values())
+            for snap in entry.get("snapshots") or []:
+                snapshots.add(snap.get("files_hash"))
+                blobs.update((snapshot_file_map(store, entry, snap) or {}).values())
+    return store.prune(blobs, snapshots, time.time() - grace)
+
+
+def export_manifest(skills_dir: Path) -> int:
+    """
+    Write a root's manifest database out as skills.lock.json (--export-manifest).
+    Returns the process exit code.
+    """
+    manifest_path = skills_dir / MANIFEST_FILENAME
+    if sqlite3 is None or not manifest_path.with_name(MANIFEST_DB_FILENAME).is_file():
+        print(f"Error: No {MANIFEST_DB_FILENAME} in {skills_dir}", file=sys.stderr)
+        return 2
+    with manifest_lock(manifest_path):
+        db = open_manifest_db(manifest_path)
+        try:
+            count = db.export(manifest_path)
+        finally:
+            db.close()
+    print(f"Exported {count} skill(s) to {manifest_path}")
+    return 0
+
+
+def export_changed_manifests() -> None:
+    """
+    Export every manifest database changed in this process to its
+    skills.lock.json, so the JSON manifest never lags a command behind.
+    """
+    with _changed_manifest_dbs_lock:
+        manifest_paths = sorted(_changed_manifest_dbs)
+        _changed_manifest_dbs.clear()
+    for manifest_path in manifest_paths:
+        try:
+            with manifest_lock(manifest_path):
+                db = open_manifest_db(manifest_path)
+                if db is None:
+                    continue
+                try:
+                    db.export(manifest_path)
+                finally:
+                    db.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"  Warning: Could not export {manifest_path}: {e}", file=sys.stderr)
+
+
+def scan_record(report: dict) -> dict:
+    """Reduce a scanner report to the record kept in the blob store."""
+    return {
+        "profile": report.get("profile", "full"),
+        "scanned_at": report.get("scan_timestamp"),
+        "summary": report.get("summary", {}),
+        "findings": report.get("findings", []),
     }
 
-    write_manifest(manifest_path, manifest)
 
-    if verbose:
-        print(f"  Updated manifest: {manifest_path}")
+def scan_summary(record: dict) -> dict:
+    """The part of a scan_record() stored in the manifest: everything but the findings."""
+    return {key: value for key, value in record.items() if key != "findings"}
+
+
+def merkle_root(files: dict, modes: Optional[dict] = None) -> str:
+    """
+    Merkle root of a file map {relative path: git blob SHA}: the git tree
+    SHA of those files, stored with their git mode from modes ({relative
+    path: mode}), or as regular (100644) files. Every directory hashes its
+    children, so unchanged subtrees hash the same.
+    """
+    modes = modes or {}
+    root = {}
+    for rel_path, sha in files.items():
+        parts = rel_path.split("/")
+        node = root
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = (modes.get(rel_path, TREE_MODE_FILE), sha)
+
+    def tree_sha(node: dict) -> str:
+        entries = []
+        for name, child in node.items():
+            encoded = name.encode('utf-8')
+            if isinstance(child, dict):
+                entries.append((encoded + b"/", b"40000 " + encoded + b"\0"
+                                + bytes.fromhex(tree_sha(child))))
+            else:
+                mode, sha = child
+                entries.append((encoded, f"{mode} ".encode() + encoded + b"\0"
+                                + bytes.fromhex(sha)))
+        body = b"".join(entry for _, entry in sorted(entries))
+        return hashlib.sha1(b"tree %d\0" % len(body) + body).hexdigest()
+
+    return tree_sha(root)
+
+
+def snapshot_files(directory: Path, inventory: dict) -> Optional[dict]:
+    """
+    Add every file of an installed skill (as listed by its inventory) to
+    the blob store and return the snapshot file map {relative path: git
+    blob SHA}. Returns None if the blob store is disabled or a file could
+    not be stored.
+    """
+    store = get_blob_store()
+    if store is None:
+        return None
+    files = {}
+    for rel_path, file_digests in sorted(inventory["files"].items()):
+        sha = file_digests["git_sha"]
+        if not store.add(sha, directory.joinpath(*rel_path.split("/")), file_digests):
+            return None
+        files[rel_path] = sha
+    return files
+
+
+def update_manifest_entry(dest: Path, source_url: str, verbose: bool = False,
+                          security_scan: Optional[dict] = None,
+                          inventory: Optional[dict] = None,
+                          keep_snapshots: int = DEFAULT_KEEP_SNAPSHOTS,
+                          manifest: Optional[dict] = None) -> None:
+    """
+    After a successful install, update the manifest with the skill entry.
+    The manifest lives in the parent directory (the tool's root skills dir).
+
+    The update is a locked read-modify-write (see manifest_transaction()).
+    To record several skills with one write, open the transaction yourself
+    and pass its manifest; it is then changed in place and not written.
+
+    If security_scan (a scanner report) is given, its summary is stored
+    in the entry and its findings in the version's blob store record, so
+    a later audit can show them without rescanning.
+
+    Each file's git blob SHA is recorded under "files", with their
+    merkle_root(), for --verify and --check-updates. Files the source
+    lists with a mode other than 100644 are recorded under "modes" and
+    hashed with it, so the root matches the source's git tree SHA.
+    Without modes in the inventory (an offline restore), those of the
+    existing entry are kept if its files_hash is unchanged. files_hash is
+    kept as before.
+
+    The installed version is also recorded as a snapshot, indexed by
+    files_hash, for --rollback. The manifest only lists it, with the
+    files themselves in the blob store. Its file map is the entry's
+    "files" while it is installed, and is moved to its blob store record
+    (see BlobStore.save_snapshot()) once another version replaces it, so
+    each map is stored once. The newest keep_snapshots distinct versions
+    are listed; when older ones are dropped, the blobs and records that
+    no root refers to any more are garbage collected once the manifest
+    is written (see collect_blob_garbage()).
+
+    inventory is a take_inventory() of dest, or of the staging tree it was
+    placed from; it is taken here if not given.
+    """
+    manifest_path = dest.parent / MANIFEST_FILENAME
+    if manifest is None:
+        with manifest_transaction(manifest_path) as manifest:
+            update_manifest_entry(dest, source_url, False, security_scan, inventory,
+                                  keep_snapshots, manifest)
+        if verbose:
+            print(f"  Updated manifest: {manifest_path}")
+        return
+
+    skill_name = dest.name
+    now = datetime.now(timezone.utc).isoformat()
+
+    if inventory is None:
+        inventory = take_inventory(dest)
+
+    # Count files, hash and extract metadata
+    file_count = len(inventory["files"])
+    files_hash = inventory["files_hash"]
+    version = extract_skill_version(dest)
+    description = _extract_skill_description(dest)
+
+    # Preserve original install date if updating
+    existing = manifest["skills"].get(skill_name, {})
+    installed_at = existing.get("installed_at", now)
+
+    files = {
+        rel_path: digests["git_sha"] for rel_path, digests in sorted(inventory["files"].items())
+    }
+    modes = inventory.get("modes")
+    if modes is None:
+        modes = existing.get("modes", {}) if existing.get("files_hash") == files_hash else {}
+    modes = {rel_path: mode for rel_path, mode in sorted(modes.items()) if rel_path in files}
+
+    entry = {
+        "name": skill_name,
+        "description": description,
+        "source_url": source_url,
+        "installed_at": installed_at,
+        "updated_at": now,
+        "version": version,
+        "files_hash": files_hash,
+        "file_count": file_count,
+        "merkle_root": merkle_root(files, modes),
+        "files": files,
+    }
+    if modes:
+        entry["modes"] = modes
+    store = get_blob_store()
+    record = store.load_snapshot(files_hash) if store is not None else {}
+    snapshots = existing.get("snapshots") or []
+    previous = next((snap for snap in snapshots if snap.get("files_hash") == files_hash), {})
+    if security_scan is not None:
+        record["security_scan"] = scan_record(security_scan)
+        entry["security_scan"] = scan_summary(record["security_scan"])
+    elif previous.get("security_scan"):
+        # Same content as a scanned snapshot (e.g. a rollback): reuse its record
+        entry["security_scan"] = previous["security_scan"]
+
+    snapshots = [snap for snap in snapshots if snap is not previous]
+    if keep_snapshots > 0:
+        if snapshot_files(dest, inventory) is not None:
+            snapshot = {
+                "files_hash": files_hash,
+                "source_url": source_url,
+                "version": version,
+                "created_at": previous.get("created_at", now),
+            }
+            if "security_scan" in entry:
+                snapshot["security_scan"] = entry["security_scan"]
+            snapshots.insert(0, snapshot)
+    if keep_snapshots > 0 and snapshots:
+        entry["snapshots"] = snapshots[:keep_snapshots]
+    if len(snapshots) > max(keep_snapshots, 0) or (
+            existing.get("files_hash") not in (None, files_hash)
+            and not any(snap.get("files_hash") == existing["files_hash"]
+                        for snap in entry.get("snapshots", []))):
+        _blob_gc_requested.set()  # Dropped a version: its files may be unreferenced
+    if store is not None:
+        store.register_root(manifest_path)
+        # The replaced version's map leaves the entry, so keep it with its snapshot
+        replaced = existing.get("files_hash")
+        if (replaced != files_hash and existing.get("files")
+                and any(snap.get("files_hash") == replaced for snap in entry.get("snapshots", []))):
+            replaced_record = store.load_snapshot(replaced)
+            replaced_record["files"] = existing["files"]
+            if existing.get("modes"):
+                replaced_record["modes"] = existing["modes"]
+            store.save_snapshot(replaced, replaced_record)
+        if record:
+            store.save_snapshot(files_hash, record)
+    manifest["skills"][skill_name] = entry
+
+
+def display_manifest(manifest_path: Path) -> None:
+    """
+    Display installed skills from a manifest file. A manifest database is
+    read column by column, without decoding the entries.
+    """
+    db = open_manifest_db(manifest_path)
+    if db is not None:
+        try:
+            rows = list(db.summaries())
+        finally:
+            db.close()
+    else:
+        rows = [
+            (name, info.get("version"), info.get("file_count"), info.get("description"))
+            for name, info in sorted(read_manifest(manifest_path).get("skills", {}).items())
+        ]
+
+    if not rows:
+        print("No skills tracked in manifest.")
+        return
+
+    print(f"\nInstalled skills ({len(rows)}):")
+    print("-" * 70)
+    print(f"  {'Name':<25} {'Version':<10} {'Files':<6} {'Description'}")
+    print("-" * 70)
+
+    for name, version, file_count, desc in rows:
+        version = version or "unknown"
+        file_count = "?" if file_count is None else file_count
+        desc = desc or ""
+        if len(desc) > 35:
+            desc = desc[:32] + "..."
+        print(f"  {name:<25} {version:<10} {file_count:<6} {desc}")
+
+    print("-" * 70)
+    print(f"  Total: {len(rows)} skill(s)")
+    print(f"  Manifest: {manifest_path}")
+
+
+def display_audit(manifest_path: Path) -> None:
+    """
+    Show the security scan results recorded in a manifest, without
+    rescanning. Findings are read from the blob store records.
+    """
+    manifest = read_manifest(manifest_path)
+    skills = manifest.get("skills", {})
+    store = get_blob_store()
+
+    if not skills:
+        print("No skills tracked in manifest.")
+        return
+
+    print(f"\nSecurity audit ({len(skills)} skill(s)):")
+    for name, info in sorted(skills.items()):
+        print("-" * 70)
+        record = info.get("security_scan")
+        if not record:
+            print(f"  {name}: no scan recorded")
+            continue
+        summary = format_scan_summary(record.get("summary", {}))
+        print(f"  {name}: {summary} ({record.get('profile', 'full')} profile, "
+              f"scanned {record.get('scanned_at') or 'unknown'})")
+        stored = store.load_snapshot(info.get("files_hash") or "") if store else {}
+        findings = stored.get("security_scan", {}).get("findings")
+        if findings is not None:
+            print_findings(findings)
+        elif summary != "clean":
+            print("    (findings not in the blob store; rescan with scan_skill.py)")
+    print("-" * 70)
+    print(f"  Manifest: {manifest_path}")
+
+
+# =============================================================================
+# Installation
+# =============================================================================
+
+def _check_for_symlinks(directory: Path, inventory: dict) -> None:
+    """Raise RuntimeError if directory's inventory lists any symlinks."""
+    if inventory["symlinks"]:
+        raise RuntimeError(
+            f"Symlink detected in existing skill directory: "
+            f"{directory / inventory['symlinks'][0]}\n"
+            f"This is unexpected and may indicate tampering. "
+            f"Remove symlinks manually before updating."
+        )
+
+
+# Linux FICLONE ioctl: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+# errnos meaning "this filesystem can't do that", so stop trying for the tree
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+    errno.ENOSYS, errno.EPERM, errno.EBADF,
+}
+
+
+def _reflink_file(source: Path, dest: Path) -> None:
+    """Clone source to dest with FICLONE, sharing its data blocks. Raises OSError."""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "FICLONE is not available")
+    try:
+        with open(source, "rb") as src, open(dest, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        try:
+            dest.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _copy_file(source: Path, dest: Path, unsupported: set) -> None:
+    """
+    Copy source to dest in the kernel with copy_file_range(), which also
+    shares extents or copies server-side where the filesystem supports it.
+    Falls back to shutil.copyfile(). Some filesystems report 0 bytes copied
+    before the end of the file; the rest is then copied in userspace.
+    """
+    if hasattr(os, "copy_file_range") and "copy_file_range" not in unsupported:
+        try:
+            with open(source, "rb") as src, open(dest, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if not copied:
+                        # Both offsets have advanced past what was copied
+                        unsupported.add("copy_file_range")
+                        shutil.copyfileobj(src, dst)
+                        break
+                    remaining -= copied
+            return
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS:
+                raise
+            unsupported.add("copy_file_range")
+    shutil.copyfile(source, dest)
+
+
+def place_file(source: Path, dest: Path, git_sha: Optional[str],
+               store: Optional["BlobStore"], unsupported: set,
+               link_source: bool = False) -> str:
+    """
+    Place one file, trying reflink, then a hardlink from the blob store
+    (only when store is given), then a hardlink to source itself (only when
+    link_source), then a copy. Strategies that fail as unsupported are
+    added to `unsupported` and skipped for later files. Returns the
+    strategy used.
+    """
+    if "reflink" not in unsupported:
+        try:
+            _reflink_file(source, dest)
+            return "reflink"
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS:
+                raise
+            unsupported.add("reflink")
+
+    if store is not None and git_sha and "hardlink" not in unsupported:
+        try:
+            if store.link(git_sha, dest):
+                return "hardlink"
+        except OSError as e:
+            if e.errno in UNSUPPORTED_ERRNOS:
+                unsupported.add("hardlink")
+            elif e.errno != errno.EMLINK:
+                raise
+
+    if link_source and "link_source" not in unsupported:
+        try:
+            os.link(source, dest)
+            return "hardlink"
+        except OSError as e:
+            if e.errno in UNSUPPORTED_ERRNOS:
+                unsupported.add("link_source")
+            elif e.errno != errno.EMLINK:
+                raise
+
+    _copy_file(source, dest, unsupported)
+    return "copy"
+
+
+def place_tree(source_dir: Path, dest_dir: Path, digests: Optional[dict] = None,
+               read_only: bool = False, link_source: bool = False) -> dict:
+    """
+    Fill dest_dir (created if missing) with a copy of source_dir, sharing
+    file data where possible.
+
+    Each file is placed with the first strategy that works here:
+      1. reflink: FICLONE clone on copy-on-write filesystems (Btrfs, XFS, ...)
+      2. hardlink: link to the blob store's copy, for read-only installs
+      3. hardlink: link to the source file, when link_source says source_dir
+         is private staging that is thrown away afterwards
+      4. copy: copy_file_range() in the kernel, else a plain copy
+    digests maps relative paths to their download digests, whose git_sha
+    finds the blob to hardlink. Read-only installs also drop write
+    permission from every file. Returns {strategy: file count}.
+    """
+    store = get_blob_store() if read_only else None
+    digests = digests or {}
+    unsupported = set()
+    counts = {}
+    dest_dir.mkdir(exist_ok=True)
+    shutil.copymode(source_dir, dest_dir)
+    for root, dirs, files in os.walk(source_dir):
+        rel_root = Path(root).relative_to(source_dir)
+        for name in dirs:
+            (dest_dir / rel_root / name).mkdir()
+        for name in files:
+            source = Path(root) / name
+            dest = dest_dir / rel_root / name
+            git_sha = digests.get((rel_root / name).as_posix(), {}).get("git_sha")
+            strategy = place_file(source, dest, git_sha, store, unsupported, link_source)
+            if strategy != "hardlink":
+                shutil.copystat(source, dest)
+            if read_only:
+                os.chmod(dest, os.stat(dest).st_mode & ~0o222)
+            counts[strategy] = counts.get(strategy, 0) + 1
+    return counts
+
+
+def format_placement(counts: dict) -> str:
+    """Describe placement counts, e.g. 'reflink (12 files), copy (1 file)'."""
+    if not counts:
+        return "no files"
+    return ", ".join(
+        f"{strategy} ({count} file{'s' if count != 1 else ''})"
+        for strategy, count in counts.items()
+    )
+
+
+# renameat2() flags (Linux)
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+_renameat2 = _UNSET
+
+
+def _get_renameat2():
+    """Look up libc's renameat2() once. Returns None where it is unavailable."""
+    global _renameat2
+    if _renameat2 is _UNSET:
+        _renameat2 = None
+        if sys.platform.startswith("linux"):
+            try:
+                func = ctypes.CDLL(None, use_errno=True).renameat2
+                func.argtypes = [ctypes.c_int, ctypes.c_char_p,
+                                 ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+                func.restype = ctypes.c_int
+                _renameat2 = func
+            except (OSError, AttributeError):
+                pass
+    return _renameat2
+
+
+def exchange_paths(a: Path, b: Path) -> bool:
+    """
+    Atomically swap two existing paths with renameat2(RENAME_EXCHANGE).
+    Returns False if the platform or filesystem does not support it.
+    """
+    renameat2 = _get_renameat2()
+    if renameat2 is None:
+        return False
+    if renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+        return False
+    raise OSError(err, os.strerror(err), str(a))
+
+
+_cleanup_threads = []
+_cleanup_lock = threading.Lock()
+
+
+def remove_tree_async(path: Path) -> None:
+    """Delete a replaced skill tree on a background thread."""
+    thread = threading.Thread(
+        target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True},
+        name=f"cleanup-{path.name}"
+    )
+    thread.start()
+    with _cleanup_lock:
+        _cleanup_threads.append(thread)
+
+
+def retire_tree(path: Path, root: Path) -> None:
+    """
+    Move a replaced skill tree out of the skills root, then delete it in the
+    background. Agents discover skills by scanning the root, so the old
+    SKILL.md must not linger there, even under a hidden name. Where the tree
+    cannot be moved beside the root (no write access to its parent, or the
+    root is a mount point), it is deleted before returning.
+    """
+    try:
+        trash = Path(tempfile.mkdtemp(prefix=f".{root.name}.trash-", dir=root.parent))
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    try:
+        os.rename(path, trash / path.name)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+    remove_tree_async(trash)
+
+
+def wait_for_cleanup() -> None:
+    """Block until every remove_tree_async() deletion has finished."""
+    with _cleanup_lock:
+        threads = list(_cleanup_threads)
+        _cleanup_threads.clear()
+    for thread in threads:
+        thread.join()
+
+
+def staging_directory(dest: Path) -> tempfile.TemporaryDirectory:
+    """
+    Create a hidden staging directory next to dest, so the staged tree is
+    on the destination's filesystem and can be linked or renamed into place.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    return tempfile.TemporaryDirectory(prefix=f".{dest.name}.staging-", dir=dest.parent)
+
+
+def install_skill(temp_dir: Path, dest: Path, verbose: bool = False,
+                  digests: Optional[dict] = None, read_only: bool = False,
+                  link_source: bool = False, existing: Optional[dict] = None) -> dict:
+    """
+    Place validated skill from staging at destination using atomic swap.
+
+      1. Check for symlinks in the existing destination (safety)
+      2. Place staging -> hidden sibling .<name>.new-* (see place_tree())
+      3. Swap the sibling with dest using renameat2(RENAME_EXCHANGE), so
+         dest is never missing or half-written. Where that is unsupported,
+         rename dest aside and the sibling into place.
+      4. Move the old tree out of the skills root and delete it in the
+         background (see retire_tree())
+    On failure the sibling is removed and dest is left as it was.
+
+    link_source allows hardlinking files from temp_dir, for staging that
+    is discarded after this install. existing is a take_inventory() of
+    dest already taken by the caller; otherwise one is taken here (from
+    the digest cache where possible) for the symlink check. Returns the
+    place_tree() strategy counts, which are also reported.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists():
+        # Safety: check for symlinks in existing directory
+        if existing is None:
+            existing = take_inventory(dest, cache=get_digest_cache(dest.parent),
+                                      with_files_hash=False)
+        _check_for_symlinks(dest, existing)
+
+    prefix = f".{dest.name}.new-"
+    new_path = Path(tempfile.mkdtemp(prefix=prefix, dir=dest.parent))
+    try:
+        counts = place_tree(temp_dir, new_path, digests, read_only, link_source)
+
+        if not dest.exists():
+            os.rename(new_path, dest)
+        elif exchange_paths(new_path, dest):
+            if verbose:
+                print(f"  Swapped in new version of {dest.name}")
+            retire_tree(new_path, dest.parent)  # Now holds the old version
+        else:
+            old_path = dest.with_name(f".{dest.name}.old-{new_path.name[len(prefix):]}")
+            if verbose:
+                print(f"  Replacing {dest.name} (atomic exchange unsupported here)")
+            os.rename(dest, old_path)
+            try:
+                os.rename(new_path, dest)
+            except OSError:
+                os.rename(old_path, dest)
+                raise
+            retire_tree(old_path, dest.parent)
+    except BaseException:
+        shutil.rmtree(new_path, ignore_errors=True)
+        raise
+
+    print(f"  ✓ Placed via {format_placement(counts)}")
+    return counts
+
+
+# =============================================================================
+# Security Scanning
+# =============================================================================
+
+def find_scanner_script() -> Optional[Path]:
+    """Find scan_skill.py in the same directory as this script."""
+    script_dir = Path(__file__).parent
+    scanner = script_dir / "scan_skill.py"
+    if scanner.exists():
+        return scanner
+    return None
+
+
+_scanner_module = None
+
+
+def load_scanner_module(scanner: Path):
+    """
+    Import scan_skill.py from the given path so its helpers can be called
+    in-process. Returns None if the module cannot be loaded.
+    """
+    global _scanner_module
+    if _scanner_module is not None:
+        return _scanner_module
+    import importlib.util
+    try:
+        spec = importlib.util.spec_from_file_location("scan_skill", str(scanner))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        return None
+    _scanner_module = module
+    return module
+
+
+def scan_via_daemon(skill_dir: Path, scanner: Path, profile: str = "full") -> Optional[dict]:
+    """
+    Scan through a running `scan_skill.py --serve` daemon if one is available.
+    Returns the report, or None to signal the caller to run the scanner itself.
+    """
+    module = load_scanner_module(scanner)
+    if module is None or not hasattr(module, "scan_with_daemon"):
+        return None
+    try:
+        report = module.scan_with_daemon(path=skill_dir, timeout=30.0, profile=profile)
+    except (OSError, RuntimeError):
+        return None
+    return report
+
+
+_scan_pool = None
+_scan_pool_lock = threading.Lock()
+
+
+def configure_scan_pool(workers: int) -> None:
+    """
+    Send scans to a pool of worker processes (workers <= 0 scans in the
+    calling thread). Scanning is CPU-bound, so threads installing several
+    skills at once would otherwise take turns on one core.
+    """
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is not None:
+            _scan_pool.shutdown()
+        _scan_pool = None
+        if workers > 0:
+            _scan_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+
+def _scan_in_worker(skill_dir: str, scanner: str, profile: str) -> dict:
+    return get_scan_report(Path(skill_dir), Path(scanner), profile)
+
+
+def get_scan_report(skill_dir: Path, scanner: Path, profile: str = "full",
+                    python_trees: Optional[dict] = None) -> dict:
+    """
+    Scan a skill directory with the given profile and return the JSON report.
+
+    Prefers a running scanner daemon (warm rules and cache), then the scan
+    worker pool if one is configured, then scans in-process (reusing
+    python_trees from validation), and falls back to a one-shot subprocess.
+    Raises RuntimeError if the scan cannot complete.
+    """
+    report = scan_via_daemon(skill_dir, scanner, profile)
+    if report is not None:
+        return report
+
+    pool = _scan_pool
+    if pool is not None:
+        try:
+            return pool.submit(_scan_in_worker, str(skill_dir), str(scanner), profile).result()
+        except BrokenProcessPool as e:
+            raise RuntimeError(f"Security scan worker failed: {e}")
+
+    module = load_scanner_module(scanner)
+    if module is not None:
+        try:
+            return module.SkillScanner(
+                profile=profile, python_trees=python_trees
+            ).scan_path(skill_dir)
+        except Exception as e:
+            raise RuntimeError(f"Security scan failed: {type(e).__name__}: {e}")
+
+    try:
+        result = subprocess.run(
+            [sys.executable, str(scanner), "--profile", profile, str(skill_dir)],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Security scan timed out.")
+    except Exception as e:
+        raise RuntimeError(f"Security scan failed to run: {e}")
+
+    # Parse JSON output from scanner
+    try:
+        return json.loads(result.stdout)
+    except json.JSONDecodeError:
+        message = "Could not parse security scan results."
+        if result.stderr:
+            message += f"\n  Scanner stderr: {result.stderr.strip()}"
+        raise RuntimeError(message)
+
+
+class BackgroundScan:
+    """Runs get_scan_report() on a worker thread while the install continues."""
+
+    def __init__(self, skill_dir: Path, scanner: Path, profile: str = "full",
+                 python_trees: Optional[dict] = None):
+        self.report: Optional[dict] = None
+        self.error: Optional[str] = None
+        self._thread = threading.Thread(
+            target=self._run, args=(skill_dir, scanner, profile, python_trees), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, skill_dir: Path, scanner: Path, profile: str,
+             python_trees: Optional[dict]) -> None:
+        try:
+            self.report = get_scan_report(skill_dir, scanner, profile, python_trees)
+        except RuntimeError as e:
+            self.error = str(e)
+
+    def result(self) -> Optional[dict]:
+        """Wait for the scan and return its report (None if it failed)."""
+        self._thread.join()
+        return self.report
+
+
+SEVERITY_ORDER = ["critical", "warning", "info"]
+
+
+def print_findings(findings: list) -> None:
+    """Print findings grouped by severity."""
+    for severity in SEVERITY_ORDER:
+        severity_findings = [f for f in findings if f.get("severity") == severity]
+        if not severity_findings:
+            continue
+
+        print(f"\n  [{severity.upper()}]")
+        for finding in severity_findings:
+            file_name = finding.get("file", "unknown")
+            line = finding.get("line")
+            message = finding.get("description", "No description")
+            location = f"{file_name}:{line}" if line else file_name
+            if finding.get("count"):
+                # Aggregate finding standing in for suppressed repeats
+                location = f"{file_name}:{finding.get('first_line')}-{finding.get('last_line')}"
+            print(f"    - {location}: {message}")
+
+
+def format_scan_summary(summary: dict) -> str:
+    """Format severity counts as e.g. '1 critical, 2 warning'."""
+    parts = []
+    for severity in SEVERITY_ORDER:
+        count = summary.get(severity, 0)
+        if count > 0:
+            parts.append(f"{count} {severity}")
+    return ", ".join(parts) if parts else "clean"
+
+
+def run_security_scan(skill_dir: Path, force: bool = False, profile: str = "full",
+                      python_trees: Optional[dict] = None,
+                      interactive: bool = True) -> tuple[bool, Optional[dict]]:
+    """
+    Run security scan on a skill directory before installation.
+
+    Returns (proceed, report): proceed is True if installation should
+    continue; report is the scanner's JSON report (None if no scan ran).
+
+    Policy:
+    - If scanner exists: it MUST succeed. Failures block installation.
+    - If scanner does not exist: warn and allow (standalone usage).
+    - --skip-scan bypasses this entirely (checked by caller).
+    - --force bypasses user prompts for findings, NOT scanner failures.
+    - With interactive=False findings block as if stdin were not a TTY.
+    """
+    scanner = find_scanner_script()
+    if scanner is None:
+        print("  Warning: Security scanner (scan_skill.py) not found.")
+        print("  Install the full Universal Skills Manager for security scanning.")
+        return True, None  # Allow standalone usage
+
+    if profile == "full":
+        print("\nRunning security scan...")
+    else:
+        print(f"\nRunning security scan ({profile} profile)...")
+
+    try:
+        report = get_scan_report(skill_dir, scanner, profile, python_trees)
+    except RuntimeError as e:
+        print(f"  ERROR: {e}", file=sys.stderr)
+        print("  Installation blocked. Use --skip-scan to bypass.", file=sys.stderr)
+        return False, None
+
+    # Extract summary and findings
+    summary = report.get("summary", {})
+    findings = report.get("findings", [])
+    total = (summary.get("critical", 0)
+             + summary.get("warning", 0)
+             + summary.get("info", 0))
+
+    if total == 0:
+        print("  No security threats detected")
+        return True, report
+
+    print(f"\n  Security scan found {total} issue(s):")
+    print("  " + "-" * 48)
+    print_findings(findings)
+    print("  " + "-" * 48)
+
+    # Summary line with counts
+    print(f"  Summary: {format_scan_summary(summary)}")
+
+    return confirm_findings(force, interactive), report
+
+
+def confirm_findings(force: bool, interactive: bool) -> bool:
+    """Ask whether to install despite reported findings (--force skips asking)."""
+    if force:
+        print("\n  Note: --force specified, proceeding despite security findings")
+        return True
+
+    try:
+        if not interactive or not sys.stdin.isatty():
+            raise EOFError
+        response = input("\nProceed with installation? [y/N]: ")
+        return response.lower() == 'y'
+    except EOFError:
+        print("\n  Non-interactive mode: use --force to proceed despite security findings.")
+        return False
+
+
+# =============================================================================
+# Install Pipeline
+# =============================================================================
+
+class InstallError(RuntimeError):
+    """A skill could not be installed; exit_code is the CLI status for it."""
+
+    def __init__(self, message: str, exit_code: int = 1):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+def fetch_and_check(parsed: dict, temp_path: Path, args,
+                    interactive: bool = True) -> tuple[dict, Optional[dict], Optional[BackgroundScan]]:
+    """
+    Download a skill into temp_path, validate it, and run the gating scan.
+
+    Returns (inventory, scan_report, full_scan): the take_inventory() of
+    temp_path, the gating scan report (None if skipped) and the background
+    full scan, if one was started. Raises InstallError when the skill must
+    not be installed.
+    """
+    print("\nDownloading skill files...")
+    digests = {}
+    try:
+        downloaded = download_directory(
+            parsed['owner'], parsed['repo'], parsed['branch'], parsed['path'],
+            temp_path, args.token, args.verbose, max_depth=args.max_depth,
+            concurrency=args.concurrency, fetch_mode=args.fetch_mode,
+            max_file_bytes=args.max_file_size * 1024 * 1024,
+            max_skill_bytes=args.max_skill_size * 1024 * 1024,
+            digests=digests
+        )
+    except RuntimeError as e:
+        raise InstallError(f"\nError during download: {e}", 1)
+
+    if not downloaded:
+        raise InstallError("Error: No files downloaded", 1)
+
+    print(f"\nDownloaded {len(downloaded)} file(s)")
+
+    # Validate all files
+    print("\nValidating files...")
+    inventory = take_inventory(temp_path, keep_content=True, digests=digests)
+    python_trees = {}
+    valid, errors = validate_all_files(temp_path, args.verbose, python_trees, inventory)
+
+    if not valid:
+        lines = ["\nValidation failed:"]
+        lines.extend(f"  ✗ {error}" for error in errors)
+        lines.append("\nInstallation aborted. No files were written to destination.")
+        raise InstallError("\n".join(lines), 2)
+
+    print("  ✓ All files valid")
+
+    # Security scan (gate on the chosen profile; if that is not the full
+    # ruleset, start the full scan first so both run at the same time)
+    scan_report = None
+    full_scan = None
+    if not args.skip_scan:
+        scanner = find_scanner_script()
+        if scanner is not None and args.scan_profile != "full":
+            full_scan = BackgroundScan(temp_path, scanner, "full", python_trees)
+        should_proceed, scan_report = run_security_scan(
+            temp_path, args.force, args.scan_profile, python_trees, interactive
+        )
+        if not should_proceed:
+            raise InstallError("Installation aborted by user after security scan.", 0)
+    else:
+        print("\n  (Security scan skipped via --skip-scan)")
+
+    inventory["content"] = {}  # Validated; no longer needed
+    return inventory, scan_report, full_scan
+
+
+def gate_full_scan(full_scan: Optional[BackgroundScan], scan_report: Optional[dict],
+                   dest: Path, args, interactive: bool = True) -> Optional[dict]:
+    """
+    Wait for a deferred full scan before anything is swapped into place.
+
+    Critical findings the gating scan did not report are shown and need the
+    same confirmation (or --force) as the gating scan; a full scan that
+    fails blocks the install like a failed gating scan. Other findings are
+    only summarized, for --audit. Returns the report to record in the
+    manifest; raises InstallError when the install must not go ahead.
+    """
+    if full_scan is None:
+        return scan_report
+    full_report = full_scan.result()
+    if full_report is None:
+        raise InstallError(
+            f"\n  ERROR: Full security scan failed: {full_scan.error}\n"
+            f"  Installation blocked. Use --skip-scan to bypass.", 1
+        )
+
+    summary = full_report.get("summary", {})
+    seen = {
+        (f.get("file"), f.get("line"), f.get("category"))
+        for f in (scan_report or {}).get("findings", [])
+    }
+    critical = [
+        f for f in full_report.get("findings", [])
+        if f.get("severity") == "critical"
+        and (f.get("file"), f.get("line"), f.get("category")) not in seen
+    ]
+    if critical:
+        print(f"\n  Full security scan found {len(critical)} more critical issue(s):")
+        print("  " + "-" * 48)
+        print_findings(critical)
+        print("  " + "-" * 48)
+        if not confirm_findings(args.force, interactive):
+            raise InstallError("Installation aborted by user after security scan.", 0)
+
+    print(f"\nFull security scan: {format_scan_summary(summary)} "
+          f"(recorded in {MANIFEST_FILENAME})")
+    if summary.get("critical", 0) or summary.get("warning", 0):
+        print(f"  Review with: --audit {dest.parent / MANIFEST_FILENAME}")
+    return full_report
+
+
+def configure_network(args) -> None:
+    """Apply the transport and cache options shared by every install mode."""
+    get_transport().max_retries = max(0, args.retries)
+
+    if args.no_cache:
+        configure_http_cache(enabled=False)
+        configure_blob_store(enabled=False)
+        configure_digest_cache(enabled=False)
+    elif args.cache_dir:
+        configure_http_cache(Path(args.cache_dir).expanduser() / "http")
+        configure_blob_store(Path(args.cache_dir).expanduser() / "blobs")
+
+
+# =============================================================================
+# Bulk Restore
+# =============================================================================
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    Stand-in for sys.stdout/sys.stderr that gives each worker thread its own
+    buffer, so parallel installs don't interleave their progress output.
+    Threads that are not capturing write straight through.
+    """
+
+    def __init__(self, target):
+        self._target = target
+        self._local = threading.local()
+
+    def capture(self, buffer: Optional[io.StringIO] = None) -> io.StringIO:
+        """Send this thread's writes to buffer (a new one by default)."""
+        self._local.buffer = buffer if buffer is not None else io.StringIO()
+        return self._local.buffer
+
+    def release(self) -> None:
+        self._local.buffer = None
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._target).write(text)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+
+def reinstall_skill(result: dict, entry: dict, skills_dir: Path, args,
+                    expected_hash: Optional[str] = None) -> bool:
+    """
+    Download, validate, scan non-interactively and install one manifest
+    entry from its source_url, filling in result ("dest", "inventory",
+    "scan_report", or "error"). Never raises; returns True on success.
+
+    With expected_hash, a download whose files_hash differs is not
+    installed unless args.accept_drift; result["drifted"] is set either way.
+    """
+    try:
+        dest = skills_dir / sanitize_filename(result["name"])
+        result["dest"] = dest
+        parsed = parse_github_url(entry.get("source_url") or "")
+        if not parsed:
+            raise InstallError(f"Invalid source_url: {entry.get('source_url')!r}", 2)
+
+        with staging_directory(dest) as temp_dir:
+            temp_path = Path(temp_dir) / "skill"
+            temp_path.mkdir()
+            inventory, scan_report, full_scan = fetch_and_check(
+                parsed, temp_path, args, interactive=False
+            )
+            if expected_hash and inventory["files_hash"] != expected_hash:
+                result["drifted"] = True
+                if not args.accept_drift:
+                    raise InstallError(
+                        f"Source no longer matches the lock ({expected_hash[:19]}); "
+                        f"not installed (use --accept-drift to install it)", 1
+                    )
+            result["scan_report"] = gate_full_scan(full_scan, scan_report, dest, args,
+                                                   interactive=False)
+            install_skill(temp_path, dest, args.verbose, inventory["files"], args.read_only,
+                          link_source=True)
+            result["inventory"] = inventory
+        return True
+    except InstallError as e:
+        result["error"] = str(e).strip()
+        if e.exit_code == 0:
+            result["error"] = "Blocked by security scan findings (use --force to accept)"
+    except Exception as e:
+        result["error"] = str(e)
+    return False
+
+
+def restore_skill(name: str, entry: dict, skills_dir: Path, args) -> dict:
+    """
+    Bring one manifest entry back to its recorded state.
+
+    Skills whose directory already matches files_hash are left alone.
+    Others are rebuilt offline from the blob store where all their files
+    are still there, and otherwise reinstalled with reinstall_skill(). A
+    download that no longer matches files_hash is only installed with
+    --accept-drift. Never raises; the outcome is in result["status"]:
+    "up-to-date", "restored", "accepted" (the changed source was
+    installed), "drifted" (it was not) or "failed". result["offline"] is
+    True for restores that already match their manifest entry.
+    """
+    result = {"name": name, "status": "failed", "error": None, "scan_report": None,
+              "inventory": None, "source_url": entry.get("source_url"),
+              "offline": False, "drifted": False}
+    files_hash = entry.get("files_hash")
+    try:
+        dest = skills_dir / sanitize_filename(name)
+        result["dest"] = dest
+        if files_hash and dest.is_dir() and \
+                compute_directory_hash(dest, get_digest_cache(skills_dir)) == files_hash:
+            result["status"] = "up-to-date"
+            return result
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+    store = get_blob_store()
+    if store is not None and files_hash and entry.get("files") is not None:
+        try:
+            with staging_directory(dest) as temp_dir:
+                temp_path = Path(temp_dir) / "skill"
+                temp_path.mkdir()
+                try:
+                    inventory = stage_snapshot(store, entry["files"], files_hash, temp_path)
+                except RuntimeError:
+                    inventory = None  # Not all in the blob store: download it
+                if inventory is not None:
+                    install_skill(temp_path, dest, args.verbose, inventory["files"],
+                                  args.read_only, link_source=True)
+                    result.update(status="restored", inventory=inventory, offline=True)
+                    return result
+        except Exception as e:
+            result["error"] = str(e)
+            return result
+
+    if reinstall_skill(result, entry, skills_dir, args, expected_hash=files_hash):
+        result["status"] = "accepted" if result["drifted"] else "restored"
+    elif result["drifted"]:
+        result["status"] = "drifted"
+    return result
 
 
-def display_manifest(manifest_path: Path) -> None:
-    """Display installed skills from a manifest file."""
-    manifest = read_manifest(manifest_path)
-    skills = manifest.get("skills", {})
+def run_skill_jobs(job, jobs: list, concurrency: int):
+    """
+    Call job(*arguments) for every tuple in jobs on a thread pool, giving
+    each call its own buffered stdout/stderr. Yields (result, output) in
+    the order of jobs, as each one finishes.
+    """
+    output = _ThreadOutput(sys.stdout)
+    errors = _ThreadOutput(sys.stderr)
 
-    if not skills:
-        print("No skills tracked in manifest.")
-        return
+    def run(arguments: tuple):
+        log = errors.capture(output.capture())
+        try:
+            return job(*arguments), log.getvalue()
+        finally:
+            output.release()
+            errors.release()
 
-    print(f"\nInstalled skills ({len(skills)}):")
-    print("-" * 70)
-    print(f"  {'Name':<25} {'Version':<10} {'Files':<6} {'Description'}")
-    print("-" * 70)
+    saved = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = output, errors
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = [pool.submit(run, arguments) for arguments in jobs]
+            for future in futures:
+                yield future.result()
+    finally:
+        sys.stdout, sys.stderr = saved
 
-    for name, info in sorted(skills.items()):
-        version = info.get("version") or "unknown"
-        file_count = info.get("file_count", "?")
-        desc = info.get("description", "")
-        if len(desc) > 35:
-            desc = desc[:32] + "..."
-        print(f"  {name:<25} {version:<10} {file_count:<6} {desc}")
 
-    print("-" * 70)
-    print(f"  Total: {len(skills)} skill(s)")
-    print(f"  Manifest: {manifest_path}")
+def print_job_result(label: str, result: dict, log: str, verbose: bool) -> None:
+    """Print one line for a bulk job, plus its buffered output with verbose."""
+    line = f"  {label}: {result['name']}"
+    if result["error"]:
+        line += f" -- {result['error'].splitlines()[-1]}"
+    print(line)
+    if verbose and log.strip():
+        print("\n".join(f"      {l}" for l in log.strip().splitlines()))
 
 
-# =============================================================================
-# Installation
-# =============================================================================
+def record_reinstalled(manifest_path: Path, results: list, args) -> None:
+    """
+    Rewrite the manifest entries of skills reinstalled by a bulk job, in
+    one locked transaction and one write.
+    """
+    if not results:
+        return
+    try:
+        with manifest_transaction(manifest_path) as manifest:
+            for result in results:
+                try:
+                    update_manifest_entry(result["dest"], result["source_url"],
+                                          security_scan=result["scan_report"],
+                                          inventory=result["inventory"],
+                                          keep_snapshots=args.keep_snapshots,
+                                          manifest=manifest)
+                except Exception as e:
+                    print(f"  Warning: Could not update manifest for {result['name']}: {e}")
+    except OSError as e:
+        print(f"  Warning: Could not update manifest: {e}")
+        return
+    if args.verbose:
+        print(f"  Updated manifest: {manifest_path} ({len(results)} skill(s))")
 
-def _check_for_symlinks(directory: Path) -> None:
-    """Raise RuntimeError if directory contains any symlinks."""
-    for item in directory.rglob('*'):
-        if item.is_symlink():
-            raise RuntimeError(
-                f"Symlink detected in existing skill directory: {item}\n"
-                f"This is unexpected and may indicate tampering. "
-                f"Remove symlinks manually before updating."
-            )
 
+RESTORE_STATUS_LABELS = {
+    "up-to-date": "✓ up to date",
+    "restored": "✓ restored",
+    "accepted": "✓ restored (source changed since lock)",
+    "drifted": "✗ source changed since lock",
+    "failed": "✗ failed",
+}
 
-def install_skill(temp_dir: Path, dest: Path, verbose: bool = False) -> None:
+
+def restore_from_manifest(manifest_path: Path, args) -> int:
     """
-    Copy validated skill from temp to destination using atomic swap.
+    Restore every skill listed in a manifest, several at a time.
 
-    If destination exists:
-      1. Check for symlinks (safety)
-      2. Rename dest -> dest.bak
-      3. Copy temp -> dest
-      4. On success: remove dest.bak
-      5. On failure: remove partial dest, restore dest.bak
+    All workers share the HTTP transport, metadata cache and blob store.
+    Manifest entries of skills reinstalled from their source are rewritten
+    once all workers are done; the lock changes only for drift accepted
+    with --accept-drift. Returns the process exit code: 0 if every skill
+    is in place as locked (or as accepted).
     """
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    backup_path = dest.with_name(dest.name + ".bak")
+    if not manifest_exists(manifest_path):
+        print(f"Error: Manifest not found: {manifest_path}", file=sys.stderr)
+        return 2
 
-    if dest.exists():
-        # Safety: check for symlinks in existing directory
-        _check_for_symlinks(dest)
+    skills = read_manifest(manifest_path).get("skills", {})
+    if not skills:
+        print(f"No skills recorded in {manifest_path}")
+        return 0
+
+    skills_dir = manifest_path.parent
+    print(f"Restoring {len(skills)} skill(s) from {manifest_path}\n")
+
+    results = []
+    cache = get_digest_cache(skills_dir)
+    jobs = [(name, entry, skills_dir, args) for name, entry in sorted(skills.items())]
+    with cache.batch() if cache else nullcontext():
+        for result, log in run_skill_jobs(restore_skill, jobs, args.concurrency):
+            results.append(result)
+            print_job_result(RESTORE_STATUS_LABELS[result["status"]], result, log, args.verbose)
+
+    record_reinstalled(
+        manifest_path,
+        [result for result in results
+         if result["status"] in ("restored", "accepted") and not result["offline"]], args
+    )
 
-        # Remove any stale backup from a previous failed install
-        if backup_path.exists():
-            shutil.rmtree(backup_path)
+    counts = {status: 0 for status in RESTORE_STATUS_LABELS}
+    for result in results:
+        counts[result["status"]] += 1
+    print(f"\nRestore summary: {counts['restored'] + counts['accepted']} restored "
+          f"({counts['accepted']} changed at source), {counts['up-to-date']} up to date, "
+          f"{counts['drifted']} changed at source and not restored, {counts['failed']} failed")
+    return 1 if counts["failed"] or counts["drifted"] else 0
 
-        # Step 1: Move existing to backup
-        if verbose:
-            print(f"  Backing up existing: {dest.name} -> {dest.name}.bak")
-        os.rename(str(dest), str(backup_path))
 
-        try:
-            # Step 2: Copy new content
-            shutil.copytree(str(temp_dir), str(dest))
+# =============================================================================
+# Verify
+# =============================================================================
 
-            # Step 3: Success - remove backup
-            shutil.rmtree(backup_path)
-            if verbose:
-                print(f"  Removed backup: {backup_path.name}")
-        except Exception:
-            # Step 4: Failure - restore backup
-            if dest.exists():
-                shutil.rmtree(dest)
-            os.rename(str(backup_path), str(dest))
-            raise  # Re-raise so caller sees the error
-    else:
-        # Fresh install, no backup needed
-        shutil.copytree(str(temp_dir), str(dest))
+def verify_skill(dest: Path, entry: dict, cache: Optional[DigestCache] = None) -> dict:
+    """
+    Check an installed skill against its manifest entry.
+
+    Files whose stat data matches the digest cache are not read; only the
+    rest are hashed. Returns {"status", "added", "removed", "modified"}
+    where status is "intact", "changed", "missing" or, for entries without
+    per-file digests (installed by older versions), "changed-unknown" when
+    the files_hash differs.
+    """
+    result = {"status": "intact", "added": [], "removed": [], "modified": []}
+    if not dest.is_dir():
+        result["status"] = "missing"
+        return result
+
+    recorded = entry.get("files")
+    if recorded is None:
+        if compute_directory_hash(dest, cache) != entry.get("files_hash"):
+            result["status"] = "changed-unknown"
+        return result
+
+    inventory = take_inventory(dest, cache=cache, with_files_hash=False)
+    current = {rel_path: digests["git_sha"] for rel_path, digests in inventory["files"].items()}
+    if merkle_root(current, entry.get("modes")) == entry.get("merkle_root"):
+        return result
+    result["added"] = sorted(set(current) - set(recorded))
+    result["removed"] = sorted(set(recorded) - set(current))
+    result["modified"] = sorted(
+        rel_path for rel_path in set(current) & set(recorded)
+        if current[rel_path] != recorded[rel_path]
+    )
+    if result["added"] or result["removed"] or result["modified"]:
+        result["status"] = "changed"
+    return result
+
+
+def verify_manifest(manifest_path: Path, args) -> int:
+    """
+    Verify every skill in a manifest and report changed files.
+    Returns the process exit code: 0 if every skill is intact.
+    """
+    if not manifest_exists(manifest_path):
+        print(f"Error: Manifest not found: {manifest_path}", file=sys.stderr)
+        return 2
+
+    skills = read_manifest(manifest_path).get("skills", {})
+    skills_dir = manifest_path.parent
+    cache = get_digest_cache(skills_dir)
+    started = time.monotonic()
+    counts = {"intact": 0, "changed": 0, "missing": 0}
+
+    with cache.batch() if cache else nullcontext():
+        for name, entry in sorted(skills.items()):
+            try:
+                dest = skills_dir / sanitize_filename(name)
+            except RuntimeError as e:
+                print(f"  ✗ {name}: {e}")
+                counts["changed"] += 1
+                continue
+            result = verify_skill(dest, entry, cache)
+            status = result["status"]
+            if status == "intact":
+                if args.verbose:
+                    print(f"  ✓ {name}")
+            elif status == "missing":
+                print(f"  ✗ {name}: missing ({dest})")
+            elif status == "changed-unknown":
+                print(f"  ✗ {name}: files_hash differs "
+                      f"(no per-file record; reinstall to get file-level reports)")
+            else:
+                print(f"  ✗ {name}: {len(result['modified'])} modified, "
+                      f"{len(result['added'])} added, {len(result['removed'])} removed")
+                for label, key in (("M", "modified"), ("A", "added"), ("D", "removed")):
+                    for rel_path in result[key]:
+                        print(f"      {label} {rel_path}")
+            counts["changed" if status == "changed-unknown" else status] += 1
+
+    elapsed = time.monotonic() - started
+    print(f"\nVerify summary: {counts['intact']} intact, {counts['changed']} changed, "
+          f"{counts['missing']} missing ({len(skills)} skill(s) in {elapsed:.2f}s)")
+    return 0 if counts["changed"] == counts["missing"] == 0 else 1
 
 
 # =============================================================================
-# Security Scanning
+# Update Check
 # =============================================================================
 
-def find_scanner_script() -> Optional[Path]:
-    """Find scan_skill.py in the same directory as this script."""
-    script_dir = Path(__file__).parent
-    scanner = script_dir / "scan_skill.py"
-    if scanner.exists():
-        return scanner
-    return None
+def check_skill_updates(name: str, entry: dict, skills_dir: Path, args) -> dict:
+    """
+    Compare one manifest entry with its source without downloading anything.
+
+    One Contents API call reads the source directory's tree SHA; when it
+    equals the recorded merkle_root the skill is up to date. Otherwise one
+    Git Trees API call lists the remote blob SHAs, which are compared with
+    the per-file git SHAs in the manifest (or, for entries without them,
+    with the installed files). Never raises; result["status"] is
+    "up-to-date", "outdated" or "failed".
+    """
+    result = {"name": name, "status": "failed", "error": None,
+              "added": [], "removed": [], "modified": []}
+    try:
+        parsed = parse_github_url(entry.get("source_url") or "")
+        if not parsed:
+            raise RuntimeError(f"Invalid source_url: {entry.get('source_url')!r}")
+        owner, repo, branch, path = (
+            parsed["owner"], parsed["repo"], parsed["branch"], parsed["path"]
+        )
+
+        local = entry.get("files")
+        if local is None:
+            dest = skills_dir / sanitize_filename(name)
+            if not dest.is_dir():
+                raise RuntimeError("no per-file record and not installed; reinstall it")
+            inventory = take_inventory(dest, cache=get_digest_cache(skills_dir),
+                                       with_files_hash=False)
+            local = {rel_path: digests["git_sha"]
+                     for rel_path, digests in inventory["files"].items()}
+
+        tree_sha = resolve_tree_sha(owner, repo, branch, path, args.token, args.verbose)
+        if tree_sha == (entry.get("merkle_root") or merkle_root(local)):
+            result["status"] = "up-to-date"
+            return result
+
+        remote = {
+            item["path"]: item["sha"]
+            for item in list_remote_files(
+                owner, repo, branch, path, args.token, args.verbose,
+                max_depth=args.max_depth, concurrency=args.concurrency,
+                tree_sha=tree_sha
+            )
+        }
+        result["added"] = sorted(set(remote) - set(local))
+        result["removed"] = sorted(set(local) - set(remote))
+        result["modified"] = sorted(
+            rel_path for rel_path in set(remote) & set(local)
+            if remote[rel_path] != local[rel_path]
+        )
+        changed = result["added"] or result["removed"] or result["modified"]
+        result["status"] = "outdated" if changed else "up-to-date"
+    except Exception as e:
+        result["error"] = str(e)
+    return result
 
 
-def run_security_scan(skill_dir: Path, force: bool = False) -> bool:
+def check_updates(manifest_path: Path, args) -> int:
     """
-    Run security scan on a skill directory before installation.
+    Check every skill in a manifest for changes at its source, several at a time.
+    Returns the process exit code: 0 if every skill is up to date.
+    """
+    if not manifest_exists(manifest_path):
+        print(f"Error: Manifest not found: {manifest_path}", file=sys.stderr)
+        return 2
+
+    skills = read_manifest(manifest_path).get("skills", {})
+    skills_dir = manifest_path.parent
+    print(f"Checking {len(skills)} skill(s) in {manifest_path} for updates\n")
+
+    cache = get_digest_cache(skills_dir)
+    counts = {"up-to-date": 0, "outdated": 0, "failed": 0}
+    with cache.batch() if cache else nullcontext(), \
+            ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = [
+            pool.submit(check_skill_updates, name, entry, skills_dir, args)
+            for name, entry in sorted(skills.items())
+        ]
+        for future in futures:
+            result = future.result()
+            status = result["status"]
+            counts[status] += 1
+            if status == "up-to-date":
+                print(f"  ✓ {result['name']}: up to date")
+            elif status == "failed":
+                print(f"  ✗ {result['name']}: check failed -- {result['error']}")
+            else:
+                print(f"  ↑ {result['name']}: {len(result['modified'])} modified, "
+                      f"{len(result['added'])} added, {len(result['removed'])} removed")
+                for label, key in (("M", "modified"), ("A", "added"), ("D", "removed")):
+                    for rel_path in result[key]:
+                        print(f"      {label} {rel_path}")
 
-    Returns True if installation should proceed, False to abort.
+    print(f"\nUpdate summary: {counts['outdated']} with updates, "
+          f"{counts['up-to-date']} up to date, {counts['failed']} failed")
+    return 0 if counts["outdated"] == counts["failed"] == 0 else 1
 
-    Policy:
-    - If scanner exists: it MUST succeed. Failures block installation.
-    - If scanner does not exist: warn and allow (standalone usage).
-    - --skip-scan bypasses this entirely (checked by caller).
-    - --force bypasses user prompts for findings, NOT scanner failures.
-    """
-    scanner = find_scanner_script()
-    if scanner is None:
-        print("  Warning: Security scanner (scan_skill.py) not found.")
-        print("  Install the full Universal Skills Manager for security scanning.")
-        return True  # Allow standalone usage
 
-    print("\nRunning security scan...")
+# =============================================================================
+# Update All
+# =============================================================================
+
+def update_skill(name: str, entry: dict, skills_dir: Path, args) -> dict:
+    """
+    Check one manifest entry against its source and reinstall it if the
+    source changed or the skill is missing. Never raises; result["status"]
+    is "up-to-date", "updated", "installed" (was missing) or "failed".
+    """
+    check = check_skill_updates(name, entry, skills_dir, args)
+    result = {"name": name, "status": "failed", "error": check["error"],
+              "scan_report": None, "inventory": None, "source_url": entry.get("source_url"),
+              "modified": check["modified"], "added": check["added"],
+              "removed": check["removed"]}
+    if check["status"] == "failed":
+        return result
 
     try:
-        result = subprocess.run(
-            [sys.executable, str(scanner), str(skill_dir)],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-    except subprocess.TimeoutExpired:
-        print("  ERROR: Security scan timed out.", file=sys.stderr)
-        print("  Installation blocked. Use --skip-scan to bypass.", file=sys.stderr)
-        return False
-    except Exception as e:
-        print(f"  ERROR: Security scan failed to run: {e}", file=sys.stderr)
-        print("  Installation blocked. Use --skip-scan to bypass.", file=sys.stderr)
-        return False
+        missing = not (skills_dir / sanitize_filename(name)).is_dir()
+    except RuntimeError as e:
+        result["error"] = str(e)
+        return result
+    if check["status"] == "up-to-date" and not missing:
+        result["status"] = "up-to-date"
+        return result
+
+    if reinstall_skill(result, entry, skills_dir, args):
+        result["status"] = "installed" if missing else "updated"
+    return result
 
-    # Parse JSON output from scanner
+
+UPDATE_STATUS_LABELS = {
+    "up-to-date": "✓ up to date",
+    "updated": "↑ updated",
+    "installed": "✓ installed (was missing)",
+    "failed": "✗ failed",
+}
+
+
+def update_all(skills_dir: Path, args) -> int:
+    """
+    Update every skill in a skills root to the current version of its source.
+
+    Skills are checked and reinstalled --concurrency at a time, with no more
+    than --concurrency GitHub requests in flight in total and security
+    scans on a pool of --scan-workers processes. Skills whose source has not
+    changed cost one API call. Returns the process exit code: 0 if no skill
+    failed.
+    """
+    manifest_path = skills_dir / MANIFEST_FILENAME
+    if not manifest_exists(manifest_path):
+        print(f"Error: Manifest not found: {manifest_path}", file=sys.stderr)
+        return 2
+
+    skills = read_manifest(manifest_path).get("skills", {})
+    print(f"Updating {len(skills)} skill(s) in {skills_dir}\n")
+
+    started = time.monotonic()
+    get_transport().scheduler.max_in_flight = max(1, args.concurrency)
+    configure_scan_pool(0 if args.skip_scan else args.scan_workers)
+    results = []
+    cache = get_digest_cache(skills_dir)
+    jobs = [(name, entry, skills_dir, args) for name, entry in sorted(skills.items())]
     try:
-        report = json.loads(result.stdout)
-    except json.JSONDecodeError:
-        print("  ERROR: Could not parse security scan results.", file=sys.stderr)
-        if result.stderr:
-            print(f"  Scanner stderr: {result.stderr.strip()}", file=sys.stderr)
-        print("  Installation blocked. Use --skip-scan to bypass.", file=sys.stderr)
-        return False
+        with cache.batch() if cache else nullcontext():
+            for result, log in run_skill_jobs(update_skill, jobs, args.concurrency):
+                results.append(result)
+                print_job_result(UPDATE_STATUS_LABELS[result["status"]], result, log,
+                                 args.verbose)
+                if result["status"] == "updated" and args.verbose:
+                    for label, key in (("M", "modified"), ("A", "added"), ("D", "removed")):
+                        for rel_path in result[key]:
+                            print(f"      {label} {rel_path}")
+    finally:
+        configure_scan_pool(0)
+        get_transport().scheduler.max_in_flight = None
+
+    record_reinstalled(
+        manifest_path,
+        [result for result in results if result["status"] in ("updated", "installed")], args
+    )
 
-    # Extract summary and findings
-    summary = report.get("summary", {})
-    findings = report.get("findings", [])
-    total = (summary.get("critical", 0)
-             + summary.get("warning", 0)
-             + summary.get("info", 0))
+    counts = {status: 0 for status in UPDATE_STATUS_LABELS}
+    for result in results:
+        counts[result["status"]] += 1
+    elapsed = time.monotonic() - started
+    print(f"\nUpdate summary: {counts['updated']} updated, {counts['installed']} reinstalled, "
+          f"{counts['up-to-date']} up to date, {counts['failed']} failed "
+          f"({len(skills)} skill(s) in {elapsed:.1f}s)")
+    return 1 if counts["failed"] else 0
 
-    if total == 0:
-        print("  No security threats detected")
-        return True
 
-    # Display findings grouped by severity
-    severity_order = ["critical", "warning", "info"]
+# =============================================================================
+# Rollback
+# =============================================================================
 
-    print(f"\n  Security scan found {total} issue(s):")
-    print("  " + "-" * 48)
+def snapshot_file_map(store: BlobStore, entry: dict, snapshot: dict) -> Optional[dict]:
+    """
+    Return a snapshot's file map: the entry's "files" for the version it
+    records, or else the map kept in the snapshot's blob store record.
+    """
+    if snapshot.get("files_hash") == entry.get("files_hash") and entry.get("files") is not None:
+        return entry["files"]
+    return store.load_snapshot(snapshot.get("files_hash", "")).get("files")
 
-    for severity in severity_order:
-        severity_findings = [f for f in findings if f.get("severity") == severity]
-        if not severity_findings:
-            continue
 
-        print(f"\n  [{severity.upper()}]")
-        for finding in severity_findings:
-            file_name = finding.get("file", "unknown")
-            line = finding.get("line")
-            message = finding.get("description", "No description")
-            location = f"{file_name}:{line}" if line else file_name
-            print(f"    - {location}: {message}")
+def stage_snapshot(store: BlobStore, files: dict, files_hash: str, temp_path: Path) -> dict:
+    """
+    Rebuild a snapshot's files in temp_path from the blob store and return
+    its take_inventory(). Raises RuntimeError if a file is no longer stored
+    or the result does not match files_hash.
+    """
+    for rel_path, sha in files.items():
+        file_path = temp_path.joinpath(*rel_path.split("/"))
+        verify_path_containment(file_path, temp_path)
+        if store.restore(sha, file_path) is None:
+            raise RuntimeError(f"{rel_path} ({sha[:12]}) is no longer in the blob store")
+    inventory = take_inventory(temp_path)
+    if inventory["files_hash"] != files_hash:
+        raise RuntimeError("Snapshot does not match its recorded files_hash")
+    return inventory
+
+
+def find_snapshot(entry: dict, current_hash: Optional[str],
+                  target: Optional[str] = None) -> Optional[dict]:
+    """
+    Pick the snapshot to roll back to: the one whose files_hash starts with
+    target (with or without the "sha256:" prefix), or else the newest one
+    that differs from the installed files.
+    """
+    snapshots = entry.get("snapshots") or []
+    if target:
+        if not target.startswith("sha256:"):
+            target = f"sha256:{target}"
+        matches = [snap for snap in snapshots if snap.get("files_hash", "").startswith(target)]
+        return matches[0] if len(matches) == 1 else None
+    return next((snap for snap in snapshots if snap.get("files_hash") != current_hash), None)
 
-    print("  " + "-" * 48)
 
-    # Summary line with counts
-    parts = []
-    for severity in severity_order:
-        count = summary.get(severity, 0)
-        if count > 0:
-            parts.append(f"{count} {severity}")
-    print(f"  Summary: {', '.join(parts)}")
+def rollback_skill(dest: Path, args) -> int:
+    """
+    Reinstate a snapshot of an installed skill from the blob store, offline,
+    with the same atomic swap as an install. Returns an exit code.
+    """
+    manifest_path = dest.parent / MANIFEST_FILENAME
+    entry = read_manifest_entry(manifest_path, dest.name)
+    if not entry:
+        print(f"Error: {dest.name} is not tracked in {manifest_path}", file=sys.stderr)
+        return 1
+
+    current = None
+    current_hash = None
+    if dest.is_dir():
+        current = take_inventory(dest, cache=get_digest_cache(dest.parent))
+        current_hash = current["files_hash"]
+    snapshot = find_snapshot(entry, current_hash, args.to)
+    if snapshot is None:
+        print(f"Error: No snapshot of {dest.name} to roll back to", file=sys.stderr)
+        for snap in entry.get("snapshots") or []:
+            installed = " (installed)" if snap.get("files_hash") == current_hash else ""
+            print(f"  {snap['files_hash'][:19]}  {snap.get('version') or 'unknown':<10} "
+                  f"{snap.get('created_at', '')}{installed}", file=sys.stderr)
+        return 1
+
+    store = get_blob_store()
+    if store is None:
+        print("Error: Rollback needs the blob store (drop --no-cache)", file=sys.stderr)
+        return 1
+    files = snapshot_file_map(store, entry, snapshot)
+    if files is None:
+        print(f"Error: The file map of {snapshot['files_hash'][:19]} is no longer "
+              f"in the blob store", file=sys.stderr)
+        return 1
+
+    print(f"Rolling back {dest.name} to {snapshot['files_hash'][:19]} "
+          f"(version {snapshot.get('version') or 'unknown'}, from {snapshot.get('created_at')})")
+    with staging_directory(dest) as temp_dir:
+        temp_path = Path(temp_dir) / "skill"
+        temp_path.mkdir()
+        try:
+            inventory = stage_snapshot(store, files, snapshot["files_hash"], temp_path)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        modes = store.load_snapshot(snapshot["files_hash"]).get("modes")
+        if modes:
+            inventory["modes"] = modes
 
-    if force:
-        print("\n  Note: --force specified, proceeding despite security findings")
-        return True
+        try:
+            install_skill(temp_path, dest, args.verbose, inventory["files"], args.read_only,
+                          link_source=True, existing=current)
+        except Exception as e:
+            print(f"\nError during rollback: {e}", file=sys.stderr)
+            return 3
 
     try:
-        if not sys.stdin.isatty():
-            raise EOFError
-        response = input("\nProceed with installation? [y/N]: ")
-        return response.lower() == 'y'
-    except EOFError:
-        print("\n  Non-interactive mode: use --force to proceed despite security findings.")
-        return False
+        update_manifest_entry(dest, snapshot.get("source_url", entry.get("source_url")),
+                              args.verbose, inventory=inventory,
+                              keep_snapshots=max(args.keep_snapshots, 1))
+    except Exception as e:
+        print(f"  Warning: Could not update manifest: {e}")
+
+    print(f"\n✓ Rolled back {dest.name} to {snapshot['files_hash'][:19]}")
+    return 0
 
 
 # =============================================================================
@@ -891,6 +4243,7 @@ def main():
 Examples:
   %(prog)s --url "https://github.com/user/repo/tree/main/skills/my-skill" --dest "~/.claude/skills/my-skill"
   %(prog)s --url "https://github.com/user/repo/tree/main/skills/my-skill" --dest "/tmp/test" --dry-run
+  %(prog)s --url "https://github.com/user/repo/tree/main/skills/my-skill" --dest "~/.claude/skills/my-skill" "~/.codex/skills/my-skill"
         """
     )
     
@@ -899,8 +4252,9 @@ Examples:
         help='GitHub URL to skill folder (tree URL format)'
     )
     parser.add_argument(
-        '--dest', required=False,
-        help='Local destination path for skill installation'
+        '--dest', required=False, action='extend', nargs='+',
+        help='Local destination path for skill installation; repeat (or list '
+             'several) to download, validate and scan once and install into each'
     )
     parser.add_argument(
         '--token',
@@ -922,10 +4276,57 @@ Examples:
         '--max-depth', type=int, default=5,
         help='Maximum directory depth to recurse (default: 5)'
     )
+    parser.add_argument(
+        '--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+        help=f'Parallel directory listings and downloads (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--retries', type=int, default=DEFAULT_MAX_RETRIES,
+        help=f'Retries for network errors, 5xx responses and short rate-limit '
+             f'waits (default: {DEFAULT_MAX_RETRIES})'
+    )
+    parser.add_argument(
+        '--fetch-mode', choices=FETCH_MODES, default='auto',
+        help=f'Download files individually or from one repository tarball; '
+             f'auto uses the tarball for {ARCHIVE_THRESHOLD}+ files (default: auto)'
+    )
+    parser.add_argument(
+        '--max-file-size', type=int, default=DEFAULT_MAX_FILE_BYTES // (1024 * 1024),
+        metavar='MB',
+        help=f'Abort if any file is larger than this (default: '
+             f'{DEFAULT_MAX_FILE_BYTES // (1024 * 1024)} MB)'
+    )
+    parser.add_argument(
+        '--max-skill-size', type=int, default=DEFAULT_MAX_SKILL_BYTES // (1024 * 1024),
+        metavar='MB',
+        help=f'Abort if the skill is larger than this in total (default: '
+             f'{DEFAULT_MAX_SKILL_BYTES // (1024 * 1024)} MB)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory for cached GitHub API metadata and downloaded files '
+             '(default: $SKILL_INSTALLER_CACHE or ~/.cache/universal-skills-manager)'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Do not read or write the metadata cache, blob store or digest cache'
+    )
+    parser.add_argument(
+        '--read-only', action='store_true',
+        help='Install skill files read-only, hardlinked from the blob store '
+             'when it is on the same filesystem'
+    )
     parser.add_argument(
         '--skip-scan', action='store_true',
         help='Skip security scan (not recommended)'
     )
+    parser.add_argument(
+        '--scan-profile', choices=['quick', 'full'], default='quick',
+        help='Scan profile that gates installation (default: quick). With quick, '
+             'the full ruleset runs in the background; new critical findings '
+             'from it must be confirmed before the skill is swapped in, and '
+             'its results are recorded in skills.lock.json'
+    )
     parser.add_argument(
         '--version', action='store_true',
         help='Show version information and exit'
@@ -934,6 +4335,64 @@ Examples:
         '--manifest',
         help='Show installed skills from manifest (e.g., ~/.claude/skills/skills.lock.json)'
     )
+    parser.add_argument(
+        '--audit', metavar='MANIFEST',
+        help='Show security scan results recorded in a manifest without rescanning'
+    )
+    parser.add_argument(
+        '--restore', metavar='MANIFEST',
+        help='Reinstall every skill in a manifest whose files no longer match '
+             'its recorded hash (runs --concurrency skills at a time)'
+    )
+    parser.add_argument(
+        '--accept-drift', action='store_true',
+        help='With --restore, install skills whose source no longer matches the '
+             'manifest and record the new version (default: skip them and exit 1)'
+    )
+    parser.add_argument(
+        '--verify', metavar='MANIFEST',
+        help='Check every skill in a manifest against its recorded file '
+             'digests and list modified, added and removed files'
+    )
+    parser.add_argument(
+        '--check-updates', metavar='MANIFEST',
+        help='List skills in a manifest whose source has changed, and which '
+             'files differ, without downloading them'
+    )
+    parser.add_argument(
+        '--update-all', metavar='SKILLS_ROOT',
+        help='Update every skill recorded in SKILLS_ROOT/skills.lock.json whose '
+             'source has changed, non-interactively (--concurrency skills and '
+             'requests at a time)'
+    )
+    parser.add_argument(
+        '--scan-workers', type=int, default=os.cpu_count() or 1, metavar='N',
+        help='With --update-all: processes for security scans '
+             '(default: number of CPUs, 0 scans in the install threads)'
+    )
+    parser.add_argument(
+        '--manifest-db', action='store_true',
+        help=f'Keep the skills root manifest in {MANIFEST_DB_FILENAME} (SQLite) '
+             f'instead of rewriting {MANIFEST_FILENAME} on every change; '
+             f'later runs use it automatically'
+    )
+    parser.add_argument(
+        '--export-manifest', metavar='SKILLS_ROOT',
+        help=f'Write the {MANIFEST_DB_FILENAME} of SKILLS_ROOT out as {MANIFEST_FILENAME}'
+    )
+    parser.add_argument(
+        '--rollback', metavar='SKILL_DIR',
+        help='Restore an installed skill to its previous snapshot, offline'
+    )
+    parser.add_argument(
+        '--to', metavar='FILES_HASH',
+        help='With --rollback: the snapshot to restore, by (a prefix of) its files_hash'
+    )
+    parser.add_argument(
+        '--keep-snapshots', type=int, default=DEFAULT_KEEP_SNAPSHOTS, metavar='N',
+        help=f'Versions of each skill to keep for --rollback '
+             f'(default: {DEFAULT_KEEP_SNAPSHOTS}, 0 disables)'
+    )
     
     args = parser.parse_args()
 
@@ -942,18 +4401,65 @@ Examples:
         print(f"Universal Skill Installer v{VERSION}")
         sys.exit(0)
 
+    if args.manifest_db and sqlite3 is None:
+        parser.error("--manifest-db needs Python's sqlite3 module")
+    configure_manifest_db(create=args.manifest_db)
+    try:
+        _run_command(args, parser)
+    finally:
+        export_changed_manifests()
+
+
+def _run_command(args, parser) -> None:
+    """Run the mode args selects. Exits through sys.exit()."""
+
+    # Write a manifest database out as JSON
+    if args.export_manifest:
+        sys.exit(export_manifest(Path(args.export_manifest).expanduser().resolve()))
+
     # Show manifest
     if args.manifest:
         manifest_path = Path(args.manifest).expanduser().resolve()
         display_manifest(manifest_path)
         sys.exit(0)
 
+    # Show recorded security scans
+    if args.audit:
+        display_audit(Path(args.audit).expanduser().resolve())
+        sys.exit(0)
+
+    configure_network(args)
+
+    # Restore all skills from a manifest
+    if args.restore:
+        sys.exit(restore_from_manifest(Path(args.restore).expanduser().resolve(), args))
+
+    # Verify installed skills against the manifest
+    if args.verify:
+        sys.exit(verify_manifest(Path(args.verify).expanduser().resolve(), args))
+
+    # Compare installed skills with their sources
+    if args.check_updates:
+        sys.exit(check_updates(Path(args.check_updates).expanduser().resolve(), args))
+
+    # Update every skill in a root
+    if args.update_all:
+        sys.exit(update_all(Path(args.update_all).expanduser().resolve(), args))
+
+    # Roll a skill back to a snapshot
+    if args.rollback:
+        sys.exit(rollback_skill(Path(args.rollback).expanduser().resolve(), args))
+
     # Validate required arguments
     if not args.url or not args.dest:
         parser.error("the following arguments are required: --url, --dest")
     
-    # Expand ~ in destination path
-    dest = Path(args.dest).expanduser().resolve()
+    # Expand ~ in destination paths, dropping duplicates
+    dests = []
+    for raw_dest in args.dest:
+        dest = Path(raw_dest).expanduser().resolve()
+        if dest not in dests:
+            dests.append(dest)
     
     # Parse GitHub URL
     print(f"Parsing URL: {args.url}")
@@ -966,99 +4472,97 @@ Examples:
     print(f"Repository: {parsed['owner']}/{parsed['repo']}")
     print(f"Branch: {parsed['branch']}")
     print(f"Path: {parsed['path']}")
-    print(f"Destination: {dest}")
+    for dest in dests:
+        print(f"Destination: {dest}")
     
     # Safety check: Prevent accidental targeting of root skills directory
-    check_root_skills_directory_safety(dest, args.force)
+    for dest in dests:
+        check_root_skills_directory_safety(dest, args.force)
     
     # Dry run mode
     if args.dry_run:
         print("\n[DRY RUN] Would download:")
         try:
-            contents = list_directory_contents(
+            entries = list_remote_files(
                 parsed['owner'], parsed['repo'], parsed['branch'], parsed['path'],
-                args.token, args.verbose
+                args.token, args.verbose, max_depth=args.max_depth,
+                concurrency=args.concurrency
             )
-            for item in contents:
-                item_type = "📁" if item["type"] == "dir" else "📄"
-                print(f"  {item_type} {item['name']}")
-            print("\n[DRY RUN] No files were downloaded")
+            for entry in entries:
+                print(f"  📄 {entry['path']}")
+            if len(dests) > 1:
+                print(f"\n[DRY RUN] Would install into {len(dests)} destinations")
+            print(f"\n[DRY RUN] {len(entries)} file(s), no files were downloaded")
         except RuntimeError as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
         sys.exit(0)
     
-    # Create temp directory for atomic install
-    with tempfile.TemporaryDirectory(prefix="skill_install_") as temp_dir:
+    # Stage next to the first destination, on its filesystem, for atomic install
+    with staging_directory(dests[0]) as temp_dir:
         temp_path = Path(temp_dir) / "skill"
         temp_path.mkdir()
         
-        # Step 1: Download all files to temp
-        print("\nDownloading skill files...")
+        # Steps 1-2.5: Download, validate and scan in temp
         try:
-            downloaded = download_directory(
-                parsed['owner'], parsed['repo'], parsed['branch'], parsed['path'],
-                temp_path, args.token, args.verbose, max_depth=args.max_depth
-            )
-        except RuntimeError as e:
-            print(f"\nError during download: {e}", file=sys.stderr)
-            sys.exit(1)
-        
-        if not downloaded:
-            print("Error: No files downloaded", file=sys.stderr)
-            sys.exit(1)
-        
-        print(f"\nDownloaded {len(downloaded)} file(s)")
-        
-        # Step 2: Validate all files
-        print("\nValidating files...")
-        valid, errors = validate_all_files(temp_path, args.verbose)
-        
-        if not valid:
-            print("\nValidation failed:", file=sys.stderr)
-            for error in errors:
-                print(f"  ✗ {error}", file=sys.stderr)
-            print("\nInstallation aborted. No files were written to destination.", file=sys.stderr)
-            sys.exit(2)
-        
-        print("  ✓ All files valid")
-
-        # Step 2.5: Security scan
-        if not args.skip_scan:
-            should_proceed = run_security_scan(temp_path, args.force)
-            if not should_proceed:
-                print("Installation aborted by user after security scan.")
-                sys.exit(0)
-        else:
-            print("\n  (Security scan skipped via --skip-scan)")
-
-        # Step 3: Compare if destination already exists
-        if dest.exists():
-            diff = compare_skill_directories(temp_path, dest)
-            should_install = display_skill_diff(diff, dest, args.force)
-            if not should_install:
-                if diff["identical"]:
-                    sys.exit(0)  # Already up to date
-                else:
-                    print("Aborted.")
-                    sys.exit(0)
-        
-        # Step 4: Install (copy from temp to destination)
-        print(f"\nInstalling to: {dest}")
+            inventory, scan_report, full_scan = fetch_and_check(parsed, temp_path, args)
+        except InstallError as e:
+            print(e, file=sys.stderr if e.exit_code else sys.stdout)
+            sys.exit(e.exit_code)
+
+        # Step 3: Compare each destination that already exists
+        targets = []
+        existing = {}
+        for dest in dests:
+            if dest.exists():
+                existing[dest] = take_inventory(
+                    dest, cache=get_digest_cache(dest.parent), with_files_hash=False
+                )
+                diff = compare_skill_directories(
+                    temp_path, dest, inventory["files"], existing[dest]["files"]
+                )
+                if not display_skill_diff(diff, dest, args.force):
+                    if not diff["identical"]:
+                        print("Aborted." if len(dests) == 1 else f"Skipped: {dest}")
+                    continue
+            targets.append(dest)
+        if not targets:
+            sys.exit(0)  # Already up to date, or every update declined
+
+        # Step 3.5: The deferred full scan must pass before anything is swapped in
         try:
-            install_skill(temp_path, dest, args.verbose)
-        except Exception as e:
-            print(f"\nError during installation: {e}", file=sys.stderr)
+            scan_report = gate_full_scan(full_scan, scan_report, targets[0], args)
+        except InstallError as e:
+            print(e, file=sys.stderr if e.exit_code else sys.stdout)
+            sys.exit(e.exit_code)
+
+        # Step 4: Install the staged tree into every destination
+        installed = []
+        failed = False
+        for dest in targets:
+            print(f"\nInstalling to: {dest}")
+            try:
+                install_skill(temp_path, dest, args.verbose, inventory["files"], args.read_only,
+                              link_source=dest == dests[0], existing=existing.get(dest))
+                installed.append(dest)
+            except Exception as e:
+                print(f"\nError during installation: {e}", file=sys.stderr)
+                failed = True
+        if not installed:
             sys.exit(3)
-    
-    # Step 5: Update manifest
-    try:
-        update_manifest_entry(dest, args.url, args.verbose)
-    except Exception as e:
-        print(f"  Warning: Could not update manifest: {e}")
 
-    print(f"\n✓ Skill installed successfully to: {dest}")
-    sys.exit(0)
+    # Step 5: Update the manifest in each destination's skills root
+    for dest in installed:
+        try:
+            update_manifest_entry(dest, args.url, args.verbose, security_scan=scan_report,
+                                  inventory=inventory, keep_snapshots=args.keep_snapshots)
+        except Exception as e:
+            print(f"  Warning: Could not update manifest: {e}")
+
+    print()
+    for dest in installed:
+        print(f"✓ Skill installed successfully to: {dest}")
+    sys.exit(3 if failed else 0)
 
 
 if __name__ == '__main__':
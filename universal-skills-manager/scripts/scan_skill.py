@@ -9,6 +9,12 @@ injection, credential exfiltration, invisible unicode, and other threats.
 Usage:
     python3 scan_skill.py <path>            # Scan a skill directory or file
     python3 scan_skill.py --pretty <path>   # Pretty-print the JSON report
+    python3 scan_skill.py --max-findings-per-category 20 <path>
+                                            # Cap repetitive findings per file
+    python3 scan_skill.py --profile quick <path>
+                                            # Only cheap critical-category checks
+    python3 scan_skill.py --serve           # Run as a daemon on a Unix socket
+    python3 scan_skill.py --watch <root>... # Emit delta findings as JSON Lines
     python3 scan_skill.py --version         # Print version and exit
 
 Exit codes:
@@ -19,26 +25,53 @@ Exit codes:
 
 Output:
     JSON report to stdout with fields:
-        skill_path, files_scanned, scan_timestamp,
+        skill_path, profile, files_scanned, scan_timestamp,
         summary (critical, warning, info counts),
-        findings (list of finding objects)
+        findings (list of finding objects; aggregate findings for
+                  suppressed repeats also carry count, first_line, last_line)
 """
 
 import argparse
+import ast
+import hashlib
 import json
 import os
 import re
+import signal
+import socket
+import socketserver
 import stat as stat_mod
+import struct
 import sys
+import threading
+import time
 import unicodedata
+from collections import Counter, OrderedDict
 from datetime import datetime, timezone
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 VERSION = "1.2.0"
 
 MAX_FILE_SIZE = 10_000_000  # 10 MB
 MAX_FILE_COUNT = 1000
 MAX_DIR_DEPTH = 10
+MAX_FINDINGS_PER_CATEGORY = 50  # Per file; 0 disables the cap
+
+# Scan profiles: the set of check categories to run (None = every check).
+# "quick" keeps the cheap checks for every critical-grade category so
+# installs can gate on it and defer the full ruleset. File-level findings
+# (oversized, binary, unreadable, scan limit) are reported under every profile.
+SCAN_PROFILES = {
+    "quick": frozenset({
+        "invisible_unicode",
+        "exfiltration_url",
+        "shell_pipe_execution",
+        "hardcoded_secret",
+        "html_comment_unclosed",
+    }),
+    "full": None,
+}
+DEFAULT_PROFILE = "full"
 
 _SCRIPT_EXTENSIONS = frozenset({
     ".py", ".sh", ".bash", ".js", ".mjs", ".cjs", ".ts", ".tsx",
@@ -213,6 +246,125 @@ _COMMAND_EXECUTION_PATTERNS = [
     ]
 ]
 
+# Python files are analyzed via the AST instead of _COMMAND_EXECUTION_PATTERNS,
+# so calls are matched on resolved names (aliases and from-imports included)
+# and never on text inside string literals or comments.
+_PY_EXEC_CALLS = frozenset({
+    "eval", "exec", "compile", "__import__",
+    "os.system", "os.popen", "os.execl", "os.execle", "os.execlp", "os.execlpe",
+    "os.execv", "os.execve", "os.execvp", "os.execvpe", "os.spawnl", "os.spawnle",
+    "os.spawnlp", "os.spawnlpe", "os.spawnv", "os.spawnve", "os.spawnvp",
+    "os.spawnvpe", "os.posix_spawn", "os.posix_spawnp",
+    "subprocess.run", "subprocess.call", "subprocess.check_call",
+    "subprocess.check_output", "subprocess.Popen", "subprocess.getoutput",
+    "subprocess.getstatusoutput", "commands.getoutput", "pty.spawn",
+})
+# Calls that execute code or commands whatever object they are reached
+# through (builtins.eval, __builtins__.exec, getattr(os, "system"), a
+# module alias the resolver cannot see). Only calls with arguments count,
+# so methods such as model.eval() or platform.system() are not flagged.
+_PY_EXEC_ATTRS = frozenset({"eval", "exec", "system", "popen"})
+_PY_EXEC_ATTR_PREFIXES = ("spawn", "execl", "execv", "posix_spawn")
+_PY_NETWORK_CALL_PREFIXES = (
+    "requests.", "httpx.", "aiohttp.", "urllib3.",
+)
+_PY_NETWORK_CALLS = frozenset({
+    "urllib.request.urlopen", "urllib.request.urlretrieve", "urllib.request.Request",
+    "urllib.request.build_opener", "urllib.urlopen", "urllib2.urlopen",
+    "http.client.HTTPConnection", "http.client.HTTPSConnection",
+    "socket.socket", "socket.create_connection", "ftplib.FTP", "smtplib.SMTP",
+    "smtplib.SMTP_SSL", "telnetlib.Telnet",
+})
+# Shell invocations inside Python string literals (e.g. ["bash", "-c", cmd]
+# is caught as a subprocess call; "bash -c ..." strings are caught here).
+_PY_SHELL_STRING_PATTERNS = [
+    re.compile(r'\bsh\s+-c\s+'),
+    re.compile(r'\bbash\s+-c\s+'),
+]
+
+
+def _dotted_name(node):
+    """Return 'a.b.c' for Name/Attribute chains, else None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _is_exec_attr(attr, call):
+    """True if calling an attribute named attr executes code or commands."""
+    if not call.args:
+        return False
+    return attr in _PY_EXEC_ATTRS or attr.startswith(_PY_EXEC_ATTR_PREFIXES)
+
+
+def _getattr_target(node):
+    """Return 'obj.name' for getattr(obj, "name"), else None."""
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id == "getattr" and len(node.args) >= 2
+            and isinstance(node.args[1], ast.Constant)
+            and isinstance(node.args[1].value, str)):
+        obj = _dotted_name(node.args[0]) or "?"
+        return f"{obj}.{node.args[1].value}"
+    return None
+
+
+def _python_call_sites(tree):
+    """Find execution and network calls in a parsed Python module.
+
+    Calls are matched on their resolved dotted name, and execution calls
+    also on their final attribute name, so indirect forms such as
+    builtins.eval(...), getattr(os, "system")(...) and names brought in by
+    "from os import *" are caught. Returns sorted (lineno, kind,
+    qualified_name) tuples where kind is "exec", "network" or "shell_string".
+    """
+    aliases = {}
+    star_modules = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+                else:
+                    top = alias.name.split(".")[0]
+                    aliases[top] = top
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            for alias in node.names:
+                if alias.name == "*":
+                    star_modules.append(node.module)
+                else:
+                    aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+
+    sites = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            name = _dotted_name(node.func) or _getattr_target(node.func)
+            if name is None:
+                continue
+            head, _, rest = name.partition(".")
+            resolved = aliases.get(head, head) + ("." + rest if rest else "")
+            if not rest and head not in aliases:
+                resolved = next(
+                    (f"{module}.{head}" for module in star_modules
+                     if f"{module}.{head}" in _PY_EXEC_CALLS),
+                    resolved,
+                )
+            if resolved in _PY_EXEC_CALLS or (
+                    rest and _is_exec_attr(resolved.rpartition(".")[2], node)):
+                sites.add((node.lineno, "exec", resolved))
+            elif (resolved in _PY_NETWORK_CALLS
+                    or resolved.startswith(_PY_NETWORK_CALL_PREFIXES)):
+                sites.add((node.lineno, "network", resolved))
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if any(regex.search(node.value) for regex in _PY_SHELL_STRING_PATTERNS):
+                sites.add((node.lineno, "shell_string", "sh -c"))
+    return sorted(sites)
+
+
 _INSTRUCTION_OVERRIDE_PATTERNS = [
     re.compile(p, re.IGNORECASE) for p in [
         r'ignore\s+(all\s+)?previous\s+instructions?',
@@ -319,7 +471,8 @@ _CROSS_SKILL_ESCALATION_PATTERNS = [
 class Finding:
     """Represents a single security finding from the scan."""
 
-    def __init__(self, severity, category, file, line, description, matched_text, recommendation):
+    def __init__(self, severity, category, file, line, description, matched_text, recommendation,
+                 count=None, last_line=None):
         self.severity = severity
         self.category = category
         self.file = file
@@ -327,9 +480,12 @@ class Finding:
         self.description = description
         self.matched_text = matched_text
         self.recommendation = recommendation
+        # Only set on aggregate findings that stand in for suppressed matches
+        self.count = count
+        self.last_line = last_line
 
     def to_dict(self):
-        return {
+        result = {
             "severity": self.severity,
             "category": self.category,
             "file": self.file,
@@ -338,19 +494,43 @@ class Finding:
             "matched_text": self.matched_text,
             "recommendation": self.recommendation,
         }
+        if self.count is not None:
+            result["count"] = self.count
+            result["first_line"] = self.line
+            result["last_line"] = self.last_line
+        return result
 
 
 class SkillScanner:
     """Scans skill directories and files for security issues."""
 
-    def __init__(self):
+    def __init__(self, max_findings_per_category=None, cache=None, profile=DEFAULT_PROFILE,
+                 python_trees=None):
+        if profile not in SCAN_PROFILES:
+            raise ValueError(f"Unknown scan profile: {profile!r}")
+        self.max_findings_per_category = max_findings_per_category
+        self.cache = cache
+        self.profile = profile
+        # Optional {relative_path: (source_text, ast.Module)} from a caller that
+        # already parsed the files (install_skill's validation), so .py files
+        # are parsed once per install.
+        self.python_trees = python_trees
+        self._categories = SCAN_PROFILES[profile]
+        self._recording = None
+        self._reset()
+
+    def _reset(self):
+        """Clear all per-scan state."""
         self.findings = []
         self.files_scanned = []
+        self._seen = set()
+        self._category_counts = {}
+        self._aggregates = {}
+        self._severity_counts = {"critical": 0, "warning": 0, "info": 0}
 
     def scan_path(self, path):
         """Scan a file or directory and return a JSON-serializable report dict."""
-        self.findings = []
-        self.files_scanned = []
+        self._reset()
 
         path = Path(path).resolve()
         display_path = path.name  # Just the directory/file name
@@ -393,6 +573,18 @@ class SkillScanner:
 
         return self._build_report(display_path)
 
+    def scan_content(self, filename, content):
+        """Scan in-memory text as if it were a file named ``filename``.
+
+        Only the final path component of ``filename`` is used; it decides which
+        checks run, exactly as the file extension does for on-disk scans.
+        """
+        self._reset()
+        name = PurePosixPath(str(filename).replace("\\", "/")).name or "(content)"
+        self.files_scanned.append(name)
+        self._scan_text(content, name)
+        return self._build_report(name)
+
     def _scan_file(self, file_path, base_path):
         """Read a file, determine its type, and call appropriate check methods."""
         file_path = Path(file_path)
@@ -476,10 +668,41 @@ class SkillScanner:
             if fd >= 0:
                 os.close(fd)
 
-        content = unicodedata.normalize("NFC", content)
         self.files_scanned.append(relative)
-        lines = content.splitlines()
+        self._scan_text(content, relative)
+
+    def _scan_text(self, content, relative):
+        """Run the checks for one file's decoded text.
+
+        When a result cache is attached, the raw findings for identical
+        content under the same relative name are replayed instead of
+        re-running every pattern.
+        """
+        cache_key = None
+        if self.cache is not None:
+            digest = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+            cache_key = (relative, digest, self.profile)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                for args in cached:
+                    self._add_finding(*args)
+                return
+            self._recording = []
+
+        try:
+            self._analyze_text(content, relative)
+        finally:
+            if cache_key is not None:
+                self.cache.put(cache_key, tuple(self._recording))
+                self._recording = None
+
+    def _analyze_text(self, content, relative):
+        """Dispatch pattern checks by file type."""
+        file_path = PurePosixPath(relative)
         suffix = file_path.suffix.lower()
+        tree = self._python_tree(content, relative) if suffix == ".py" else None
+        content = unicodedata.normalize("NFC", content)
+        lines = content.splitlines()
 
         # All files: invisible unicode check
         self._check_invisible_unicode(lines, relative)
@@ -496,7 +719,10 @@ class SkillScanner:
             self._check_credential_references(lines, relative)
             self._check_hardcoded_secrets(lines, relative)
             self._check_homoglyphs(lines, relative)
-            self._check_command_execution(lines, relative)
+            if tree is not None:
+                self._check_python_ast(tree, lines, relative)
+            else:
+                self._check_command_execution(lines, relative)
             self._check_shell_pipe_execution(lines, relative)
             self._check_encoded_content(lines, relative)
 
@@ -513,7 +739,27 @@ class SkillScanner:
             joined_text = [line for line, _ in joined]
             joined_map = [num for _, num in joined]
             self._check_shell_pipe_execution(joined_text, relative, line_map=joined_map)
-            self._check_command_execution(joined_text, relative, line_map=joined_map)
+            if tree is None:
+                self._check_command_execution(joined_text, relative, line_map=joined_map)
+
+    def _python_tree(self, content, relative):
+        """Return the AST for a .py file, reusing a caller-supplied parse.
+
+        Returns None if the source does not parse; the caller then falls back
+        to the line regexes so broken files are still checked.
+        """
+        if self.python_trees:
+            shared = self.python_trees.get(relative)
+            if shared is not None and shared[0] == content:
+                return shared[1]
+        try:
+            return ast.parse(content)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            return None
+
+    def _enabled(self, category):
+        """Return True if the active profile runs checks for category."""
+        return self._categories is None or category in self._categories
 
     def _check_all_categories(self, lines, file):
         """Run all check categories against the given lines (used for .md files)."""
@@ -536,6 +782,9 @@ class SkillScanner:
         # Second pass: transliterate homoglyphs to ASCII and re-run semantic
         # checks that homoglyphs are designed to evade. Dedup in _add_finding
         # prevents duplicate findings when no homoglyphs are present.
+        semantic = ("instruction_override", "role_hijacking", "safety_bypass", "prompt_extraction")
+        if not any(self._enabled(c) for c in semantic):
+            return
         transliterated = [_transliterate_homoglyphs(line) for line in lines]
         if transliterated != lines:
             self._check_instruction_override(transliterated, file)
@@ -545,6 +794,8 @@ class SkillScanner:
 
     def _check_invisible_unicode(self, lines, file):
         """Check for invisible or zero-width unicode characters."""
+        if not self._enabled("invisible_unicode"):
+            return
         # Define all invisible/zero-width Unicode codepoint ranges
         invisible_ranges = [
             (0x200B, 0x200F),  # zero-width space, ZWNJ, ZWJ, LRM, RLM
@@ -596,6 +847,8 @@ class SkillScanner:
 
     def _check_homoglyphs(self, lines, file):
         """Check for non-ASCII characters that look like ASCII (homoglyphs)."""
+        if not self._enabled("homoglyph_detected"):
+            return
         for line_num, line in enumerate(lines, start=1):
             found = []
             for ch in line:
@@ -615,6 +868,8 @@ class SkillScanner:
 
     def _check_exfiltration_urls(self, lines, file):
         """Check for URLs that may exfiltrate data to external servers."""
+        if not self._enabled("exfiltration_url"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex, description in _EXFILTRATION_URL_PATTERNS:
                 if regex.search(line):
@@ -631,6 +886,8 @@ class SkillScanner:
 
     def _check_shell_pipe_execution(self, lines, file, line_map=None):
         """Check for shell commands piped from remote sources."""
+        if not self._enabled("shell_pipe_execution"):
+            return
         for idx, line in enumerate(lines):
             line_num = line_map[idx] if line_map else idx + 1
             match = _SHELL_PIPE_PATTERN.search(line)
@@ -647,6 +904,8 @@ class SkillScanner:
 
     def _check_credential_references(self, lines, file):
         """Check for references to credentials, tokens, or API keys."""
+        if not self._enabled("credential_reference"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _CREDENTIAL_PATH_PATTERNS:
                 if regex.search(line):
@@ -676,6 +935,8 @@ class SkillScanner:
 
     def _check_hardcoded_secrets(self, lines, file):
         """Check for hardcoded secret values (not env var references)."""
+        if not self._enabled("hardcoded_secret"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex, description in _HARDCODED_SECRET_PATTERNS:
                 if regex.search(line):
@@ -692,6 +953,8 @@ class SkillScanner:
 
     def _check_external_url_references(self, lines, file):
         """Check for external URL references that may fetch untrusted content."""
+        if not self._enabled("external_url"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _EXTERNAL_URL_PATTERNS:
                 if regex.search(line):
@@ -708,6 +971,8 @@ class SkillScanner:
 
     def _check_command_execution(self, lines, file, line_map=None):
         """Check for dangerous command execution patterns."""
+        if not self._enabled("command_execution"):
+            return
         for idx, line in enumerate(lines):
             line_num = line_map[idx] if line_map else idx + 1
             for regex in _COMMAND_EXECUTION_PATTERNS:
@@ -723,8 +988,37 @@ class SkillScanner:
                     )
                     break
 
+    def _check_python_ast(self, tree, lines, file):
+        """Check a parsed Python file for execution and network calls."""
+        for line_num, kind, name in _python_call_sites(tree):
+            text = lines[line_num - 1].strip() if 0 < line_num <= len(lines) else name
+            if kind == "network":
+                if not self._enabled("external_url"):
+                    continue
+                self._add_finding(
+                    severity="warning",
+                    category="external_url",
+                    file=file,
+                    line=line_num,
+                    description=f"Network call detected: {name}() — may fetch untrusted content or send data",
+                    matched_text=text[:100],
+                    recommendation="Verify the URL points to a trusted source. Avoid fetching arbitrary remote content in skill files.",
+                )
+            elif self._enabled("command_execution"):
+                self._add_finding(
+                    severity="warning",
+                    category="command_execution",
+                    file=file,
+                    line=line_num,
+                    description="Dangerous command execution pattern detected",
+                    matched_text=text[:100],
+                    recommendation="Avoid using dynamic command execution. Use safer alternatives or validate all inputs.",
+                )
+
     def _check_instruction_override(self, lines, file):
         """Check for attempts to override system instructions."""
+        if not self._enabled("instruction_override"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _INSTRUCTION_OVERRIDE_PATTERNS:
                 if regex.search(line):
@@ -741,6 +1035,8 @@ class SkillScanner:
 
     def _check_role_hijacking(self, lines, file):
         """Check for role/persona hijacking attempts."""
+        if not self._enabled("role_hijacking"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _ROLE_HIJACKING_PATTERNS:
                 if regex.search(line):
@@ -757,6 +1053,8 @@ class SkillScanner:
 
     def _check_safety_bypass(self, lines, file):
         """Check for attempts to bypass safety measures."""
+        if not self._enabled("safety_bypass"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _SAFETY_BYPASS_PATTERNS:
                 if regex.search(line):
@@ -772,7 +1070,14 @@ class SkillScanner:
                     break
 
     def _check_html_comments(self, lines, file):
-        """Check for hidden instructions in HTML comments."""
+        """Check for hidden instructions in HTML comments.
+
+        Closed comments are reported under "html_comment", an unclosed one
+        under "html_comment_unclosed"; each only if its category is enabled.
+        """
+        report_closed = self._enabled("html_comment")
+        if not report_closed and not self._enabled("html_comment_unclosed"):
+            return
         # Only check .md files
         if not file.endswith(".md"):
             return
@@ -796,15 +1101,16 @@ class SkillScanner:
                         # Single-line comment
                         c = rest[4:end_idx].strip()
                         d = c[:80] if len(c) > 80 else c
-                        self._add_finding(
-                            severity="warning",
-                            category="html_comment",
-                            file=file,
-                            line=line_num,
-                            description=f"HTML comment detected — may contain hidden instructions: {d}",
-                            matched_text=rest[:end_idx + 3].strip()[:100],
-                            recommendation="Review HTML comments carefully. They are invisible in rendered markdown and can hide malicious instructions.",
-                        )
+                        if report_closed:
+                            self._add_finding(
+                                severity="warning",
+                                category="html_comment",
+                                file=file,
+                                line=line_num,
+                                description=f"HTML comment detected — may contain hidden instructions: {d}",
+                                matched_text=rest[:end_idx + 3].strip()[:100],
+                                recommendation="Review HTML comments carefully. They are invisible in rendered markdown and can hide malicious instructions.",
+                            )
                         # Look for another comment in the remainder
                         rest = rest[end_idx + 3:]
                         next_start = rest.find("<!--")
@@ -825,15 +1131,16 @@ class SkillScanner:
                     comment_content += "\n" + line[:end_idx]
                     content = comment_content.strip()
                     display = content[:80] if len(content) > 80 else content
-                    self._add_finding(
-                        severity="warning",
-                        category="html_comment",
-                        file=file,
-                        line=comment_start_line,
-                        description=f"HTML comment detected — may contain hidden instructions: {display}",
-                        matched_text=comment_content.strip()[:100],
-                        recommendation="Review HTML comments carefully. They are invisible in rendered markdown and can hide malicious instructions.",
-                    )
+                    if report_closed:
+                        self._add_finding(
+                            severity="warning",
+                            category="html_comment",
+                            file=file,
+                            line=comment_start_line,
+                            description=f"HTML comment detected — may contain hidden instructions: {display}",
+                            matched_text=comment_content.strip()[:100],
+                            recommendation="Review HTML comments carefully. They are invisible in rendered markdown and can hide malicious instructions.",
+                        )
                     in_comment = False
                     comment_content = ""
                     # Check remainder of line for more comments
@@ -847,15 +1154,16 @@ class SkillScanner:
                             if close != -1:
                                 c = rest[4:close].strip()
                                 d = c[:80] if len(c) > 80 else c
-                                self._add_finding(
-                                    severity="warning",
-                                    category="html_comment",
-                                    file=file,
-                                    line=line_num,
-                                    description=f"HTML comment detected — may contain hidden instructions: {d}",
-                                    matched_text=rest[:close + 3].strip()[:100],
-                                    recommendation="Review HTML comments carefully. They are invisible in rendered markdown and can hide malicious instructions.",
-                                )
+                                if report_closed:
+                                    self._add_finding(
+                                        severity="warning",
+                                        category="html_comment",
+                                        file=file,
+                                        line=line_num,
+                                        description=f"HTML comment detected — may contain hidden instructions: {d}",
+                                        matched_text=rest[:close + 3].strip()[:100],
+                                        recommendation="Review HTML comments carefully. They are invisible in rendered markdown and can hide malicious instructions.",
+                                    )
                                 rest = rest[close + 3:]
                                 ns = rest.find("<!--")
                                 if ns == -1:
@@ -883,6 +1191,8 @@ class SkillScanner:
 
     def _check_encoded_content(self, lines, file):
         """Check for base64 or other encoded content that may hide payloads."""
+        if not self._enabled("encoded_content"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex, description in _ENCODED_CONTENT_PATTERNS:
                 match = regex.search(line)
@@ -903,6 +1213,8 @@ class SkillScanner:
 
     def _check_prompt_extraction(self, lines, file):
         """Check for attempts to extract system prompts or instructions."""
+        if not self._enabled("prompt_extraction"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _PROMPT_EXTRACTION_PATTERNS:
                 if regex.search(line):
@@ -919,6 +1231,8 @@ class SkillScanner:
 
     def _check_delimiter_injection(self, lines, file):
         """Check for delimiter injection attacks."""
+        if not self._enabled("delimiter_injection"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _DELIMITER_INJECTION_PATTERNS:
                 match = regex.search(line)
@@ -936,6 +1250,8 @@ class SkillScanner:
 
     def _check_cross_skill_escalation(self, lines, file):
         """Check for attempts to escalate privileges across skills."""
+        if not self._enabled("cross_skill_escalation"):
+            return
         for line_num, line in enumerate(lines, start=1):
             for regex in _CROSS_SKILL_ESCALATION_PATTERNS:
                 if regex.search(line):
@@ -951,18 +1267,62 @@ class SkillScanner:
                     break  # One finding per line
 
     def _add_finding(self, severity, category, file, line, description, matched_text, recommendation):
-        """Add a finding to the findings list."""
+        """Add a finding to the findings list.
+
+        Findings beyond the per-file, per-category cap are folded into a single
+        aggregate finding carrying a count and the first/last line numbers.
+        Critical findings are never folded, and severity totals always count
+        every match.
+        """
+        if self._recording is not None:
+            self._recording.append(
+                (severity, category, file, line, description, matched_text, recommendation)
+            )
+
         # Deduplicate by file+line+category+description
-        for existing in self.findings:
-            if (existing.file == file and existing.line == line
-                    and existing.category == category
-                    and existing.description == description):
-                return
+        key = (file, line, category, description)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self._severity_counts[severity] = self._severity_counts.get(severity, 0) + 1
+
         # Strip ANSI escape sequences and control characters
         sanitized_text = _ANSI_ESCAPE_RE.sub('', matched_text)
         sanitized_text = ''.join(
             ch for ch in sanitized_text if ch == '\n' or ch == '\t' or not (0 <= ord(ch) < 32)
         )
+
+        cap = self.max_findings_per_category
+        if cap is None:
+            cap = MAX_FINDINGS_PER_CATEGORY
+        group = (file, category, severity)
+        kept = self._category_counts.get(group, 0)
+        if severity != "critical" and cap > 0 and kept >= cap:
+            aggregate = self._aggregates.get(group)
+            if aggregate is None:
+                aggregate = Finding(
+                    severity=severity,
+                    category=category,
+                    file=file,
+                    line=line,
+                    description="",
+                    matched_text=sanitized_text,
+                    recommendation=recommendation,
+                    count=0,
+                    last_line=line,
+                )
+                self._aggregates[group] = aggregate
+                self.findings.append(aggregate)
+            aggregate.count += 1
+            aggregate.line = min(aggregate.line, line)
+            aggregate.last_line = max(aggregate.last_line, line)
+            aggregate.description = (
+                f"{aggregate.count} more similar finding(s) suppressed after "
+                f"{cap} per file (lines {aggregate.line}-{aggregate.last_line})"
+            )
+            return
+        self._category_counts[group] = kept + 1
+
         finding = Finding(
             severity=severity,
             category=category,
@@ -976,18 +1336,17 @@ class SkillScanner:
 
     def _build_report(self, skill_path):
         """Build and return the JSON report dict."""
-        critical_count = sum(1 for f in self.findings if f.severity == "critical")
-        warning_count = sum(1 for f in self.findings if f.severity == "warning")
-        info_count = sum(1 for f in self.findings if f.severity == "info")
-
+        # Totals come from the running counters so that matches folded into
+        # aggregate findings are still counted.
         return {
             "skill_path": skill_path,
+            "profile": self.profile,
             "files_scanned": list(self.files_scanned),
             "scan_timestamp": datetime.now(timezone.utc).isoformat(),
             "summary": {
-                "critical": critical_count,
-                "warning": warning_count,
-                "info": info_count,
+                "critical": self._severity_counts.get("critical", 0),
+                "warning": self._severity_counts.get("warning", 0),
+                "info": self._severity_counts.get("info", 0),
             },
             "findings": [f.to_dict() for f in self.findings],
         }
@@ -1005,20 +1364,707 @@ def exit_code_from_report(report):
     return 0
 
 
+# --- Daemon mode (--serve) ---
+
+DAEMON_MAX_WORKERS = 4
+DAEMON_CACHE_ENTRIES = 4096
+DAEMON_BUSY_TIMEOUT = 10.0  # Seconds a request waits for a free worker
+DAEMON_MAX_REQUEST_BYTES = 4 * MAX_FILE_SIZE  # JSON escaping can inflate content
+
+
+def default_socket_path():
+    """Return the Unix socket path used by --serve and the client helper.
+
+    $SKILL_SCANNER_SOCKET overrides the default, which lives in
+    $XDG_RUNTIME_DIR when set and ~/.cache/universal-skills-manager otherwise.
+    """
+    override = os.environ.get("SKILL_SCANNER_SOCKET")
+    if override:
+        return Path(override).expanduser()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "universal-skills-manager" / "scan_skill.sock"
+    return Path.home() / ".cache" / "universal-skills-manager" / "scan_skill.sock"
+
+
+class ResultCache:
+    """Thread-safe LRU of raw per-file findings keyed by (name, content SHA-256)."""
+
+    def __init__(self, max_entries=DAEMON_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def handle_daemon_request(request, cache=None):
+    """Execute one decoded daemon request and return the response dict.
+
+    Requests:
+        {"action": "ping"}
+        {"action": "scan", "path": "/abs/path"}
+        {"action": "scan", "filename": "SKILL.md", "content": "..."}
+    Optional "max_findings_per_category" and "profile" are honored for scans.
+    """
+    if not isinstance(request, dict):
+        return {"ok": False, "error": "Request must be a JSON object"}
+
+    action = request.get("action", "scan")
+    if action == "ping":
+        return {"ok": True, "version": VERSION}
+    if action != "scan":
+        return {"ok": False, "error": f"Unknown action: {action!r}"}
+
+    profile = request.get("profile", DEFAULT_PROFILE)
+    if profile not in SCAN_PROFILES:
+        return {"ok": False, "error": f"Unknown scan profile: {profile!r}"}
+    scanner = SkillScanner(
+        max_findings_per_category=request.get("max_findings_per_category"),
+        cache=cache,
+        profile=profile,
+    )
+    if "content" in request:
+        content = request["content"]
+        if not isinstance(content, str):
+            return {"ok": False, "error": "'content' must be a string"}
+        if len(content) > MAX_FILE_SIZE:
+            return {"ok": False, "error": f"Content exceeds size limit ({MAX_FILE_SIZE:,} chars)"}
+        return {"ok": True, "report": scanner.scan_content(request.get("filename", ""), content)}
+
+    path = request.get("path")
+    if not isinstance(path, str) or not path:
+        return {"ok": False, "error": "Scan request needs 'path' or 'content'"}
+    if not os.path.isabs(path):
+        return {"ok": False, "error": "'path' must be absolute"}
+    if not os.path.exists(path):
+        return {"ok": False, "error": f"Path does not exist: {path}"}
+    return {"ok": True, "report": scanner.scan_path(path)}
+
+
+class _ScanRequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON line per connection and writes one JSON line back."""
+
+    def handle(self):
+        try:
+            raw = self.rfile.readline(DAEMON_MAX_REQUEST_BYTES + 1)
+        except OSError:
+            return
+        if len(raw) > DAEMON_MAX_REQUEST_BYTES:
+            response = {"ok": False, "error": "Request too large"}
+        else:
+            try:
+                request = json.loads(raw.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+                response = {"ok": False, "error": f"Malformed request: {exc}"}
+            else:
+                response = self.server.dispatch(request)
+        try:
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        except OSError:
+            pass  # Client went away
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class ScanDaemon(socketserver.ThreadingUnixStreamServer):
+        """Unix socket server that keeps compiled rules and a result cache warm."""
+
+        daemon_threads = True
+
+        def __init__(self, socket_path, max_workers=DAEMON_MAX_WORKERS,
+                     cache_entries=DAEMON_CACHE_ENTRIES):
+            self.socket_path = Path(socket_path)
+            self.cache = ResultCache(cache_entries)
+            self._slots = threading.BoundedSemaphore(max(1, max_workers))
+            _prepare_socket_path(self.socket_path)
+            # Bind under a private umask so the socket is never reachable
+            # with looser permissions, not even before the chmod below
+            old_umask = os.umask(0o077)
+            try:
+                super().__init__(str(self.socket_path), _ScanRequestHandler)
+            finally:
+                os.umask(old_umask)
+            os.chmod(str(self.socket_path), 0o600)
+
+        def dispatch(self, request):
+            """Run a request under the worker limit."""
+            if not self._slots.acquire(timeout=DAEMON_BUSY_TIMEOUT):
+                return {"ok": False, "error": "Scanner daemon busy", "busy": True}
+            try:
+                return handle_daemon_request(request, self.cache)
+            except Exception as exc:  # Never let one request kill the daemon
+                return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            finally:
+                self._slots.release()
+
+        def server_close(self):
+            super().server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+else:  # pragma: no cover - platforms without AF_UNIX
+    ScanDaemon = None
+
+
+def _prepare_socket_path(socket_path):
+    """Create a private socket directory and clear a stale socket file.
+
+    An existing directory is used only if it is a real directory (not a
+    symlink) owned by this user and not writable by group or others;
+    otherwise RuntimeError is raised rather than listening in it.
+    """
+    socket_dir = socket_path.parent
+    socket_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+    info = os.lstat(socket_dir)
+    if not stat_mod.S_ISDIR(info.st_mode):
+        raise RuntimeError(f"Socket directory is not a directory: {socket_dir}")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise RuntimeError(f"Socket directory {socket_dir} is owned by another user")
+    if info.st_mode & (stat_mod.S_IWGRP | stat_mod.S_IWOTH):
+        raise RuntimeError(
+            f"Socket directory {socket_dir} is writable by group or others "
+            f"(mode {stat_mod.S_IMODE(info.st_mode):o}); use a private directory"
+        )
+    if socket_path.exists() or socket_path.is_symlink():
+        if ping_daemon(socket_path):
+            raise RuntimeError(f"A scanner daemon is already listening on {socket_path}")
+        socket_path.unlink()
+
+
+def request_daemon(request, socket_path=None, timeout=30.0):
+    """Send one request to a running daemon and return its decoded response.
+
+    Raises OSError if no daemon is reachable and RuntimeError if the
+    response is malformed.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix domain sockets are not supported on this platform")
+    socket_path = Path(socket_path) if socket_path else default_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    try:
+        return json.loads(b"".join(chunks).decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise RuntimeError(f"Malformed response from scanner daemon: {exc}")
+
+
+def ping_daemon(socket_path=None, timeout=1.0):
+    """Return True if a scanner daemon answers on socket_path."""
+    try:
+        response = request_daemon({"action": "ping"}, socket_path, timeout)
+    except (OSError, RuntimeError):
+        return False
+    return bool(response.get("ok"))
+
+
+def scan_with_daemon(path=None, content=None, filename=None, socket_path=None,
+                     timeout=30.0, max_findings_per_category=None, profile=None):
+    """Client helper: scan a path or raw content through a running daemon.
+
+    Returns the report dict. Raises OSError when no daemon is reachable and
+    RuntimeError when the daemon rejects the request.
+    """
+    if content is not None:
+        request = {"action": "scan", "filename": filename or "", "content": content}
+    else:
+        request = {"action": "scan", "path": str(Path(path).resolve())}
+    if max_findings_per_category is not None:
+        request["max_findings_per_category"] = max_findings_per_category
+    if profile is not None:
+        request["profile"] = profile
+    response = request_daemon(request, socket_path, timeout)
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "Scanner daemon request failed"))
+    return response["report"]
+
+
+def serve(socket_path=None, max_workers=DAEMON_MAX_WORKERS):
+    """Run the scanner daemon until interrupted."""
+    if ScanDaemon is None:
+        print("Error: --serve requires Unix domain socket support", file=sys.stderr)
+        sys.exit(1)
+    socket_path = Path(socket_path).expanduser() if socket_path else default_socket_path()
+    try:
+        server = ScanDaemon(socket_path, max_workers=max_workers)
+    except (OSError, RuntimeError) as exc:
+        print(f"Error: could not start scanner daemon: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"scan_skill.py {VERSION} listening on {socket_path}", file=sys.stderr)
+    # Turn SIGTERM into a normal exit so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# --- Watch mode (--watch) ---
+
+WATCH_POLL_INTERVAL = 0.5  # Seconds between stat sweeps in polling mode
+WATCH_DEBOUNCE = 0.05  # Seconds to coalesce a burst of inotify events
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_ISDIR = 0x40000000
+_INOTIFY_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+    | _IN_ONLYDIR | _IN_DONT_FOLLOW
+)
+_INOTIFY_EVENT_HEADER = 16  # struct inotify_event: int wd; uint32 mask, cookie, len
+
+
+def _walk_dirs(root):
+    """Yield (directory, depth) under root, honoring skip dirs and depth limit."""
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        yield directory, depth
+        if depth + 1 >= MAX_DIR_DEPTH:
+            continue
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name in _SKIP_DIRS:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((Path(entry.path), depth + 1))
+
+
+def _walk_files(root):
+    """Yield (path, lstat) for regular files under root without following symlinks."""
+    for directory, _depth in _walk_dirs(root):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if stat_mod.S_ISREG(st.st_mode):
+                yield Path(entry.path), st
+
+
+def _file_signature(st):
+    return (st.st_size, st.st_mtime_ns, st.st_ino, st.st_mode)
+
+
+class _InotifyBackend:
+    """Recursive inotify watches via ctypes (Linux only).
+
+    wait() returns the set of paths that changed, or None when the kernel
+    queue overflowed and a full sweep is needed.
+    """
+
+    name = "inotify"
+
+    def __init__(self, roots):
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._ctypes = ctypes
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches = {}
+        try:
+            for root in roots:
+                self.add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_tree(self, root):
+        """Watch root and every directory below it."""
+        for directory, _depth in _walk_dirs(root):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), _INOTIFY_MASK)
+            if wd < 0:
+                err = self._ctypes.get_errno()
+                if directory == root:
+                    raise OSError(err, f"inotify_add_watch failed for {directory}")
+                continue  # Directory vanished between walk and watch
+            self._watches[wd] = Path(directory)
+
+    def wait(self, timeout):
+        import select
+
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        time.sleep(WATCH_DEBOUNCE)
+        changed = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _INOTIFY_EVENT_HEADER <= len(data):
+                wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+                raw_name = data[offset + _INOTIFY_EVENT_HEADER:offset + _INOTIFY_EVENT_HEADER + length]
+                offset += _INOTIFY_EVENT_HEADER + length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._watches.get(wd)
+                if mask & _IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                if directory is None:
+                    continue
+                if mask & _IN_MOVE_SELF:
+                    # The watch would keep reporting under the old path
+                    self._libc.inotify_rm_watch(self.fd, wd)
+                    self._watches.pop(wd, None)
+                name = os.fsdecode(raw_name.rstrip(b"\0"))
+                path = directory / name if name else directory
+                changed.add(path)
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self.add_tree(path)
+        return None if overflow else changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class _PollingBackend:
+    """Fallback that asks for a stat sweep every interval."""
+
+    name = "poll"
+
+    def __init__(self, roots, interval=WATCH_POLL_INTERVAL):
+        self.interval = interval
+
+    def wait(self, timeout):
+        time.sleep(min(self.interval, timeout))
+        return None
+
+    def close(self):
+        pass
+
+
+class SkillWatcher:
+    """Rescans only changed files under one or more skill roots.
+
+    Every change is reported through ``emit`` as a JSON-serializable event
+    with the findings that appeared and the findings that were resolved.
+    """
+
+    def __init__(self, roots, emit, backend="auto", poll_interval=WATCH_POLL_INTERVAL,
+                 max_findings_per_category=None, profile=DEFAULT_PROFILE):
+        self.roots = [Path(r).expanduser().resolve() for r in roots]
+        self.emit = emit
+        self.poll_interval = poll_interval
+        self._backend_choice = backend
+        self.backend = None
+        self._scanner = SkillScanner(
+            max_findings_per_category=max_findings_per_category,
+            cache=ResultCache(),
+            profile=profile,
+        )
+        self._files = {}  # path -> (root, signature, findings)
+
+    def start(self):
+        """Pick a backend, scan everything once and emit a baseline event."""
+        for root in self.roots:
+            if not root.is_dir():
+                raise OSError(f"Watch root is not a directory: {root}")
+        if self._backend_choice in ("auto", "inotify"):
+            try:
+                self.backend = _InotifyBackend(self.roots)
+            except (OSError, AttributeError):
+                if self._backend_choice == "inotify":
+                    raise
+        if self.backend is None:
+            self.backend = _PollingBackend(self.roots, self.poll_interval)
+
+        findings = []
+        for root in self.roots:
+            for path, st in _walk_files(root):
+                entry = self._scan(root, path, st)
+                findings.extend(entry[2])
+        self.emit({
+            "event": "baseline",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "backend": self.backend.name,
+            "profile": self._scanner.profile,
+            "roots": [str(r) for r in self.roots],
+            "files_watched": len(self._files),
+            "summary": _summarize(findings),
+            "findings": findings,
+        })
+
+    def poll_once(self, timeout=1.0):
+        """Wait up to ``timeout`` seconds for changes and process them."""
+        changed = self.backend.wait(timeout)
+        if changed is None:
+            self._sweep()
+            return
+        for path in sorted(changed):
+            self._refresh(path)
+
+    def run(self):
+        """Watch until interrupted."""
+        self.start()
+        try:
+            while True:
+                self.poll_once(timeout=3600.0)
+        finally:
+            self.backend.close()
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
+
+    def _root_for(self, path):
+        for root in self.roots:
+            if path == root or root in path.parents:
+                return root
+        return None
+
+    def _scan(self, root, path, st):
+        scanner = self._scanner
+        scanner._reset()
+        scanner._scan_file(path, root)
+        entry = (root, _file_signature(st), [f.to_dict() for f in scanner.findings])
+        self._files[path] = entry
+        return entry
+
+    def _sweep(self):
+        """Stat every file and rescan the ones whose metadata changed."""
+        seen = set()
+        for root in self.roots:
+            for path, st in _walk_files(root):
+                seen.add(path)
+                self._refresh_file(root, path, st)
+        for path in [p for p in self._files if p not in seen]:
+            self._remove(path)
+
+    def _refresh(self, path):
+        root = self._root_for(path)
+        if root is None:
+            return
+        try:
+            st = os.lstat(path)
+        except OSError:
+            st = None
+        if st is not None and stat_mod.S_ISDIR(st.st_mode):
+            seen = set()
+            for file_path, file_st in _walk_files(path):
+                seen.add(file_path)
+                self._refresh_file(root, file_path, file_st)
+            stale = [p for p in self._files if path in p.parents and p not in seen]
+        elif st is not None and stat_mod.S_ISREG(st.st_mode):
+            self._refresh_file(root, path, st)
+            return
+        else:
+            stale = [p for p in self._files if p == path or path in p.parents]
+        for stale_path in stale:
+            self._remove(stale_path)
+
+    def _refresh_file(self, root, path, st):
+        previous = self._files.get(path)
+        if previous is not None and previous[1] == _file_signature(st):
+            return
+        old_findings = previous[2] if previous is not None else []
+        _root, _sig, new_findings = self._scan(root, path, st)
+        self._emit_change(root, path, "modified" if previous else "added",
+                          old_findings, new_findings)
+
+    def _remove(self, path):
+        root, _sig, old_findings = self._files.pop(path)
+        self._emit_change(root, path, "removed", old_findings, [])
+
+    def _emit_change(self, root, path, status, old_findings, new_findings):
+        added, resolved = _diff_findings(old_findings, new_findings)
+        self.emit({
+            "event": "change",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "root": str(root),
+            "file": str(path.relative_to(root)),
+            "status": status,
+            "added": added,
+            "resolved": resolved,
+            "summary": _summarize(new_findings),
+        })
+
+
+def _finding_identity(finding):
+    """Identity used for deltas; line numbers are ignored so edits above a
+    finding do not report it as resolved and re-added."""
+    return (finding["severity"], finding["category"], finding["description"],
+            finding["matched_text"])
+
+
+def _diff_findings(old, new):
+    """Return (added, resolved) finding dicts between two scans of a file."""
+    old_counts = Counter(_finding_identity(f) for f in old)
+    added = []
+    for finding in new:
+        key = _finding_identity(finding)
+        if old_counts[key] > 0:
+            old_counts[key] -= 1
+        else:
+            added.append(finding)
+    new_counts = Counter(_finding_identity(f) for f in new)
+    resolved = []
+    for finding in old:
+        key = _finding_identity(finding)
+        if new_counts[key] > 0:
+            new_counts[key] -= 1
+        else:
+            resolved.append(finding)
+    return added, resolved
+
+
+def _summarize(findings):
+    summary = {"critical": 0, "warning": 0, "info": 0}
+    for finding in findings:
+        summary[finding["severity"]] = (
+            summary.get(finding["severity"], 0) + finding.get("count", 1)
+        )
+    return summary
+
+
+def watch(roots, backend="auto", poll_interval=WATCH_POLL_INTERVAL,
+          max_findings_per_category=None, profile=DEFAULT_PROFILE):
+    """Run --watch mode, printing one JSON object per line."""
+    def emit(event):
+        print(json.dumps(event), flush=True)
+
+    watcher = SkillWatcher(roots, emit, backend=backend, poll_interval=poll_interval,
+                           max_findings_per_category=max_findings_per_category,
+                           profile=profile)
+    try:
+        watcher.run()
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Scan AI skill packages for security issues."
     )
     parser.add_argument(
         "path",
-        nargs="?",
-        help="Path to a skill directory or file to scan",
+        nargs="*",
+        help="Path to a skill directory or file to scan (one or more roots with --watch)",
     )
     parser.add_argument(
         "--pretty",
         action="store_true",
         help="Pretty-print the JSON output with indentation",
     )
+    parser.add_argument(
+        "--max-findings-per-category",
+        type=int,
+        default=MAX_FINDINGS_PER_CATEGORY,
+        metavar="N",
+        help=(
+            "Collapse non-critical findings beyond N per file and category into "
+            f"one aggregate finding (default: {MAX_FINDINGS_PER_CATEGORY}, 0 = unlimited)"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(SCAN_PROFILES),
+        default=DEFAULT_PROFILE,
+        help=(
+            "Ruleset to run: 'quick' checks only cheap critical categories "
+            f"(default: {DEFAULT_PROFILE})"
+        ),
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a long-lived scanner daemon on a Unix domain socket",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Socket path for --serve (default: $SKILL_SCANNER_SOCKET or a per-user runtime path)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DAEMON_MAX_WORKERS,
+        metavar="N",
+        help=f"Maximum concurrent scans in --serve mode (default: {DAEMON_MAX_WORKERS})",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch one or more roots and emit delta findings as JSON Lines",
+    )
+    parser.add_argument(
+        "--watch-backend",
+        choices=["auto", "inotify", "poll"],
+        default="auto",
+        help="Change detection for --watch (default: auto, inotify with polling fallback)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=WATCH_POLL_INTERVAL,
+        metavar="SECONDS",
+        help=f"Stat sweep interval for the polling backend (default: {WATCH_POLL_INTERVAL})",
+    )
     parser.add_argument(
         "--version",
         action="store_true",
@@ -1031,11 +2077,27 @@ def main():
         print(f"scan_skill.py {VERSION}")
         sys.exit(0)
 
+    if args.serve:
+        serve(args.socket, max_workers=args.max_workers)
+        sys.exit(0)
+
     if not args.path:
         parser.error("the following arguments are required: path")
 
-    scanner = SkillScanner()
-    report = scanner.scan_path(args.path)
+    if args.watch:
+        watch(args.path, backend=args.watch_backend, poll_interval=args.poll_interval,
+              max_findings_per_category=args.max_findings_per_category,
+              profile=args.profile)
+        sys.exit(0)
+
+    if len(args.path) > 1:
+        parser.error("only one path can be scanned at a time (use --watch for several roots)")
+
+    scanner = SkillScanner(
+        max_findings_per_category=args.max_findings_per_category,
+        profile=args.profile,
+    )
+    report = scanner.scan_path(args.path[0])
 
     indent = 2 if args.pretty else None
     print(json.dumps(report, indent=indent))